@@ -38,6 +38,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'rest_framework.authtoken',
     'drf_spectacular',
@@ -47,6 +48,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First, so its Server-Timing total covers the other middleware.
+    'core.instrumentation.InstrumentationMiddleware',
+    'core.routers.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -86,7 +90,58 @@ DATABASES = {
         'HOST': os.environ.get('DB_HOST'),
         'NAME': os.environ.get('DB_NAME'),
         'USER': os.environ.get('DB_USER'),
-        'PASSWORD': os.environ.get('DB_PASS')
+        'PASSWORD': os.environ.get('DB_PASS'),
+        # Keep connections open across requests instead of reconnecting for
+        # each one. 0 closes them after every request.
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+    }
+}
+
+# Check that persistent connections still work before a request reuses them,
+# unless they served a request in the last DB_CONN_HEALTH_CHECK_IDLE seconds.
+DB_CONN_HEALTH_CHECKS = os.environ.get('DB_CONN_HEALTH_CHECKS', 'true').lower() in ('1', 'true', 'yes')
+DB_CONN_HEALTH_CHECK_IDLE = float(os.environ.get('DB_CONN_HEALTH_CHECK_IDLE', 1))
+
+# Read replicas, as a comma-separated list of hosts sharing the primary's
+# database name and credentials. Reads of safe requests go to a replica
+# (see core.routers). In tests the replicas mirror the test database.
+DB_REPLICA_HOSTS = [host.strip() for host in os.environ.get('DB_REPLICA_HOSTS', '').split(',') if host.strip()]
+DATABASE_REPLICAS = []
+for index, host in enumerate(DB_REPLICA_HOSTS, 1):
+    DATABASES[f'replica{index}'] = {**DATABASES['default'], 'HOST': host, 'TEST': {'MIRROR': 'default'}}
+    DATABASE_REPLICAS.append(f'replica{index}')
+
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+
+# Seconds a client keeps reading from the primary after it writes, and the
+# cache alias remembering it.
+DB_REPLICA_STICKY_SECONDS = float(os.environ.get('DB_REPLICA_STICKY_SECONDS', 5))
+DB_REPLICA_STICKY_CACHE_ALIAS = 'default'
+
+# Replicas further behind than DB_REPLICA_MAX_LAG seconds are skipped, and
+# each replica's lag is checked at most every DB_REPLICA_LAG_CHECK_INTERVAL
+# seconds per process.
+DB_REPLICA_MAX_LAG = float(os.environ.get('DB_REPLICA_MAX_LAG', 2))
+DB_REPLICA_LAG_CHECK_INTERVAL = float(os.environ.get('DB_REPLICA_LAG_CHECK_INTERVAL', 1))
+
+# Models always read from the primary. A token or session is used right
+# after it is created, and token lookups are mostly served by the token
+# cache anyway.
+DB_PRIMARY_READ_MODELS = ['authtoken.token', 'sessions.session']
+
+# Warm the token, facet and schema caches of each process before its first
+# successful readiness probe, and how many recent tokens to cache.
+READY_WARM_CACHES = os.environ.get('READY_WARM_CACHES', 'false').lower() in ('1', 'true', 'yes')
+WARM_TOKEN_COUNT = int(os.environ.get('WARM_TOKEN_COUNT', 500))
+
+
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'articles-db'),
     }
 }
 
@@ -140,4 +195,54 @@ AUTH_USER_MODEL = 'core.User'
 # using 'AutoSchema' from 'drf_spectacular'.
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
-}
\ No newline at end of file
+    # orjson for JSON, plus MessagePack for clients that ask for it with
+    # `Accept: application/msgpack` or `?format=msgpack`.
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.ORJSONRenderer',
+        'core.renderers.MessagePackRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'core.renderers.ORJSONParser',
+        'core.renderers.MessagePackParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+}
+
+# Default and maximum number of articles per page in keyset-paginated lists.
+ARTICLE_PAGE_SIZE = 20
+ARTICLE_MAX_PAGE_SIZE = 100
+
+# Cache alias holding article list responses, and how long they are kept in
+# seconds (0 disables the list cache).
+ARTICLE_CACHE_ALIAS = 'default'
+ARTICLE_LIST_CACHE_TIMEOUT = 300
+
+# Default and maximum number of tags and authors returned per facet, and how
+# long the facets of all articles are cached in seconds.
+ARTICLE_FACET_SIZE = 10
+ARTICLE_MAX_FACET_SIZE = 100
+ARTICLE_FACETS_CACHE_TIMEOUT = 300
+
+# Maximum number of operations in one article batch write.
+ARTICLE_MAX_BATCH_SIZE = 1000
+
+# Default and maximum number of names returned by the author and tag
+# autocomplete, and how many of the most similar names are ranked by article
+# count. Recent results are kept per process for AUTOCOMPLETE_CACHE_TIMEOUT
+# seconds (0 disables the cache), up to AUTOCOMPLETE_CACHE_SIZE queries.
+AUTOCOMPLETE_SIZE = 10
+AUTOCOMPLETE_MAX_SIZE = 50
+AUTOCOMPLETE_CANDIDATES = 200
+AUTOCOMPLETE_CACHE_TIMEOUT = 60
+AUTOCOMPLETE_CACHE_SIZE = 1024
+
+# Cache alias for token lookups, how long they are kept there, and the size
+# and timeout of the per-process LRU in front of it. A user changed or
+# deactivated in another process may still authenticate here for up to
+# TOKEN_CACHE_LOCAL_TIMEOUT seconds.
+TOKEN_CACHE_ALIAS = 'default'
+TOKEN_CACHE_TIMEOUT = 300
+TOKEN_CACHE_LOCAL_TIMEOUT = 10
+TOKEN_CACHE_LOCAL_SIZE = 1024
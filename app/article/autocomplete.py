@@ -0,0 +1,61 @@
+"""
+Author and tag autocomplete, with a per-process cache of recent queries.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+
+class AutocompleteCache:
+    """
+    LRU of recent autocomplete results, kept for a short time.
+
+    Editors type the same few prefixes over and over, so the hottest ones
+    are answered without a query. Entries are dropped after
+    `AUTOCOMPLETE_CACHE_TIMEOUT` seconds, or when this process renames or
+    deletes an author or tag. Article counts may lag by up to the timeout.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, results = entry
+            if expires <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return results
+
+    def set(self, key, results):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + settings.AUTOCOMPLETE_CACHE_TIMEOUT, results)
+            self._entries.move_to_end(key)
+            while len(self._entries) > settings.AUTOCOMPLETE_CACHE_SIZE:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+autocomplete_cache = AutocompleteCache()
+
+
+def autocomplete(model, query, limit):
+    """Return the `limit` best `{name, article_count}` matches of `query` among `model` names."""
+    query = ' '.join(query.split())
+    key = (model._meta.label_lower, query.casefold(), limit)
+    results = autocomplete_cache.get(key)
+    if results is None:
+        results = model.objects.autocomplete(query, limit, settings.AUTOCOMPLETE_CANDIDATES)
+        if settings.AUTOCOMPLETE_CACHE_TIMEOUT:
+            autocomplete_cache.set(key, results)
+    return results
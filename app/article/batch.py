@@ -0,0 +1,95 @@
+"""
+Batch writes of articles.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import Article, Author, Tag
+from core.signals import articles_bulk_loaded
+
+
+# Relations replaced by a batch, with the validated data holding their
+# names and the model they link to.
+LINKED_RELATIONS = (
+    ('authors', 'author_names', Author),
+    ('tags', 'tag_names', Tag),
+)
+
+
+def _take_links(article, data, links):
+    """Move the author and tag names of `data` into `links`, by article id."""
+    for relation, field, _ in LINKED_RELATIONS:
+        if field in data:
+            links[relation][article.pk] = [item['name'] for item in data.pop(field)]
+
+
+def _relink(relation, model, links):
+    """
+    Replace the links of articles to the authors or tags named in `links`.
+
+    Names are resolved for the whole batch at once, and the links are
+    written in name order so the name arrays keep it.
+    """
+    if not links:
+        return
+    through = getattr(Article, relation).through
+    target = model._meta.model_name
+    ids = model.objects.resolve(name for names in links.values() for name in names)
+    through.objects.filter(article_id__in=list(links)).delete()
+    through.objects.bulk_create([
+        through(article_id=pk, **{f'{target}_id': ids[name]})
+        for pk, names in links.items()
+        for name in dict.fromkeys(names)
+    ])
+
+
+def write_articles(user, creates=(), updates=(), deletes=()):
+    """
+    Create, update and delete articles in one transaction.
+
+    `creates` is a list of validated article data, `updates` a list of
+    `(article, validated data)` pairs and `deletes` a list of articles.
+    Rows and links are written with set-based statements, so a batch runs
+    a fixed number of queries whatever its size. Returns the created
+    articles.
+    """
+    now = timezone.now()
+    links = {relation: {} for relation, _, _ in LINKED_RELATIONS}
+
+    created = []
+    for data in creates:
+        data = dict(data)
+        article = Article(createdBy=user)
+        _take_links(article, data, links)
+        for attr, value in data.items():
+            setattr(article, attr, value)
+        created.append(article)
+
+    updated = []
+    update_fields = {'updated_at'}
+    for article, data in updates:
+        data = dict(data)
+        _take_links(article, data, links)
+        for attr, value in data.items():
+            setattr(article, attr, value)
+        update_fields.update(data)
+        article.updated_at = now
+        updated.append(article)
+
+    with transaction.atomic():
+        if created:
+            Article.objects.bulk_create(created)
+        if updated:
+            Article.objects.bulk_update(updated, sorted(update_fields))
+        if deletes:
+            Article.objects.filter(pk__in=[article.pk for article in deletes]).delete()
+
+        for relation, _, model in LINKED_RELATIONS:
+            _relink(relation, model, links[relation])
+        relinked = set().union(*links.values())
+        if relinked:
+            Article.objects.filter(pk__in=relinked).sync_names()
+
+    # Bulk writes skip the save and m2m_changed signals.
+    articles_bulk_loaded.send(sender=Article, using='default')
+    return created
@@ -0,0 +1,230 @@
+"""
+In-process benchmark of the article and user API endpoints.
+"""
+import math
+import random
+import time
+import uuid
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from article.facets import get_facets
+from core.models import Article, Author, Tag
+
+
+BENCHMARK_PASSWORD = 'benchmark-password'
+# Distinct made-up authors the write scenarios draw from.
+BENCHMARK_AUTHORS = 1000
+# Articles sampled for the retrieve scenario, and pages walked for the deep
+# page scenario.
+SAMPLE_SIZE = 50
+DEEP_PAGE = 5
+
+
+def percentile(samples, fraction):
+    """Return the nearest-rank percentile of the sorted `samples`."""
+    return samples[max(0, math.ceil(fraction * len(samples)) - 1)]
+
+
+class EndpointBenchmark:
+    """
+    Drive the API endpoints in-process and measure each scenario.
+
+    Requests go through the full middleware, authentication and rendering
+    stack with a test client, authenticated with a real token. Each
+    request commits as it would in production, so reads are routed to
+    replicas, cache invalidation runs on commit and write latency includes
+    the commit. The articles, names and user the benchmark created are
+    deleted at the end. The list cache is disabled unless `cache` is set,
+    so list scenarios measure the database path.
+    """
+
+    def __init__(self, requests=100, seed=0, cache=False):
+        self.requests = requests
+        self.rng = random.Random(seed)
+        self.cache = cache
+
+    def get_scenarios(self):
+        """Return the benchmark scenarios as `{name: request function}`."""
+        articles_url = reverse('article:article-list')
+        get = self.client.get
+        top = self.top
+        return {
+            'list': lambda: get(articles_url),
+            'list_deep_page': lambda: get(self.deep_page_url),
+            'list_page_size_100': lambda: get(articles_url, {'page_size': 100}),
+            'list_fields': lambda: get(articles_url, {'fields': 'id,title,publication_date'}),
+            'list_year': lambda: get(articles_url, {'year': top['year']}),
+            'list_year_month': lambda: get(articles_url, {'year': top['year'], 'month': 6}),
+            'list_date_range': lambda: get(articles_url, {
+                'published_after': f'{top["year"] - 1}-01-01',
+                'published_before': f'{top["year"]}-01-01',
+            }),
+            'list_authors': lambda: get(articles_url, {'authors': top['authors'][0]}),
+            'list_authors_all': lambda: get(articles_url, {
+                'authors': ','.join(top['authors'][:2]),
+                'authors_mode': 'all',
+            }),
+            'list_tags': lambda: get(articles_url, {'tags': ','.join(top['tags'][:3])}),
+            'list_tags_all': lambda: get(articles_url, {'tags': ','.join(top['tags'][:2]), 'tags_mode': 'all'}),
+            'list_keyword': lambda: get(articles_url, {'keyword': top['keyword']}),
+            'list_phrase': lambda: get(articles_url, {'phrase': top['phrase']}),
+            'list_highlight': lambda: get(articles_url, {'keyword': top['keyword'], 'highlight': 'true'}),
+            'facets': lambda: get(reverse('article:article-facets'), {'tags': top['tags'][0]}),
+            'retrieve': lambda: get(reverse('article:article-detail', args=[self.rng.choice(self.sample_ids)])),
+            'create': self._create,
+            'update': self._update,
+            'token': lambda: self.client.post(
+                reverse('user:token'),
+                {'email': self.user.email, 'password': BENCHMARK_PASSWORD},
+            ),
+            'me': lambda: get(reverse('user:me')),
+        }
+
+    def run(self, names=None):
+        """Run the named scenarios, or all of them, and return the report."""
+        overrides = {'ALLOWED_HOSTS': [*settings.ALLOWED_HOSTS, 'testserver']}
+        if not self.cache:
+            overrides['ARTICLE_LIST_CACHE_TIMEOUT'] = 0
+
+        with override_settings(**overrides):
+            try:
+                self._set_up()
+                scenarios = self.get_scenarios()
+                unknown = set(names or []) - set(scenarios)
+                if unknown:
+                    raise ValueError(f'Unknown scenarios: {", ".join(sorted(unknown))}.')
+
+                return {
+                    'articles': self.article_count,
+                    'requests': self.requests,
+                    'cache': self.cache,
+                    'scenarios': {
+                        name: self._measure(request)
+                        for name, request in scenarios.items()
+                        if not names or name in names
+                    },
+                }
+            finally:
+                self._clean_up()
+
+    def _set_up(self):
+        self.created_ids = []
+        self.new_names = {Author: set(), Tag: set()}
+        # A throwaway user, so no existing account is touched.
+        self.user = get_user_model().objects.create_user(
+            email=f'benchmark-{uuid.uuid4().hex}@example.com',
+            password=BENCHMARK_PASSWORD,
+            name='Benchmark',
+        )
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.user).key}')
+
+        self.article_count = Article.objects.count()
+        # Seek from random ids, which stays cheap on large tables.
+        self.sample_ids = list(dict.fromkeys(
+            article_id
+            for _ in range(SAMPLE_SIZE)
+            for article_id in Article.objects.filter(
+                id__gte=uuid.UUID(int=self.rng.getrandbits(128)),
+            ).order_by('id').values_list('id', flat=True)[:1]
+        ))
+
+        facets = get_facets(size=5)
+        tags = [tag['name'] for tag in facets['tags']] or ['benchmark']
+        self.top = {
+            'year': facets['years'][0]['year'] if facets['years'] else 2024,
+            'authors': [author['name'] for author in facets['authors']] or ['Benchmark'],
+            'tags': tags,
+            'keyword': tags[0].split()[0],
+            'phrase': ' '.join(tags[0].split()[:2]),
+        }
+        # Note the names the write scenarios may create, so only those are
+        # deleted afterwards.
+        for model, names in (
+            (Author, self.top['authors'] + [f'Benchmark author {i}' for i in range(BENCHMARK_AUTHORS)]),
+            (Tag, self.top['tags'][:2]),
+        ):
+            self.new_names[model] = set(names) - set(
+                model.objects.filter(name__in=names).values_list('name', flat=True)
+            )
+
+        # Articles of the benchmark user for the update scenario.
+        self.own_ids = [self._create().data['id'] for _ in range(min(self.requests, 20))]
+        if not self.sample_ids:
+            self.sample_ids = list(self.own_ids)
+
+        response = self.client.get(reverse('article:article-list'))
+        for _ in range(DEEP_PAGE - 1):
+            if not response.data['next']:
+                break
+            response = self.client.get(response.data['next'])
+        self.deep_page_url = response.wsgi_request.get_full_path()
+
+    def _clean_up(self):
+        """Delete the user, articles and names the benchmark created."""
+        if not hasattr(self, 'user'):
+            return
+        Article.objects.filter(pk__in=self.created_ids).delete()
+        for model, names in self.new_names.items():
+            # Unless an article of someone else picked them up meanwhile.
+            model.objects.filter(name__in=names, article__isnull=True).delete()
+        self.user.delete()
+
+    def _payload(self):
+        return {
+            'title': f'Benchmark article {self.rng.getrandbits(32)}',
+            'abstract': 'Benchmark abstract. ' * 20,
+            'publication_date': f'{self.top["year"]}-06-15',
+            'authors': [{'name': name} for name in self.rng.sample(self.top['authors'], 1)]
+            + [{'name': f'Benchmark author {self.rng.randrange(BENCHMARK_AUTHORS)}'}],
+            'tags': [{'name': name} for name in self.top['tags'][:2]],
+        }
+
+    def _create(self):
+        response = self.client.post(reverse('article:article-list'), self._payload(), format='json')
+        if response.status_code == 201:
+            self.created_ids.append(response.data['id'])
+        return response
+
+    def _update(self):
+        article_id = self.rng.choice(self.own_ids)
+        payload = self._payload()
+        payload.pop('publication_date')
+        return self.client.patch(reverse('article:article-detail', args=[article_id]), payload, format='json')
+
+    def _measure(self, request):
+        request()  # Warm up caches and connections.
+        latencies = []
+        queries = 0
+        errors = 0
+        started = time.perf_counter()
+        aliases = [DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS]
+        for _ in range(self.requests):
+            with ExitStack() as stack:
+                # Count the queries of the primary and every replica.
+                captured = [stack.enter_context(CaptureQueriesContext(connections[alias])) for alias in aliases]
+                request_started = time.perf_counter()
+                response = request()
+                latencies.append(time.perf_counter() - request_started)
+            queries += sum(len(context) for context in captured)
+            errors += response.status_code >= 400
+        elapsed = time.perf_counter() - started
+
+        latencies.sort()
+        return {
+            'p50_ms': round(percentile(latencies, 0.5) * 1000, 3),
+            'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+            'mean_ms': round(sum(latencies) / len(latencies) * 1000, 3),
+            'max_ms': round(latencies[-1] * 1000, 3),
+            'queries_per_request': round(queries / self.requests, 2),
+            'throughput_rps': round(self.requests / elapsed, 1),
+            'errors': errors,
+        }
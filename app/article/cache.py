@@ -0,0 +1,179 @@
+"""
+Caching of rendered article list responses.
+
+Entries are keyed on a generation counter plus the normalized query
+params. Any write to articles, authors, tags or their links bumps the
+generation, which orphans every cached list at once instead of tracking
+which lists a write touches.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.http import quote_etag, urlencode
+
+from core.routers import use_primary
+
+
+GENERATION_KEY = 'article:generation'
+MODIFIED_KEY = 'article:generation:modified'
+HITS_KEY = 'article:list:hits'
+MISSES_KEY = 'article:list:misses'
+# Query params holding comma separated names, whose order does not matter.
+NAME_LIST_PARAMS = ('authors', 'tags')
+# How long the first request for a cold key may take to render it, and how
+# long concurrent requests for the same key wait for it before rendering it
+# themselves.
+LOCK_TIMEOUT = 10
+LOCK_WAIT = 2.0
+LOCK_POLL_INTERVAL = 0.02
+
+
+def get_cache():
+    return caches[settings.ARTICLE_CACHE_ALIAS]
+
+
+def _incr(key, initial=1):
+    """Increment a counter, starting it at `initial` if it is missing."""
+    cache = get_cache()
+    try:
+        return cache.incr(key)
+    except ValueError:
+        if cache.add(key, initial, timeout=None):
+            return initial
+        return cache.incr(key)
+
+
+def bump_generation():
+    """Invalidate every cached article list."""
+    get_cache().set(MODIFIED_KEY, int(time.time()), timeout=None)
+    # Start from the clock so a generation lost to eviction or a restart
+    # never repeats a value that older entries were stored under.
+    return _incr(GENERATION_KEY, initial=int(time.time() * 1000))
+
+
+def get_generation():
+    """Return the current article data generation."""
+    generation = get_cache().get(GENERATION_KEY)
+    if generation is None:
+        generation = bump_generation()
+    return generation
+
+
+def normalize_params(query_params):
+    """Return the query params as a canonical, order-independent string."""
+    items = []
+    for key in sorted(query_params):
+        values = query_params.getlist(key)
+        if key in NAME_LIST_PARAMS:
+            names = {name.strip() for value in values for name in value.split(',')}
+            values = [','.join(sorted(name for name in names if name))]
+        items.append((key, values))
+    return urlencode(items, doseq=True)
+
+
+def get_stats():
+    """Return the list cache hit/miss counters."""
+    cache = get_cache()
+    counters = cache.get_many([HITS_KEY, MISSES_KEY])
+    hits = counters.get(HITS_KEY, 0)
+    misses = counters.get(MISSES_KEY, 0)
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': hits / (hits + misses) if hits + misses else None,
+        'timeout': settings.ARTICLE_LIST_CACHE_TIMEOUT,
+    }
+
+
+class ListResponseCache:
+    """Serve rendered list responses from the cache, rendering on a miss."""
+
+    def is_enabled(self, request):
+        # The browsable API embeds the user and a CSRF token in the page.
+        return (
+            settings.ARTICLE_LIST_CACHE_TIMEOUT != 0
+            and request.method == 'GET'
+            and request.accepted_renderer.format != 'api'
+        )
+
+    def get_key(self, request):
+        key = '|'.join([
+            request.scheme,
+            request.get_host(),
+            request.path,
+            request.accepted_media_type,
+            normalize_params(request.query_params),
+        ])
+        digest = hashlib.md5(key.encode('utf-8')).hexdigest()
+        return f'article:list:{get_generation()}:{digest}'
+
+    def get_validators(self, request):
+        """
+        Return the `(etag, last_modified)` validators of a list response.
+
+        Both derive from the generation, so checking them costs one cache
+        lookup and no database query.
+        """
+        key = self.get_key(request)
+        etag = quote_etag(hashlib.md5(key.encode('utf-8')).hexdigest())
+        return etag, get_cache().get(MODIFIED_KEY)
+
+    def fetch(self, request, render):
+        """
+        Return the cached response for `request`, or call `render` for it.
+
+        `render` must return a rendered response. Only the first request
+        for a cold key renders it, while concurrent ones wait for its result.
+        """
+        if not self.is_enabled(request):
+            return render()
+
+        cache = get_cache()
+        key = self.get_key(request)
+        entry = cache.get(key)
+        locked = False
+        if entry is None:
+            locked = cache.add(f'{key}:lock', 1, LOCK_TIMEOUT)
+            if not locked:
+                entry = self._wait_for(key)
+        if entry is not None:
+            _incr(HITS_KEY)
+            return self._cached_response(entry)
+
+        _incr(MISSES_KEY)
+        try:
+            # Cached for every client, so never rendered from a lagging replica.
+            with use_primary():
+                response = render()
+            if response.status_code == 200:
+                entry = (response.content, response['Content-Type'])
+                cache.set(key, entry, settings.ARTICLE_LIST_CACHE_TIMEOUT)
+        finally:
+            if locked:
+                cache.delete(f'{key}:lock')
+
+        response['X-Cache'] = 'MISS'
+        return response
+
+    def _wait_for(self, key):
+        """Poll for the entry another request is rendering."""
+        cache = get_cache()
+        deadline = time.monotonic() + LOCK_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(LOCK_POLL_INTERVAL)
+            entry = cache.get(key)
+            if entry is not None:
+                return entry
+        return None
+
+    def _cached_response(self, entry):
+        content, content_type = entry
+        response = HttpResponse(content, content_type=content_type)
+        response['X-Cache'] = 'HIT'
+        return response
+
+
+list_cache = ListResponseCache()
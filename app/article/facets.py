@@ -0,0 +1,65 @@
+"""
+Facet counts of articles by tag, author and publication year.
+"""
+from django.conf import settings
+from django.db.models import Count, F
+from django.db.models.functions import ExtractYear
+
+from article.cache import get_cache, get_generation
+from core.models import Article
+from core.routers import use_primary
+
+
+def get_facets(article_ids=None, size=None):
+    """
+    Count articles per tag, author and publication year.
+
+    `article_ids` is a queryset of the article ids to count, or None for
+    every article. Tags and authors are limited to the `size` most common.
+    Each facet is one grouped query, and the total is the sum of the years.
+    """
+    size = size or settings.ARTICLE_FACET_SIZE
+    articles = Article.objects.all()
+    article_tags = Article.tags.through.objects.all()
+    article_authors = Article.authors.through.objects.all()
+    if article_ids is not None:
+        articles = articles.filter(pk__in=article_ids)
+        article_tags = article_tags.filter(article__in=article_ids)
+        article_authors = article_authors.filter(article__in=article_ids)
+
+    years = list(
+        articles.annotate(year=ExtractYear('publication_date'))
+        .values('year')
+        .annotate(count=Count('id'))
+        .order_by('-year')
+    )
+    tags = list(
+        article_tags.values(name=F('tag__name'))
+        .annotate(count=Count('id'))
+        .order_by('-count', 'name')[:size]
+    )
+    authors = list(
+        article_authors.values(name=F('author__name'))
+        .annotate(count=Count('id'))
+        .order_by('-count', 'name')[:size]
+    )
+    return {
+        'count': sum(year['count'] for year in years),
+        'tags': tags,
+        'authors': authors,
+        'years': years,
+    }
+
+
+def get_global_facets(size=None):
+    """Return the facets of every article, cached until articles change."""
+    size = size or settings.ARTICLE_FACET_SIZE
+    cache = get_cache()
+    key = f'article:facets:{get_generation()}:{size}'
+    facets = cache.get(key)
+    if facets is None:
+        # Cached for every client, so never counted on a lagging replica.
+        with use_primary():
+            facets = get_facets(size=size)
+        cache.set(key, facets, settings.ARTICLE_FACETS_CACHE_TIMEOUT)
+    return facets
@@ -0,0 +1,231 @@
+"""
+Pagination for the article APIs.
+"""
+import base64
+import binascii
+import datetime
+import json
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+def _positive_int(value, cutoff=None):
+    """Parse a strictly positive integer, optionally capped at `cutoff`."""
+    value = int(value)
+    if value <= 0:
+        raise ValueError(value)
+    if cutoff:
+        return min(value, cutoff)
+    return value
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """JSON encoder that keeps the microseconds of datetimes and times."""
+
+    def default(self, o):
+        # DjangoJSONEncoder truncates to milliseconds, which would make a
+        # cursor skip or repeat rows created within the same millisecond.
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginate by seeking past the last row seen instead of using OFFSET.
+
+    The cursor carries the values of every `ordering` field for the row at
+    the edge of the page, so fetching any page is a single index range scan
+    whatever its depth. The last ordering field must be unique and none of
+    them may be nullable.
+    """
+    ordering = None
+    page_size = settings.ARTICLE_PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = settings.ARTICLE_MAX_PAGE_SIZE
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.current_ordering = self.get_ordering(view)
+
+        position, reverse = self.decode_cursor(request, queryset.model)
+        ordering = self.current_ordering
+        if reverse:
+            ordering = [self._invert(field) for field in ordering]
+        if position is not None:
+            queryset = queryset.filter(self._seek(ordering, position))
+
+        # Fetch one extra row to find out whether there is a further page.
+        results = list(queryset.order_by(*ordering)[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_page_size(self, request):
+        if self.page_size_query_param:
+            try:
+                return _positive_int(
+                    request.query_params[self.page_size_query_param],
+                    cutoff=self.max_page_size,
+                )
+            except (KeyError, ValueError):
+                pass
+
+        return self.page_size
+
+    def get_ordering(self, view):
+        """Return the ordering fields, the last of which must be unique."""
+        if hasattr(view, 'get_pagination_ordering'):
+            return list(view.get_pagination_ordering())
+        return list(self.ordering)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def encode_cursor(self, instance, reverse):
+        """Return a link to the page on one side of `instance`."""
+        # Rows fetched with `.values()` are dicts rather than instances.
+        if isinstance(instance, dict):
+            position = [instance[field.lstrip('-')] for field in self.current_ordering]
+        else:
+            position = [getattr(instance, field.lstrip('-')) for field in self.current_ordering]
+        payload = json.dumps(
+            {'p': position, 'r': int(reverse)},
+            cls=CursorEncoder,
+            separators=(',', ':'),
+        )
+        encoded = base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request, model):
+        """Return the `(position, reverse)` pair carried by the request."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None, False
+
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            position = payload['p']
+            reverse = bool(payload['r'])
+            if len(position) != len(self.current_ordering):
+                raise ValueError(position)
+            position = [
+                self._to_python(model, field, value)
+                for field, value in zip(self.current_ordering, position)
+            ]
+        except (TypeError, KeyError, ValueError, UnicodeEncodeError, binascii.Error, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return position, reverse
+
+    def _to_python(self, model, field, value):
+        """Convert a cursor value back to the type of its model field."""
+        try:
+            return model._meta.get_field(field.lstrip('-')).to_python(value)
+        except FieldDoesNotExist:
+            # Annotations are carried as plain JSON values.
+            return value
+
+    def _invert(self, field):
+        return field[1:] if field.startswith('-') else '-' + field
+
+    def _seek(self, ordering, position):
+        """
+        Build the filter for the rows after `position` in `ordering`.
+
+        Orderings mix directions, so this cannot be a row-value comparison.
+        It expands to `a > x OR (a = x AND b > y) ...`, plus the redundant
+        `a >= x`, which the planner can use as the range bound of an index
+        scan on the leading column. Without it, the OR is only a filter and
+        a deep page scans every row before it.
+        """
+        seek = Q()
+        for index, field in enumerate(ordering):
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            clause = Q(**{f'{field.lstrip("-")}__{lookup}': position[index]})
+            for previous, value in zip(ordering[:index], position):
+                clause &= Q(**{previous.lstrip('-'): value})
+            seek |= clause
+
+        leading = ordering[0]
+        bound = 'lte' if leading.startswith('-') else 'gte'
+        return Q(**{f'{leading.lstrip("-")}__{bound}': position[0]}) & seek
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {
+                    'type': 'string',
+                    'nullable': True,
+                },
+                'previous': {
+                    'type': 'string',
+                    'nullable': True,
+                },
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'The pagination cursor value.',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Number of results to return per page.',
+                'schema': {'type': 'integer'},
+            },
+        ]
+
+
+class ArticlePagination(KeysetPagination):
+    """Paginate articles newest first."""
+    ordering = ('-publication_date', 'id')
+
+
+class CommentPagination(KeysetPagination):
+    """Paginate the comments of an article oldest first."""
+    ordering = ('createdAt', 'id')
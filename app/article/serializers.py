@@ -1,8 +1,11 @@
 """
 Serializers for article APIs
 """
+from collections import OrderedDict
+
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from core.instrumentation import timed
 from core.models import (
     Article,
     Tag,
@@ -10,26 +13,136 @@ from core.models import (
     Comment
 )
 
-class AuthorSerializer(serializers.ModelSerializer):
+class NameSerializer(serializers.ModelSerializer):
+    """Serializer for models identified by their name."""
+
+    def to_representation(self, instance):
+        # Articles render the names copied into their name arrays.
+        if isinstance(instance, str):
+            return {'name': instance}
+        return super().to_representation(instance)
+
+
+class AuthorSerializer(NameSerializer):
     class Meta:
         model = Author
         fields = ['name']
+        # Existing names are linked rather than rejected as duplicates
+        extra_kwargs = {'name': {'validators': []}}
+
 
-class TagSerializer(serializers.ModelSerializer):
+class TagSerializer(NameSerializer):
     class Meta:
         model = Tag
         fields = ['name']
+        extra_kwargs = {'name': {'validators': []}}
+
+
+class SparseFieldsMixin:
+    """Render only the fields named in the `fields` argument, if given."""
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class TimedListSerializer(serializers.ListSerializer):
+    """List serializer reporting its serialization time."""
+
+    @property
+    def data(self):
+        with timed('serialize'):
+            return super().data
 
 
-class ArticleSerializer(serializers.ModelSerializer):
-    authors = AuthorSerializer(many=True, required=True)
-    tags = TagSerializer(many=True, required=False)
+class ArticleSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    authors = AuthorSerializer(many=True, required=True, source='author_names')
+    tags = TagSerializer(many=True, required=False, source='tag_names')
     created_by = serializers.ReadOnlyField(source='createdBy.name')
 
     class Meta:
         model = Article
-        fields = ['id', 'title', 'abstract', 'publication_date', 'authors', 'tags', 'created_by']
-        read_only_fields = ['id', 'created_by']
+        fields = ['id', 'title', 'abstract', 'publication_date', 'authors', 'tags', 'created_by', 'comment_count']
+        read_only_fields = ['id', 'created_by', 'comment_count']
+        list_serializer_class = TimedListSerializer
+
+    @property
+    def data(self):
+        with timed('serialize'):
+            return super().data
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # Search results annotated with a highlighted snippet carry it along
+        headline = getattr(instance, 'headline', None)
+        if headline is not None:
+            data['headline'] = headline
+        return data
+
+
+def _render_names(names):
+    return [{'name': name} for name in names]
+
+
+# How fields whose JSON value differs from the column value are rendered.
+RENDER_COLUMN = {
+    'id': str,
+    'publication_date': serializers.DateField().to_representation,
+    'authors': _render_names,
+    'tags': _render_names,
+}
+
+
+class ArticleRowSerializer:
+    """
+    Render `.values()` rows of articles exactly as `ArticleSerializer` does.
+
+    Builds plain dicts instead of running the field machinery of
+    `ModelSerializer` per article, for large read-only lists.
+    """
+    # The `.values()` column each field renders from, in field order.
+    columns = OrderedDict([
+        ('id', 'id'),
+        ('title', 'title'),
+        ('abstract', 'abstract'),
+        ('publication_date', 'publication_date'),
+        ('authors', 'author_names'),
+        ('tags', 'tag_names'),
+        ('created_by', 'createdBy__name'),
+        ('comment_count', 'comment_count'),
+    ])
+
+    def __init__(self, rows, fields=None):
+        self.rows = rows
+        self.fields = [field for field in self.columns if fields is None or field in fields]
+
+    @classmethod
+    def get_columns(cls, fields=None):
+        """Return the columns to fetch to render `fields`, or every field."""
+        return [column for field, column in cls.columns.items() if fields is None or field in fields]
+
+    @property
+    def data(self):
+        with timed('serialize'):
+            return self._serialize()
+
+    def _serialize(self):
+        renderers = [(field, self.columns[field], RENDER_COLUMN.get(field)) for field in self.fields]
+        results = []
+        for row in self.rows:
+            data = OrderedDict()
+            for field, column, render in renderers:
+                value = row[column]
+                if field == 'created_by' and value is None:
+                    # ArticleSerializer skips the name of a missing creator.
+                    continue
+                data[field] = value if render is None or value is None else render(value)
+            if row.get('headline') is not None:
+                data['headline'] = row['headline']
+            results.append(data)
+        return results
 
 
 class ArticleDetailSerializer(ArticleSerializer):
@@ -38,52 +151,144 @@ class ArticleDetailSerializer(ArticleSerializer):
     class Meta(ArticleSerializer.Meta):
         fields = ArticleSerializer.Meta.fields
 
-    def _get_or_create_tags(self, tags, article):
-        """Handle getting or creating tags as needed."""
-        for tag_name in tags:
-            tag_obj, _ = Tag.objects.get_or_create(name=tag_name)
-            article.tags.add(tag_obj)
+    def _link(self, article, relation, model, names):
+        """
+        Link a new `article` to the named authors or tags, creating missing ones.
 
-    def _get_or_create_authors(self, author_names, article):
-        """Handle getting or creating authors as needed."""
-        for author_name in author_names:
-            author_obj, _ = Author.objects.get_or_create(name=author_name)
-            article.authors.add(author_obj)
+        The links are inserted in request order, unlike `add()`, which
+        inserts a batch in set order, so the name arrays keep the order.
+        """
+        ids = model.objects.resolve(names)
+        through = getattr(Article, relation).through
+        target = f'{model._meta.model_name}_id'
+        through.objects.bulk_create([through(article_id=article.pk, **{target: ids[name]}) for name in names])
 
     def create(self, validated_data):
-        tags = validated_data.pop('tags', [])
-        author_names = validated_data.pop('authors', [])
+        tags = list(dict.fromkeys(tag['name'] for tag in validated_data.pop('tag_names', [])))
+        authors = list(dict.fromkeys(author['name'] for author in validated_data.pop('author_names', [])))
         created_by = self.context['request'].user
-        article = Article.objects.create(**validated_data, createdBy=created_by)
-        self._get_or_create_tags(tags, article)
-        self._get_or_create_authors(author_names, article)
+        # The links skip the m2m_changed signals, so the name arrays are
+        # written with the row.
+        article = Article.objects.create(
+            **validated_data,
+            author_names=authors,
+            tag_names=tags,
+            createdBy=created_by,
+        )
+        self._link(article, 'tags', Tag, tags)
+        self._link(article, 'authors', Author, authors)
         return article
 
+    def _relink(self, article, relation, model, names):
+        """
+        Link `article` to exactly the named authors or tags.
+
+        Links are kept in request order, since `sync_names` copies them in
+        link order. When removing links and appending new ones yields that
+        order, only those are written. Otherwise the links are rewritten
+        from the first position whose name differs. Returns the new name
+        array.
+        """
+        names = list(dict.fromkeys(names))
+        ids = model.objects.resolve(names)
+        wanted = {ids[name]: name for name in names}
+        order = list(wanted)
+        through = getattr(Article, relation).through
+        target = f'{model._meta.model_name}_id'
+        current = list(through.objects.filter(article=article).order_by('id').values_list(target, flat=True))
+
+        removed = [pk for pk in current if pk not in wanted]
+        added = [pk for pk in order if pk not in current]
+        if [pk for pk in current if pk in wanted] + added != order:
+            start = next(index for index, (old, new) in enumerate(zip(current, order)) if old != new)
+            removed, added = current[start:], order[start:]
+        if removed:
+            through.objects.filter(article=article, **{f'{target}__in': removed}).delete()
+        if added:
+            through.objects.bulk_create([through(article_id=article.pk, **{target: pk}) for pk in added])
+        return names
+
     def update(self, instance, validated_data):
-        # Handle tags
-        if 'tags' in validated_data:
-            tags = validated_data.pop('tags')
-            instance.tags.clear()
-            self._get_or_create_tags(tags, instance)
-
-        # Handle authors
-        if 'authors' in validated_data:
-            author_names = validated_data.pop('authors')
-            instance.authors.clear()
-            self._get_or_create_authors(author_names, instance)
-
-        # Update other fields present in validated_data
+        """
+        Save only the fields and links that changed.
+
+        Link changes write the through tables directly and update the name
+        arrays in the same UPDATE as the changed fields, instead of clearing
+        and re-adding every link.
+        """
+        update_fields = []
+        for field, relation, model in (('tag_names', 'tags', Tag), ('author_names', 'authors', Author)):
+            if field in validated_data:
+                names = self._relink(instance, relation, model, [item['name'] for item in validated_data.pop(field)])
+                if names != getattr(instance, field):
+                    setattr(instance, field, names)
+                    update_fields.append(field)
+
         for attr, value in validated_data.items():
-            if hasattr(instance, attr) and (attr not in self.read_only_fields):
+            if attr in self.Meta.read_only_fields or not hasattr(instance, attr):
+                continue
+            if getattr(instance, attr) != value:
                 setattr(instance, attr, value)
+                update_fields.append(attr)
 
-        instance.save()
+        if update_fields:
+            instance.save(update_fields=update_fields + ['updated_at'])
         return instance
 
+
+class NameMatchSerializer(serializers.Serializer):
+    """Serializer for an author or tag autocomplete match."""
+    name = serializers.CharField()
+    article_count = serializers.IntegerField()
+
+
+class FacetCountSerializer(serializers.Serializer):
+    name = serializers.CharField()
+    count = serializers.IntegerField()
+
+
+class YearCountSerializer(serializers.Serializer):
+    year = serializers.IntegerField()
+    count = serializers.IntegerField()
+
+
+class FacetsSerializer(serializers.Serializer):
+    """Serializer for article counts per tag, author and year."""
+    count = serializers.IntegerField()
+    tags = FacetCountSerializer(many=True)
+    authors = FacetCountSerializer(many=True)
+    years = YearCountSerializer(many=True)
+
+
+class BatchOperationSerializer(serializers.Serializer):
+    """Serializer for one operation of an article batch write."""
+    op = serializers.ChoiceField(choices=['create', 'update', 'delete'])
+    id = serializers.UUIDField(required=False)
+    data = serializers.DictField(required=False)
+
+    def validate(self, attrs):
+        if attrs['op'] == 'create' and 'id' in attrs:
+            raise serializers.ValidationError({'id': 'Created articles are assigned an id.'})
+        if attrs['op'] != 'create' and 'id' not in attrs:
+            raise serializers.ValidationError({'id': 'This field is required.'})
+        if attrs['op'] != 'delete' and 'data' not in attrs:
+            raise serializers.ValidationError({'data': 'This field is required.'})
+        return attrs
+
+
+class BatchResultSerializer(serializers.Serializer):
+    """Serializer for the outcome of one operation of an article batch write."""
+    op = serializers.CharField()
+    id = serializers.UUIDField()
+    status = serializers.IntegerField()
+    article = ArticleSerializer(required=False)
+
+
 class CommentSerializer(serializers.ModelSerializer):
     commentedBy = serializers.ReadOnlyField(source='commentedBy.name')
 
     class Meta:
         model = Comment
         fields = ['id', 'article', 'commentedBy', 'content', 'createdAt']
-        read_only_fields = ['id', 'commentedBy', 'createdAt']
+        # The article comes from the URL.
+        read_only_fields = ['id', 'article', 'commentedBy', 'createdAt']
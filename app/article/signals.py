@@ -0,0 +1,67 @@
+"""
+Signal handlers for the article app.
+"""
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from core.models import Article, Author, Comment, Tag
+from core.signals import articles_bulk_loaded, is_article_deleting
+from article.autocomplete import autocomplete_cache
+from article.cache import bump_generation
+
+
+def _invalidate():
+    # Bump again once the write is visible, so a list rendered by another
+    # request in between is not cached under the new generation.
+    bump_generation()
+    transaction.on_commit(bump_generation)
+
+
+@receiver(post_save, sender=Article)
+@receiver(post_delete, sender=Article)
+@receiver(articles_bulk_loaded, sender=Article)
+@receiver(post_save, sender=Author)
+@receiver(post_delete, sender=Author)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+@receiver(post_save, sender=Comment)
+def invalidate_article_lists(sender, **kwargs):
+    """Invalidate cached lists when anything they render changes."""
+    _invalidate()
+
+
+@receiver(post_save, sender=get_user_model())
+def invalidate_article_lists_on_creator_change(sender, instance, created, update_fields, **kwargs):
+    """Invalidate cached lists when a user who created articles may be renamed."""
+    # Lists render only the creator's name, so signups, logins and other
+    # partial saves leave them unchanged.
+    if created or (update_fields is not None and 'name' not in update_fields):
+        return
+    if Article.objects.filter(createdBy=instance).exists():
+        _invalidate()
+
+
+@receiver(post_delete, sender=Comment)
+def invalidate_article_lists_on_uncomment(sender, instance, **kwargs):
+    """Invalidate cached lists for a deleted comment, once per deleted article."""
+    if not is_article_deleting(instance.article_id):
+        _invalidate()
+
+
+@receiver(m2m_changed, sender=Article.authors.through)
+@receiver(m2m_changed, sender=Article.tags.through)
+def invalidate_article_lists_on_link(sender, action, **kwargs):
+    """Invalidate cached lists when article authors or tags change."""
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        _invalidate()
+
+
+@receiver(post_save, sender=Author)
+@receiver(post_delete, sender=Author)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def clear_autocomplete_cache(sender, **kwargs):
+    """Drop cached autocomplete results once a name changes in this process."""
+    autocomplete_cache.clear()
@@ -1,17 +1,47 @@
+import csv
 import inspect
+import json
 import random
+import re
+import time
+from unittest.mock import patch
 from django.utils import timezone
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.db import connection
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
-from rest_framework import status
+from rest_framework import status, viewsets
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APIClient
-from core.models import Article, Author, Tag, User
-from article.serializers import ArticleSerializer
+from core.models import Article, Author, Comment, Tag, User
+from core.tests.utils import benchmark
+from article.autocomplete import autocomplete_cache
+from article.serializers import ArticleRowSerializer, ArticleSerializer
+from article.views import ArticleViewSet
 
 from datetime import date, timedelta
 
 ARTICLES_URL = reverse('article:article-list')
+AUTHORS_URL = reverse('article:author-list')
+TAGS_URL = reverse('article:tag-list')
+BATCH_URL = reverse('article:article-batch')
+
+
+def detail_url(article_id):
+    """Create and return an article detail URL."""
+    return reverse('article:article-detail', args=[article_id])
+
+
+def comments_url(article_id):
+    """Create and return the comment list URL of an article."""
+    return reverse('article:article-comment-list', args=[article_id])
+
+
+def comment_url(article_id, comment_id):
+    """Create and return a comment detail URL."""
+    return reverse('article:article-comment-detail', args=[article_id, comment_id])
 
 
 def test_log(response, serializer, user=None):
@@ -81,9 +111,9 @@ def create_article(user, **params):
     tags = params.pop('tags', [])
 
     defaults = {
-        'title': params.get('title'),
-        'abstract': params.get('abstract'),
-        'publication_date': params.get('publication_date'),
+        'title': params.get('title', 'Sample article title'),
+        'abstract': params.get('abstract', 'Sample abstract.'),
+        'publication_date': params.get('publication_date', date.today()),
         'createdBy': user
     }
 
@@ -138,7 +168,7 @@ class PrivateArticleApiTests(TestCase):
         serializer = ArticleSerializer(articles, many=True)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data, serializer.data)
+        self.assertEqual(response.data['results'], serializer.data)
 
     def test_retrieve_articles_one_author(self):
         """Test retrieving a list of articles filtered by a specific author."""
@@ -158,10 +188,10 @@ class PrivateArticleApiTests(TestCase):
         articles = Article.objects.filter(authors=author1).order_by('-publication_date', 'id').distinct()
 
         # Check if the count of articles is correct
-        self.assertEqual(len(response.data), len(articles))
+        self.assertEqual(len(response.data['results']), len(articles))
 
         # Check if the returned articles are correct
-        response_article_ids = {article_data['id'] for article_data in response.data}
+        response_article_ids = {article_data['id'] for article_data in response.data['results']}
         db_article_ids = {str(article.id) for article in articles}
         self.assertTrue(response_article_ids.issubset(db_article_ids))
 
@@ -189,10 +219,10 @@ class PrivateArticleApiTests(TestCase):
         articles = Article.objects.filter(authors=author1).order_by('-publication_date', 'id').distinct()
 
         # Check if the count of articles is correct
-        self.assertEqual(len(response.data), len(articles))
+        self.assertEqual(len(response.data['results']), len(articles))
 
         # Check if the returned articles are correct
-        response_article_ids = {article_data['id'] for article_data in response.data}
+        response_article_ids = {article_data['id'] for article_data in response.data['results']}
         db_article_ids = {str(article.id) for article in articles}
         self.assertTrue(response_article_ids.issubset(db_article_ids))
 
@@ -204,7 +234,7 @@ class PrivateArticleApiTests(TestCase):
             'abstract': 'Article about upcoming technology trends.',
             'publication_date': timezone.now().date().isoformat(),
             'tags': [{'name': tag} for tag in tags],
-            'author_names': [self.user.name],
+            'authors': [{'name': self.user.name}],
         }
         response = self.client.post(ARTICLES_URL, payload, format='json')
 
@@ -220,4 +250,1489 @@ class PrivateArticleApiTests(TestCase):
         response_tags = [tag_dict['name'] for tag_dict in response.data['tags']]
         self.assertEqual(sorted(article_tags), sorted(response_tags))
 
+    def test_partial_update_article(self):
+        """Test updating the title and tags of an article."""
+        article = create_article(user=self.user, title='Old title')
+        payload = {'title': 'New title', 'tags': [{'name': 'Updated'}]}
+
+        response = self.client.patch(detail_url(article.id), payload, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        article.refresh_from_db()
+        self.assertEqual(article.title, 'New title')
+        self.assertEqual(list(article.tags.values_list('name', flat=True)), ['Updated'])
+
+
+@override_settings(ARTICLE_LIST_CACHE_TIMEOUT=0)
+class ArticleQueryCountTests(TestCase):
+    """Test the article read path runs a bounded number of queries."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email='querycount@example.com',
+            password='testpass123',
+            name='Query Counter'
+        )
+        self.client.force_authenticate(self.user)
+
+    def _create_articles(self, count):
+        for i in range(count):
+            create_article(
+                user=self.user,
+                title=f'Article {i}',
+                publication_date=date.today() - timedelta(days=i),
+            )
+        for i, article in enumerate(Article.objects.all()):
+            article.authors.add(Author.objects.get_or_create(name=f'Author {i}')[0])
+            article.tags.add(Tag.objects.get_or_create(name=f'Tag {i}')[0])
+
+    def test_list_query_count_is_constant(self):
+        """Test listing articles runs the same queries for any number of articles."""
+        self._create_articles(2)
+        with self.assertNumQueries(1):
+            response = self.client.get(ARTICLES_URL)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self._create_articles(10)
+        with self.assertNumQueries(1):
+            response = self.client.get(ARTICLES_URL)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 12)
+
+    def test_retrieve_query_count(self):
+        """Test retrieving an article does not query per author or tag."""
+        self._create_articles(3)
+        article = Article.objects.first()
+        article.authors.add(*[Author.objects.create(name=f'Co-author {i}') for i in range(5)])
+        article.tags.add(*[Tag.objects.create(name=f'Topic {i}') for i in range(5)])
+
+        # The validator query for conditional requests, then the article
+        # with its creator and name arrays.
+        with self.assertNumQueries(2):
+            response = self.client.get(detail_url(article.id))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, ArticleSerializer(article).data)
+
+
+@override_settings(ARTICLE_LIST_CACHE_TIMEOUT=0)
+class ArticlePaginationTests(TestCase):
+    """Test keyset pagination of the article list."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email='pages@example.com',
+            password='testpass123',
+            name='Page Turner'
+        )
+        self.client.force_authenticate(self.user)
+        # Several articles share each date so pages split ties on id.
+        for i in range(25):
+            create_article(
+                user=self.user,
+                title=f'Article {i}',
+                publication_date=date(2024, 1, 1) + timedelta(days=i // 4),
+            )
+        self.expected_ids = [
+            str(article_id) for article_id in
+            Article.objects.order_by('-publication_date', 'id').values_list('id', flat=True)
+        ]
+
+    def test_walk_pages_forward_and_back(self):
+        """Test following next and previous links visits every article once."""
+        response = self.client.get(ARTICLES_URL, {'page_size': 10})
+        self.assertIsNone(response.data['previous'])
+        pages = [[article['id'] for article in response.data['results']]]
+        while response.data['next']:
+            response = self.client.get(response.data['next'])
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            pages.append([article['id'] for article in response.data['results']])
+
+        self.assertEqual([len(page) for page in pages], [10, 10, 5])
+        self.assertEqual(sum(pages, []), self.expected_ids)
+
+        response = self.client.get(response.data['previous'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([article['id'] for article in response.data['results']], pages[1])
+        response = self.client.get(response.data['previous'])
+        self.assertEqual([article['id'] for article in response.data['results']], pages[0])
+        self.assertIsNone(response.data['previous'])
+
+    def test_page_size_defaults_and_is_capped(self):
+        """Test the page size falls back to the default and is capped."""
+        response = self.client.get(ARTICLES_URL, {'page_size': 'abc'})
+        self.assertEqual(len(response.data['results']), 20)
+
+        response = self.client.get(ARTICLES_URL, {'page_size': 1000})
+        self.assertEqual(len(response.data['results']), 25)
+        self.assertIsNone(response.data['next'])
+
+    def test_deep_page_seeks_the_index(self):
+        """Test a deep page is an index range scan starting at the cursor."""
+        response = self.client.get(ARTICLES_URL, {'page_size': 5})
+        while response.data['next']:
+            next_url = response.data['next']
+            response = self.client.get(next_url)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(next_url)
+        sql = queries[-1]['sql']
+
+        self.assertNotIn('OFFSET', sql)
+        self.assertIn('"core_article"."publication_date" <= ', sql)
+        with connection.cursor() as cursor:
+            # Too few rows for the planner to prefer an index otherwise.
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute(f'EXPLAIN {sql}')
+            plan = '\n'.join(row[0] for row in cursor.fetchall())
+        self.assertIn('core_article_pub_date_id_idx', plan)
+        self.assertRegex(plan, r'Index Cond: \(publication_date <= ')
+
+    def test_invalid_cursor(self):
+        """Test a malformed cursor returns 404."""
+        response = self.client.get(ARTICLES_URL, {'cursor': 'not-a-cursor'})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ArticleSearchTests(TestCase):
+    """Test full-text search over article titles and abstracts."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email='search@example.com',
+            password='testpass123',
+            name='Searcher'
+        )
+        self.client.force_authenticate(self.user)
+        self.title_match = create_article(
+            user=self.user,
+            title='Protein folding with deep networks',
+            abstract='We predict structures from sequences.',
+        )
+        self.abstract_match = create_article(
+            user=self.user,
+            title='Structural biology survey',
+            abstract='A review of methods for protein folding and docking.',
+            publication_date=date.today() + timedelta(days=1),
+        )
+        self.other = create_article(
+            user=self.user,
+            title='Galaxy rotation curves',
+            abstract='Dark matter halos explain flat rotation curves.',
+        )
+
+    def _ids(self, response):
+        return [article['id'] for article in response.data['results']]
+
+    def test_keyword_search_ranks_title_matches_first(self):
+        """Test keyword search returns matches ordered by relevance."""
+        response = self.client.get(ARTICLES_URL, {'keyword': 'folding proteins'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self._ids(response), [str(self.title_match.id), str(self.abstract_match.id)])
+
+    def test_phrase_search(self):
+        """Test phrase search only matches the words in order."""
+        response = self.client.get(ARTICLES_URL, {'phrase': 'flat rotation curves'})
+        self.assertEqual(self._ids(response), [str(self.other.id)])
+
+        response = self.client.get(ARTICLES_URL, {'phrase': 'curves rotation flat'})
+        self.assertEqual(self._ids(response), [])
+
+    def test_search_highlight(self):
+        """Test highlighted snippets are returned only when requested."""
+        response = self.client.get(ARTICLES_URL, {'keyword': 'docking'})
+        self.assertNotIn('headline', response.data['results'][0])
+
+        response = self.client.get(ARTICLES_URL, {'keyword': 'docking', 'highlight': 'true'})
+        self.assertIn('<mark>docking</mark>', response.data['results'][0]['headline'])
+
+    def test_search_vector_follows_updates(self):
+        """Test edited titles are searchable straight away."""
+        self.other.title = 'Quasar spectra'
+        self.other.save()
+
+        response = self.client.get(ARTICLES_URL, {'keyword': 'quasar'})
+
+        self.assertEqual(self._ids(response), [str(self.other.id)])
+
+    def test_search_results_paginate_by_rank(self):
+        """Test paging through ranked results visits every match once."""
+        for i in range(5):
+            create_article(user=self.user, title=f'Folding study {i}', abstract='Protein folding ' * (i + 1))
+
+        response = self.client.get(ARTICLES_URL, {'keyword': 'folding', 'page_size': 2})
+        ids = self._ids(response)
+        while response.data['next']:
+            response = self.client.get(response.data['next'])
+            ids += self._ids(response)
+
+        self.assertEqual(len(ids), 7)
+        self.assertEqual(len(set(ids)), 7)
+
+
+class ArticleWriteQueryCountTests(TestCase):
+    """Benchmark the round trips needed to create an article."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email='writer@example.com',
+            password='testpass123',
+            name='Writer'
+        )
+        self.client.force_authenticate(self.user)
+
+    def _create(self, authors, tags):
+        payload = {
+            'title': 'Benchmark article',
+            'abstract': 'Abstract.',
+            'publication_date': '2024-01-01',
+            'authors': [{'name': name} for name in authors],
+            'tags': [{'name': name} for name in tags],
+        }
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(ARTICLES_URL, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        return response, len(queries)
+
+    def test_create_round_trips_stay_flat(self):
+        """Test new and existing names cost the same queries at any count."""
+        round_trips = {}
+        for count in (1, 5, 20):
+            authors = [f'Author {count}-{i}' for i in range(count)]
+            tags = [f'Tag {count}-{i}' for i in range(count // 2 + 1)]
+            _, round_trips[('new', count)] = self._create(authors, tags)
+            _, round_trips[('existing', count)] = self._create(authors, tags)
+
+        self.assertEqual(len({round_trips[('new', count)] for count in (1, 5, 20)}), 1)
+        self.assertEqual(len({round_trips[('existing', count)] for count in (1, 5, 20)}), 1)
+
+    def test_create_keeps_name_order(self):
+        """Test a created article keeps the authors and tags in request order."""
+        Author.objects.create(name='Zed Existing')
+
+        response, _ = self._create(['Amy New', 'Zed Existing', 'Amy New'], ['Zeta', 'Alpha'])
+
+        self.assertEqual(response.data['authors'], [{'name': 'Amy New'}, {'name': 'Zed Existing'}])
+        article = Article.objects.get(id=response.data['id'])
+        self.assertEqual((article.author_names, article.tag_names), (['Amy New', 'Zed Existing'], ['Zeta', 'Alpha']))
+        self.assertFalse(Article.objects.filter(pk=article.pk).stale_names().exists())
+
+    def test_create_links_existing_names(self):
+        """Test names that already exist are reused rather than rejected."""
+        Author.objects.create(name='Ada Lovelace')
+        Tag.objects.create(name='Computing')
+
+        response, _ = self._create(['Ada Lovelace', 'Charles Babbage', 'Ada Lovelace'], ['Computing'])
+
+        article = Article.objects.get(id=response.data['id'])
+        self.assertEqual(
+            sorted(article.authors.values_list('name', flat=True)),
+            ['Ada Lovelace', 'Charles Babbage'],
+        )
+        self.assertEqual(list(article.tags.values_list('name', flat=True)), ['Computing'])
+        self.assertEqual(Author.objects.filter(name='Ada Lovelace').count(), 1)
+
+
+class ArticleUpdateQueryCountTests(TestCase):
+    """Test article updates write only what changed."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email='editor@example.com',
+            password='testpass123',
+            name='Editor'
+        )
+        self.client.force_authenticate(self.user)
+        response = self.client.post(ARTICLES_URL, {
+            'title': 'Original',
+            'abstract': 'Sample abstract.',
+            'publication_date': '2024-01-01',
+            'authors': [{'name': 'Ada Lovelace'}, {'name': 'Alan Turing'}],
+            'tags': [{'name': 'Logic'}, {'name': 'Computing'}],
+        }, format='json')
+        self.article = Article.objects.get(id=response.data['id'])
+
+    def _patch(self, payload):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(detail_url(self.article.id), payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        return response, [query['sql'] for query in queries]
+
+    def _writes(self, queries):
+        return [sql.split()[0] for sql in queries if sql.split()[0] in ('INSERT', 'UPDATE', 'DELETE')]
+
+    def test_unchanged_update_writes_nothing(self):
+        """Test resending the current values issues no writes."""
+        updated_at = self.article.updated_at
+
+        response, queries = self._patch({
+            'title': 'Original',
+            'authors': [{'name': 'Ada Lovelace'}, {'name': 'Alan Turing'}],
+            'tags': [{'name': 'Logic'}, {'name': 'Computing'}],
+        })
+
+        self.assertEqual(self._writes(queries), [])
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.updated_at, updated_at)
+        self.assertEqual(response.data['authors'], [{'name': 'Ada Lovelace'}, {'name': 'Alan Turing'}])
+
+    def test_update_fields_only(self):
+        """Test a title change is one UPDATE of the changed columns."""
+        with self.assertNumQueries(4):
+            # Savepoint, locked fetch, update and savepoint release.
+            response, queries = self._patch({'title': 'Renamed'})
+
+        updates = [sql for sql in queries if sql.startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+        self.assertNotIn('"abstract"', updates[0])
+        self.assertIn('FOR UPDATE', next(sql for sql in queries if sql.startswith('SELECT')))
+        self.assertEqual(response.data['title'], 'Renamed')
+
+    def test_relink_touches_changed_links_only(self):
+        """Test changing one tag deletes and inserts a single link."""
+        kept = Article.tags.through.objects.get(article=self.article, tag__name='Logic')
+
+        response, queries = self._patch({'tags': [{'name': 'Logic'}, {'name': 'Proof'}]})
+
+        self.assertEqual(self._writes(queries), ['INSERT', 'DELETE', 'INSERT', 'UPDATE'])
+        self.assertTrue(Article.tags.through.objects.filter(pk=kept.pk).exists())
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.tag_names, ['Logic', 'Proof'])
+        self.assertFalse(Article.objects.filter(pk=self.article.pk).stale_names().exists())
+        self.assertEqual(response.data['tags'], [{'name': 'Logic'}, {'name': 'Proof'}])
+        self.assertEqual(response.data['authors'], [{'name': 'Ada Lovelace'}, {'name': 'Alan Turing'}])
+
+    def test_put_reorders_authors(self):
+        """Test a PUT that only reorders the authors applies the new order."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.put(detail_url(self.article.id), {
+                'title': 'Original',
+                'abstract': 'Sample abstract.',
+                'publication_date': '2024-01-01',
+                'authors': [{'name': 'Alan Turing'}, {'name': 'Ada Lovelace'}],
+                'tags': [{'name': 'Logic'}, {'name': 'Computing'}],
+            }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['authors'], [{'name': 'Alan Turing'}, {'name': 'Ada Lovelace'}])
+        self.assertEqual(self._writes([query['sql'] for query in queries]), ['DELETE', 'INSERT', 'UPDATE'])
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.author_names, ['Alan Turing', 'Ada Lovelace'])
+        self.assertFalse(Article.objects.filter(pk=self.article.pk).stale_names().exists())
+
+    def test_update_round_trips_stay_flat(self):
+        """Test relinking many names costs the same queries as relinking one."""
+        round_trips = {}
+        for count in (1, 5, 20):
+            names = [{'name': f'Author {count}-{i}'} for i in range(count)]
+            _, queries = self._patch({'authors': names})
+            round_trips[count] = len(queries)
+
+        self.assertEqual(len(set(round_trips.values())), 1)
+
+
+class ArticleExportTests(TestCase):
+    """Test streaming exports of filtered articles."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email='export@example.com',
+            password='testpass123',
+            name='Exporter'
+        )
+        self.client.force_authenticate(self.user)
+        self.articles = []
+        for i in range(5):
+            article = create_article(
+                user=self.user,
+                title=f'Export {i}',
+                abstract=f'Abstract, "quoted" {i}',
+                publication_date=date(2022 + i % 2, 1, i + 1),
+            )
+            # Link one at a time so the link order is known.
+            for name in ('Zed', f'Author {i}'):
+                article.authors.add(Author.objects.get_or_create(name=name)[0])
+            if i % 2:
+                article.tags.add(Tag.objects.get_or_create(name='Odd')[0])
+            self.articles.append(article)
+
+    def _export(self, **params):
+        response = self.client.get(reverse('article:article-export'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content).decode('utf-8')
+
+    def test_export_ndjson(self):
+        """Test exporting newline delimited JSON with names aggregated in SQL."""
+        with self.assertNumQueries(1):
+            response, content = self._export(year=2023)
+
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual([row['title'] for row in rows], ['Export 3', 'Export 1'])
+        self.assertEqual(rows[0], {
+            'id': str(self.articles[3].id),
+            'title': 'Export 3',
+            'abstract': 'Abstract, "quoted" 3',
+            'publication_date': '2023-01-04',
+            'authors': ['Zed', 'Author 3'],
+            'tags': ['Odd'],
+        })
+
+    def test_export_csv(self):
+        """Test exporting CSV in the layout import_articles reads."""
+        response, content = self._export(export_format='csv', tags='Odd')
+
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        rows = list(csv.DictReader(content.splitlines()))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0]['abstract'], 'Abstract, "quoted" 3')
+        self.assertEqual(rows[0]['authors'], 'Zed;Author 3')
+        self.assertEqual(rows[0]['tags'], 'Odd')
+
+    def test_export_invalid_format(self):
+        """Test an unknown export format is rejected."""
+        response = self.client.get(reverse('article:article-export'), {'export_format': 'xml'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ArticleListCacheTests(TestCase):
+    """Test caching of rendered article lists."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email='cache@example.com',
+            password='testpass123',
+            name='Cache User'
+        )
+        self.client.force_authenticate(self.user)
+        self.article = create_article(user=self.user, title='Cached article')
+        self.article.authors.add(Author.objects.create(name='Ada'), Author.objects.create(name='Grace'))
+
+    def test_repeated_list_is_served_from_cache(self):
+        """Test identical lists are rendered once, whatever the param order."""
+        response = self.client.get(ARTICLES_URL, {'authors': 'Grace,Ada', 'page_size': 5})
+        self.assertEqual(response['X-Cache'], 'MISS')
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(ARTICLES_URL, {'page_size': 5, 'authors': 'Ada,Grace,Ada'})
+
+        self.assertEqual(cached['X-Cache'], 'HIT')
+        self.assertEqual(cached.status_code, status.HTTP_200_OK)
+        self.assertEqual(cached.content, response.content)
+        self.assertEqual(cached['Content-Type'], response['Content-Type'])
+
+    def test_writes_invalidate_cached_lists(self):
+        """Test article, name and link changes all invalidate the cache."""
+        writes = [
+            lambda: create_article(user=self.user, title='Another article'),
+            lambda: self.article.tags.add(Tag.objects.create(name='New tag')),
+            lambda: Author.objects.filter(name='Ada').get().delete(),
+            lambda: self.article.delete(),
+        ]
+        self.client.get(ARTICLES_URL)
+        for write in writes:
+            write()
+            response = self.client.get(ARTICLES_URL)
+            self.assertEqual(response['X-Cache'], 'MISS')
+            self.assertEqual(self.client.get(ARTICLES_URL)['X-Cache'], 'HIT')
+
+    def test_only_creator_renames_invalidate_cached_lists(self):
+        """Test signups, logins and renames of users without articles keep the cache."""
+        self.client.get(ARTICLES_URL)
+        other = get_user_model().objects.create_user(email='other@example.com', password='testpass123')
+        self.user.last_login = timezone.now()
+        self.user.save(update_fields=['last_login'])
+        other.name = 'Renamed Other'
+        other.save()
+
+        self.assertEqual(self.client.get(ARTICLES_URL)['X-Cache'], 'HIT')
+
+        self.user.name = 'Renamed Creator'
+        self.user.save(update_fields=['name'])
+        response = self.client.get(ARTICLES_URL)
+
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['created_by'], 'Renamed Creator')
+
+    @patch('article.cache.ListResponseCache.get_key', return_value='article:list:test')
+    def test_waits_for_the_request_rendering_a_cold_key(self, patched_key):
+        """Test a request that loses the render lock reuses the winner's result."""
+        # Another worker holds the lock and stores its result while we wait.
+        cache.add('article:list:test:lock', 1)
+        with patch('article.cache.time.sleep') as patched_sleep:
+            patched_sleep.side_effect = lambda seconds: cache.set(
+                'article:list:test', (b'{"results":[]}', 'application/json'),
+            )
+            with self.assertNumQueries(0):
+                response = self.client.get(ARTICLES_URL)
+
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(response.content, b'{"results":[]}')
+
+    @patch('article.cache.LOCK_WAIT', 0.05)
+    @patch('article.cache.ListResponseCache.get_key', return_value='article:list:test')
+    def test_renders_when_lock_holder_is_too_slow(self, patched_key):
+        """Test a request stops waiting for a stuck render after LOCK_WAIT."""
+        cache.add('article:list:test:lock', 1)
+
+        response = self.client.get(ARTICLES_URL)
+
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertTrue(cache.get('article:list:test:lock'))
+
+    def test_cache_stats(self):
+        """Test hit and miss counters are reported to admins only."""
+        self.client.get(ARTICLES_URL)
+        self.client.get(ARTICLES_URL)
+        stats_url = reverse('article:article-cache-stats')
+
+        self.assertEqual(self.client.get(stats_url).status_code, status.HTTP_403_FORBIDDEN)
+
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.get(stats_url)
+        self.assertEqual(response.data['hits'], 1)
+        self.assertEqual(response.data['misses'], 1)
+        self.assertEqual(response.data['hit_ratio'], 0.5)
+
+
+class ArticleConditionalRequestTests(TestCase):
+    """Test ETag and Last-Modified validators on article responses."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email='etag@example.com',
+            password='testpass123',
+            name='Poller'
+        )
+        self.client.force_authenticate(self.user)
+        self.article = create_article(user=self.user, title='Polled article')
+        self.article.authors.add(Author.objects.create(name='Ada'))
+
+    def test_detail_not_modified(self):
+        """Test a matching If-None-Match only runs the validator query."""
+        response = self.client.get(detail_url(self.article.id))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('Last-Modified', response)
+
+        with self.assertNumQueries(1):
+            cached = self.client.get(detail_url(self.article.id), HTTP_IF_NONE_MATCH=response['ETag'])
+
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(cached['ETag'], response['ETag'])
+
+    def test_detail_if_modified_since(self):
+        """Test If-Modified-Since returns 304 until the article changes."""
+        response = self.client.get(detail_url(self.article.id))
+
+        cached = self.client.get(detail_url(self.article.id), HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def _rename_author(self, name, new_name):
+        author = Author.objects.get(name=name)
+        author.name = new_name
+        author.save()
+
+    def test_detail_validators_follow_writes(self):
+        """Test field edits and author/tag link changes all change the ETag."""
+        etags = [self.client.get(detail_url(self.article.id))['ETag']]
+        writes = [
+            lambda: Article.objects.get(pk=self.article.pk).save(),
+            lambda: self.article.tags.add(Tag.objects.create(name='Physics')),
+            lambda: Author.objects.create(name='Grace').article_set.add(self.article),
+            lambda: self._rename_author('Ada', 'Ada L.'),
+            lambda: self.article.authors.clear(),
+        ]
+        for write in writes:
+            write()
+            response = self.client.get(detail_url(self.article.id), HTTP_IF_NONE_MATCH=etags[-1])
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            etags.append(response['ETag'])
+
+        self.assertEqual(len(set(etags)), len(writes) + 1)
+
+    def test_detail_unknown_article(self):
+        """Test missing or malformed ids still return 404."""
+        for article_id in ('00000000-0000-0000-0000-000000000000', 'not-a-uuid'):
+            response = self.client.get(f'{ARTICLES_URL}{article_id}/')
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_list_not_modified(self):
+        """Test a matching list ETag returns 304 without touching the database."""
+        response = self.client.get(ARTICLES_URL, {'page_size': 5})
+        self.assertIn('ETag', response)
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(ARTICLES_URL, {'page_size': 5}, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        other_page = self.client.get(ARTICLES_URL, {'page_size': 6}, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(other_page.status_code, status.HTTP_200_OK)
+
+        create_article(user=self.user, title='Fresh article')
+        changed = self.client.get(ARTICLES_URL, {'page_size': 5}, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(changed.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(changed['ETag'], response['ETag'])
+
+
+@override_settings(ARTICLE_LIST_CACHE_TIMEOUT=0)
+class ArticleDateFilterTests(TestCase):
+    """Test filtering articles by publication date ranges."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email='dates@example.com',
+            password='testpass123',
+            name='Date Keeper'
+        )
+        self.client.force_authenticate(self.user)
+        for publication_date in (
+            date(2022, 12, 31),
+            date(2023, 1, 1),
+            date(2023, 1, 31),
+            date(2023, 2, 1),
+            date(2023, 12, 31),
+            date(2024, 1, 1),
+        ):
+            create_article(user=self.user, title=str(publication_date), publication_date=publication_date)
+
+    def _titles(self, **params):
+        response = self.client.get(ARTICLES_URL, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return sorted(article['title'] for article in response.data['results'])
+
+    def test_filter_by_year(self):
+        """Test the year filter includes both of its boundary days."""
+        self.assertEqual(
+            self._titles(year=2023),
+            ['2023-01-01', '2023-01-31', '2023-02-01', '2023-12-31'],
+        )
+
+    def test_filter_by_year_and_month(self):
+        """Test the month filter covers exactly that month of the year."""
+        self.assertEqual(self._titles(year=2023, month=1), ['2023-01-01', '2023-01-31'])
+        self.assertEqual(self._titles(year=2023, month=12), ['2023-12-31'])
+        self.assertEqual(self._titles(year=2022, month=12), ['2022-12-31'])
+
+    def test_filter_by_month_of_any_year(self):
+        """Test the month filter without a year matches every year."""
+        self.assertEqual(self._titles(month=12), ['2022-12-31', '2023-12-31'])
+
+    def test_filter_published_after_and_before(self):
+        """Test published_after is inclusive and published_before exclusive."""
+        self.assertEqual(self._titles(published_after='2023-12-31'), ['2023-12-31', '2024-01-01'])
+        self.assertEqual(self._titles(published_before='2023-01-01'), ['2022-12-31'])
+        self.assertEqual(
+            self._titles(published_after='2023-01-31', published_before='2023-12-31', year=2023),
+            ['2023-01-31', '2023-02-01'],
+        )
+
+    def test_invalid_date_params(self):
+        """Test malformed or out of range date params return 400."""
+        for params in (
+            {'year': 'abc'},
+            {'year': 0},
+            {'month': 13},
+            {'published_after': '2023-02-30'},
+            {'published_before': 'yesterday'},
+        ):
+            response = self.client.get(ARTICLES_URL, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, params)
+            self.assertIn(next(iter(params)), response.data)
+
+    def test_date_filters_use_index(self):
+        """Test date filtered lists scan the publication date index."""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO core_article (
+                    id, title, abstract, publication_date, updated_at, author_names, tag_names, comment_count
+                )
+                SELECT md5(i::text)::uuid, 'Seeded ' || i, 'Seeded abstract',
+                       date '1990-01-01' + (i % 12000), now(), '{}', '{}', 0
+                FROM generate_series(1, 50000) AS i
+                """
+            )
+            cursor.execute('ANALYZE core_article')
+
+        for params in (
+            {'year': 2010},
+            {'year': 2010, 'month': 6},
+            {'published_after': '2010-06-01', 'published_before': '2010-06-15'},
+        ):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(ARTICLES_URL, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+            with connection.cursor() as cursor:
+                cursor.execute('EXPLAIN ' + queries.captured_queries[0]['sql'])
+                plan = '\n'.join(row[0] for row in cursor.fetchall())
+            self.assertIn('core_article_pub_date_id_idx', plan, params)
+            self.assertNotIn('Seq Scan on core_article', plan, params)
+
+
+class ArticleFacetTests(TestCase):
+    """Test article counts per tag, author and year."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email='facets@example.com',
+            password='testpass123',
+            name='Facet Counter'
+        )
+        self.client.force_authenticate(self.user)
+        self.url = reverse('article:article-facets')
+        python = Tag.objects.create(name='Python')
+        django = Tag.objects.create(name='Django')
+        rust = Tag.objects.create(name='Rust')
+        alice = Author.objects.create(name='Alice')
+        bob = Author.objects.create(name='Bob')
+        for i, (publication_date, tags, authors) in enumerate([
+            (date(2022, 5, 1), [python], [alice]),
+            (date(2023, 5, 1), [python, django], [alice, bob]),
+            (date(2023, 6, 1), [python, django], [bob]),
+            (date(2023, 7, 1), [rust], [bob]),
+        ]):
+            article = create_article(user=self.user, title=f'Article {i}', publication_date=publication_date)
+            article.tags.add(*tags)
+            article.authors.add(*authors)
+
+    def test_global_facets(self):
+        """Test counting every article."""
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {
+            'count': 4,
+            'tags': [
+                {'name': 'Python', 'count': 3},
+                {'name': 'Django', 'count': 2},
+                {'name': 'Rust', 'count': 1},
+            ],
+            'authors': [{'name': 'Bob', 'count': 3}, {'name': 'Alice', 'count': 2}],
+            'years': [{'year': 2023, 'count': 3}, {'year': 2022, 'count': 1}],
+        })
+
+    def test_filtered_facets(self):
+        """Test facets count only the articles matching the filters."""
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url, {'year': 2023, 'tags': 'Python,Rust'})
+
+        self.assertEqual(response.data['count'], 3)
+        # Ties are broken by name.
+        self.assertEqual(response.data['tags'], [
+            {'name': 'Django', 'count': 2},
+            {'name': 'Python', 'count': 2},
+            {'name': 'Rust', 'count': 1},
+        ])
+        self.assertEqual(response.data['authors'], [{'name': 'Bob', 'count': 3}, {'name': 'Alice', 'count': 1}])
+        self.assertEqual(response.data['years'], [{'year': 2023, 'count': 3}])
+
+    def test_facet_size(self):
+        """Test facet_size limits tags and authors to the most common."""
+        response = self.client.get(self.url, {'facet_size': 1})
+
+        self.assertEqual(response.data['tags'], [{'name': 'Python', 'count': 3}])
+        self.assertEqual(response.data['authors'], [{'name': 'Bob', 'count': 3}])
+        self.assertEqual(len(response.data['years']), 2)
+
+        response = self.client.get(self.url, {'facet_size': 0})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_global_facets_cached_until_write(self):
+        """Test the unfiltered facets are cached until articles change."""
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.data['count'], 4)
+
+        create_article(user=self.user, title='Another article', publication_date=date(2021, 1, 1))
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['count'], 5)
+        self.assertEqual(response.data['years'][-1], {'year': 2021, 'count': 1})
+
+
+@override_settings(ARTICLE_LIST_CACHE_TIMEOUT=0)
+class ArticleNameMatchTests(TestCase):
+    """Test matching any or all of the given authors and tags."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email='matcher@example.com',
+            password='testpass123',
+            name='Matcher'
+        )
+        self.client.force_authenticate(self.user)
+        python, django, rust = [Tag.objects.create(name=name) for name in ('Python', 'Django', 'Rust')]
+        alice, bob = [Author.objects.create(name=name) for name in ('Alice', 'Bob')]
+        for title, tags, authors in [
+            ('Python only', [python], [alice]),
+            ('Python and Django', [python, django], [alice, bob]),
+            ('Everything', [python, django, rust], [bob]),
+            ('Rust only', [rust], [bob]),
+        ]:
+            article = create_article(user=self.user, title=title)
+            article.tags.add(*tags)
+            article.authors.add(*authors)
+
+    def _titles(self, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(ARTICLES_URL, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('DISTINCT', queries.captured_queries[0]['sql'])
+        return sorted(article['title'] for article in response.data['results'])
+
+    def test_match_any(self):
+        """Test articles with any of the names match by default."""
+        self.assertEqual(self._titles(tags='Django,Rust'), ['Everything', 'Python and Django', 'Rust only'])
+        self.assertEqual(self._titles(tags='Django,Rust', tags_mode='any'), self._titles(tags='Django,Rust'))
+        self.assertEqual(self._titles(authors='Alice'), ['Python and Django', 'Python only'])
+
+    def test_match_all(self):
+        """Test articles must have every name in all mode."""
+        self.assertEqual(self._titles(tags='Python,Django', tags_mode='all'), ['Everything', 'Python and Django'])
+        self.assertEqual(self._titles(tags='Python,Rust,Django', tags_mode='all'), ['Everything'])
+        self.assertEqual(self._titles(authors='Alice,Bob', authors_mode='all'), ['Python and Django'])
+        self.assertEqual(self._titles(tags='Python,Unknown', tags_mode='all'), [])
+
+    def test_match_all_ignores_repeated_and_blank_names(self):
+        """Test repeated names and stray separators do not change the match."""
+        self.assertEqual(
+            self._titles(tags='Python, Django,,Python', tags_mode='all'),
+            ['Everything', 'Python and Django'],
+        )
+
+    def test_combined_modes(self):
+        """Test author and tag modes apply independently."""
+        self.assertEqual(
+            self._titles(tags='Python,Django', tags_mode='all', authors='Alice', authors_mode='any'),
+            ['Python and Django'],
+        )
+
+    def test_invalid_mode(self):
+        """Test an unknown mode returns 400."""
+        response = self.client.get(ARTICLES_URL, {'tags': 'Python', 'tags_mode': 'some'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('tags_mode', response.data)
+
+
+@override_settings(ARTICLE_LIST_CACHE_TIMEOUT=0)
+class ArticleNameMatchSharedTagsTests(TestCase):
+    """Test name filters on articles sharing the same tags."""
+
+    ARTICLES = 5000
+    TAGS = 8
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email='shared@example.com',
+            password='testpass123',
+            name='Shared Tags'
+        )
+        self.client.force_authenticate(self.user)
+        self.tag_names = [f'Shared {i}' for i in range(self.TAGS)]
+        Tag.objects.bulk_create([Tag(name=name) for name in self.tag_names])
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO core_article (
+                    id, title, abstract, publication_date, updated_at, author_names, tag_names, comment_count
+                )
+                SELECT md5(i::text)::uuid, 'Shared ' || i, 'Shared abstract',
+                       date '2000-01-01' + (i %% 5000), now(), '{}', '{}', 0
+                FROM generate_series(1, %s) AS i
+                """,
+                [self.ARTICLES],
+            )
+            # Every article carries every tag.
+            cursor.execute(
+                """
+                INSERT INTO core_article_tags (article_id, tag_id)
+                SELECT article.id, tag.id FROM core_article article CROSS JOIN core_tag tag
+                """
+            )
+            cursor.execute("UPDATE core_article SET tag_names = ARRAY(SELECT name FROM core_tag ORDER BY id)")
+            cursor.execute('ANALYZE')
+
+    def _list_sql(self, **params):
+        """Return the article query of a first list page."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(ARTICLES_URL, {'page_size': 100, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return queries.captured_queries[0]['sql']
+
+    def _run(self, sql):
+        """Return the first column of the rows `sql` returns."""
+        with connection.cursor() as cursor:
+            cursor.execute(sql)
+            return [row[0] for row in cursor.fetchall()]
+
+    def _plan(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN ANALYZE ' + sql)
+            return '\n'.join(row[0] for row in cursor.fetchall())
+
+    def test_shared_tags_no_join_explosion(self):
+        """Test matching many shared tags no longer deduplicates joined rows."""
+        tags = ','.join(self.tag_names)
+        # The previous filter: join every link, then deduplicate.
+        joined = Article.objects.filter(
+            tags__name__in=self.tag_names,
+        ).distinct().order_by('-publication_date', 'id').values_list('id')
+        with connection.cursor() as cursor:
+            sql, params = joined.query.sql_with_params()
+            joined_sql = cursor.mogrify(sql + ' LIMIT 101', params).decode()
+
+        results = set()
+        for name, page_sql in (
+            ('join + DISTINCT', joined_sql),
+            ('any mode', self._list_sql(tags=tags)),
+            ('all mode', self._list_sql(tags=tags, tags_mode='all')),
+        ):
+            # The whole match, as counted or exported, exposes the join.
+            match_sql = 'SELECT COUNT(*) FROM (%s) AS page' % re.sub(r' LIMIT \d+$', '', page_sql)
+            results.add((tuple(self._run(page_sql)), tuple(self._run(match_sql))))
+            if name != 'join + DISTINCT':
+                self.assertNotIn('DISTINCT', page_sql)
+                self.assertNotIn('core_article_tags', page_sql)
+                self.assertNotIn('Unique', self._plan(match_sql))
+
+        self.assertEqual(len(results), 1)
+
+
+@override_settings(ARTICLE_LIST_CACHE_TIMEOUT=0)
+class CommentApiTests(TestCase):
+    """Test the nested comments API and the article comment counter."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email='commenter@example.com',
+            password='testpass123',
+            name='Comment Writer'
+        )
+        self.other_user = get_user_model().objects.create_user(
+            email='other@example.com',
+            password='testpass123',
+            name='Other Writer'
+        )
+        self.client.force_authenticate(self.user)
+        self.article = create_article(user=self.user)
+
+    def test_create_comment_counts_on_article(self):
+        """Test adding a comment stores it and increments the counter."""
+        response = self.client.post(comments_url(self.article.id), {'content': 'Nice read.'})
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        comment = Comment.objects.get(id=response.data['id'])
+        self.assertEqual(comment.article, self.article)
+        self.assertEqual(comment.commentedBy, self.user)
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.comment_count, 1)
+
+        response = self.client.get(detail_url(self.article.id))
+        self.assertEqual(response.data['comment_count'], 1)
+
+    def test_delete_comment_uncounts_on_article(self):
+        """Test deleting a comment decrements the counter."""
+        comment = Comment.objects.create(article=self.article, commentedBy=self.user, content='Bye.')
+
+        response = self.client.delete(comment_url(self.article.id, comment.id))
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Comment.objects.filter(id=comment.id).exists())
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.comment_count, 0)
+
+    def test_delete_comment_of_other_user_forbidden(self):
+        """Test a user cannot delete someone else's comment."""
+        comment = Comment.objects.create(article=self.article, commentedBy=self.other_user, content='Mine.')
+
+        response = self.client.delete(comment_url(self.article.id, comment.id))
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertTrue(Comment.objects.filter(id=comment.id).exists())
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.comment_count, 1)
+
+    def test_list_only_article_comments_in_pages(self):
+        """Test listing walks an article's comments oldest first in pages."""
+        other_article = create_article(user=self.user, title='Other article')
+        Comment.objects.create(article=other_article, commentedBy=self.user, content='Elsewhere.')
+        for i in range(7):
+            Comment.objects.create(article=self.article, commentedBy=self.user, content=f'Comment {i}')
+        expected_ids = list(
+            Comment.objects.filter(article=self.article).order_by('createdAt', 'id').values_list('id', flat=True)
+        )
+
+        response = self.client.get(comments_url(self.article.id), {'page_size': 3})
+        ids = [comment['id'] for comment in response.data['results']]
+        while response.data['next']:
+            response = self.client.get(response.data['next'])
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids += [comment['id'] for comment in response.data['results']]
+
+        self.assertEqual(ids, expected_ids)
+
+    def test_list_query_count_is_constant(self):
+        """Test listing comments does not query per comment."""
+        for i in range(10):
+            Comment.objects.create(article=self.article, commentedBy=self.user, content=f'Comment {i}')
+
+        # The article lookup, then the page of comments.
+        with self.assertNumQueries(2):
+            response = self.client.get(comments_url(self.article.id))
+        self.assertEqual(len(response.data['results']), 10)
+
+    def test_comments_of_missing_article(self):
+        """Test listing or adding comments on an unknown article returns 404."""
+        response = self.client.get(comments_url('00000000-0000-0000-0000-000000000000'))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        response = self.client.post(comments_url('not-a-uuid'), {'content': 'Lost.'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_article_list_shows_counts_without_extra_queries(self):
+        """Test the article list renders comment counts from the column."""
+        for i in range(3):
+            Comment.objects.create(article=self.article, commentedBy=self.user, content=f'Comment {i}')
+
+        with self.assertNumQueries(1):
+            response = self.client.get(ARTICLES_URL)
+
+        self.assertEqual(response.data['results'][0]['comment_count'], 3)
+
+
+@override_settings(ARTICLE_LIST_CACHE_TIMEOUT=0)
+class ArticleBatchTests(TestCase):
+    """Test creating, updating and deleting articles in one batch."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email='batch@example.com',
+            password='testpass123',
+            name='Batch Writer'
+        )
+        self.other_user = get_user_model().objects.create_user(
+            email='notbatch@example.com',
+            password='testpass123',
+            name='Someone Else'
+        )
+        self.client.force_authenticate(self.user)
+
+    def _payload(self, i, authors=None, tags=None):
+        return {
+            'title': f'Batch article {i}',
+            'abstract': 'Abstract.',
+            'publication_date': '2024-01-01',
+            'authors': [{'name': name} for name in authors or [f'Author {i}']],
+            'tags': [{'name': name} for name in tags or [f'Tag {i}']],
+        }
+
+    def test_batch_create_update_delete(self):
+        """Test a mixed batch applies every operation and reports each."""
+        updated = create_article(user=self.user, title='Old title')
+        deleted = create_article(user=self.user, title='Doomed')
+        operations = [
+            {'op': 'create', 'data': self._payload(1, authors=['Ada Lovelace', 'Alan Turing'])},
+            {'op': 'update', 'id': str(updated.id), 'data': {'title': 'New title', 'tags': [{'name': 'Logic'}]}},
+            {'op': 'delete', 'id': str(deleted.id)},
+        ]
+
+        response = self.client.post(BATCH_URL, operations, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual([result['status'] for result in response.data], [201, 200, 204])
+        created = Article.objects.get(id=response.data[0]['id'])
+        self.assertEqual(created.createdBy, self.user)
+        self.assertEqual(created.author_names, ['Ada Lovelace', 'Alan Turing'])
+        self.assertEqual(response.data[0]['article'], ArticleSerializer(created).data)
+
+        updated.refresh_from_db()
+        self.assertEqual(updated.title, 'New title')
+        self.assertEqual(updated.tag_names, ['Logic'])
+        self.assertEqual(list(updated.tags.values_list('name', flat=True)), ['Logic'])
+        self.assertEqual(response.data[1]['article']['title'], 'New title')
+        self.assertFalse(Article.objects.filter(id=deleted.id).exists())
+
+    def test_batch_invalid_item_writes_nothing(self):
+        """Test one invalid operation rejects the batch with per-item errors."""
+        missing = '00000000-0000-0000-0000-000000000000'
+        operations = [
+            {'op': 'create', 'data': self._payload(1)},
+            {'op': 'create', 'data': {'title': 'No authors'}},
+            {'op': 'delete', 'id': missing},
+        ]
+
+        response = self.client.post(BATCH_URL, operations, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertIn('authors', response.data[1]['data'])
+        self.assertIn('id', response.data[2])
+        self.assertFalse(Article.objects.exists())
+
+    def test_batch_update_of_other_user_forbidden(self):
+        """Test a batch cannot edit articles created by someone else."""
+        article = create_article(user=self.other_user, title='Not yours')
+        operations = [
+            {'op': 'create', 'data': self._payload(1)},
+            {'op': 'update', 'id': str(article.id), 'data': {'title': 'Mine now'}},
+        ]
+
+        response = self.client.post(BATCH_URL, operations, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        article.refresh_from_db()
+        self.assertEqual(article.title, 'Not yours')
+        self.assertEqual(Article.objects.count(), 1)
+
+    def test_batch_invalidates_list_cache(self):
+        """Test articles written in a batch show up in cached lists."""
+        with override_settings(ARTICLE_LIST_CACHE_TIMEOUT=300):
+            cache.clear()
+            self.client.get(ARTICLES_URL)
+            self.client.post(BATCH_URL, [{'op': 'create', 'data': self._payload(1)}], format='json')
+            response = self.client.get(ARTICLES_URL)
+
+        self.assertEqual(len(response.data['results']), 1)
+
+    def test_batch_round_trips_stay_flat(self):
+        """Test a batch costs the same queries at any size, unlike single writes."""
+        round_trips = {}
+        for count in (1, 10, 50):
+            operations = [{'op': 'create', 'data': self._payload(f'{count}-{i}')} for i in range(count)]
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(BATCH_URL, operations, format='json')
+            self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+            round_trips[count] = len(queries)
+
+        self.assertEqual(len(set(round_trips.values())), 1)
+
+    @benchmark
+    def test_batch_throughput_against_single_writes(self):
+        """Benchmark writing articles in one batch against one request each."""
+        count = 100
+
+        started = time.perf_counter()
+        for i in range(count):
+            response = self.client.post(ARTICLES_URL, self._payload(f'single-{i}'), format='json')
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        single = time.perf_counter() - started
+
+        operations = [{'op': 'create', 'data': self._payload(f'batch-{i}')} for i in range(count)]
+        started = time.perf_counter()
+        response = self.client.post(BATCH_URL, operations, format='json')
+        batch = time.perf_counter() - started
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Article.objects.count(), 2 * count)
+        print(f'\n{count} article creates: single requests {single * 1000:.1f}ms, one batch {batch * 1000:.1f}ms')
+
+
+@override_settings(ARTICLE_LIST_CACHE_TIMEOUT=0)
+class ArticleSparseFieldsTests(TestCase):
+    """Test trimming article responses and queries with fields and exclude."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email='sparse@example.com',
+            password='testpass123',
+            name='Sparse Reader'
+        )
+        self.client.force_authenticate(self.user)
+        for i in range(3):
+            create_article(user=self.user, title=f'Article {i}', abstract='Long abstract. ' * 100)
+
+    def test_list_fields(self):
+        """Test the list renders and selects only the requested fields."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(ARTICLES_URL, {'fields': 'id,title,publication_date'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        for article in response.data['results']:
+            self.assertEqual(set(article), {'id', 'title', 'publication_date'})
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('"abstract"', queries[0]['sql'])
+        self.assertNotIn('core_user', queries[0]['sql'])
+
+    def test_list_exclude(self):
+        """Test excluded fields are neither rendered nor selected."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(ARTICLES_URL, {'exclude': 'abstract'})
+
+        article = response.data['results'][0]
+        self.assertNotIn('abstract', article)
+        self.assertEqual(article['created_by'], self.user.name)
+        self.assertIn('authors', article)
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('"abstract"', queries[0]['sql'])
+
+    def test_sparse_pages_walk(self):
+        """Test the pagination cursor works without the ordering fields rendered."""
+        response = self.client.get(ARTICLES_URL, {'fields': 'title', 'page_size': 2})
+        titles = [article['title'] for article in response.data['results']]
+        response = self.client.get(response.data['next'])
+        titles += [article['title'] for article in response.data['results']]
+
+        self.assertEqual(sorted(titles), ['Article 0', 'Article 1', 'Article 2'])
+
+    def test_retrieve_fields(self):
+        """Test retrieving an article honours fields and varies its ETag."""
+        article = Article.objects.first()
+
+        response = self.client.get(detail_url(article.id), {'fields': 'title,created_by'})
+        full = self.client.get(detail_url(article.id))
+
+        self.assertEqual(response.data, {'title': article.title, 'created_by': self.user.name})
+        self.assertNotEqual(response['ETag'], full['ETag'])
+
+    def test_retrieve_etag_follows_options(self):
+        """Test every option that changes the representation changes the ETag."""
+        url = detail_url(Article.objects.first().id)
+
+        etags = [
+            self.client.get(url, params)['ETag']
+            for params in [{}, {'fields': ''}, {'keyword': 'abstract'}, {'keyword': 'abstract', 'highlight': 'true'}]
+        ]
+
+        self.assertEqual(len(set(etags)), 4)
+
+    def test_writes_ignore_fields(self):
+        """Test a write saves and returns whole articles whatever the fields param."""
+        article = Article.objects.first()
+
+        response = self.client.patch(f'{detail_url(article.id)}?fields=id', {'title': 'Renamed'}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['title'], 'Renamed')
+        article.refresh_from_db()
+        self.assertEqual(article.title, 'Renamed')
+
+    def test_unknown_field(self):
+        """Test asking for an unknown field returns 400."""
+        response = self.client.get(ARTICLES_URL, {'fields': 'title,secret'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('fields', response.data)
+
+
+def serializer_list(self, request):
+    """Build the article list with ArticleSerializer, as ModelViewSet does."""
+    return viewsets.ModelViewSet.list(self, request)
+
+
+@override_settings(ARTICLE_LIST_CACHE_TIMEOUT=0)
+class ArticleRowSerializerTests(TestCase):
+    """Test the list rendered from rows matches ArticleSerializer byte for byte."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email='rows@example.com',
+            password='testpass123',
+            name='Row Reader'
+        )
+        self.client.force_authenticate(self.user)
+        for i in range(6):
+            create_article(
+                user=self.user,
+                title=f'Protein folding {i}',
+                abstract=f'Protein folding and docking, part {i}.',
+                publication_date=date(2024, 1, 1) + timedelta(days=i),
+            )
+        Article.objects.create(
+            title='Orphan protein folding',
+            abstract='Nobody created this docking study.',
+            publication_date=date(2024, 2, 1),
+        )
+        for i, article in enumerate(Article.objects.all()):
+            article.authors.add(*[Author.objects.get_or_create(name=f'Author {j}')[0] for j in range(i % 3 + 1)])
+            article.tags.add(*[Tag.objects.get_or_create(name=f'Tag {j}')[0] for j in range(i % 2)])
+
+    def _assert_same_bytes(self, url, params=None):
+        response = self.client.get(url, params)
+        with patch.object(ArticleViewSet, '_list_rows', serializer_list):
+            expected = self.client.get(url, params)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, expected.content)
+        return response
+
+    def test_same_bytes_as_serializer(self):
+        """Test every page and parameter renders the same bytes on both paths."""
+        for params in (
+            {},
+            {'page_size': 3},
+            {'fields': 'title,created_by,publication_date'},
+            {'exclude': 'abstract,tags'},
+            {'keyword': 'folding', 'highlight': 'true'},
+            {'tags': 'Tag 0'},
+        ):
+            response = self._assert_same_bytes(ARTICLES_URL, params)
+            while response.data['next']:
+                response = self._assert_same_bytes(response.data['next'])
+
+    def test_missing_creator(self):
+        """Test an article without a creator omits created_by on both paths."""
+        response = self._assert_same_bytes(ARTICLES_URL, {'keyword': 'orphan'})
+
+        self.assertNotIn('created_by', response.data['results'][0])
+
+    @benchmark
+    def test_serialization_cost_benchmark(self):
+        """Benchmark per-article serialization on the serializer and row paths."""
+        for i in range(200):
+            create_article(user=self.user, title=f'Benchmark {i}', abstract='Abstract. ' * 50)
+        instances = list(Article.objects.select_related('createdBy').order_by('id'))
+        rows = list(Article.objects.order_by('id').values(*ArticleRowSerializer.get_columns()))
+        renderer = JSONRenderer()
+
+        def timed(serialize, repeat=5):
+            started = time.perf_counter()
+            for _ in range(repeat):
+                data = serialize()
+            return (time.perf_counter() - started) / repeat / len(instances), data
+
+        model_cost, model_data = timed(lambda: ArticleSerializer(instances, many=True).data)
+        row_cost, row_data = timed(lambda: ArticleRowSerializer(rows).data)
+
+        print(
+            f'\nPer-article serialization of {len(instances)} articles: '
+            f'ArticleSerializer {model_cost * 1e6:.1f}us, ArticleRowSerializer {row_cost * 1e6:.1f}us'
+        )
+        self.assertEqual(renderer.render(row_data), renderer.render(model_data))
+
+
+class NameAutocompleteTests(TestCase):
+    """Test the author and tag autocomplete."""
+
+    def setUp(self):
+        autocomplete_cache.clear()
+        self.addCleanup(autocomplete_cache.clear)
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email='autocomplete@example.com',
+            password='testpass123',
+            name='Editor'
+        )
+        self.client.force_authenticate(self.user)
+
+    def _link(self, names, articles, relation='authors'):
+        model = Author if relation == 'authors' else Tag
+        ids = model.objects.resolve(names)
+        for i in range(articles):
+            article = create_article(user=self.user, title=f'{names[0]} {i}')
+            getattr(article, relation).set(ids.values())
+
+    def test_prefix_matches_ranked_by_article_count(self):
+        """Test names starting with the query come first, most used first."""
+        self._link(['Ada Lovelace'], 1)
+        self._link(['Adam Smith'], 3)
+        self._link(['Grace Hopper'], 2)
+
+        response = self.client.get(AUTHORS_URL, {'q': 'ad'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [
+            {'name': 'Adam Smith', 'article_count': 3},
+            {'name': 'Ada Lovelace', 'article_count': 1},
+        ])
+
+    def test_fuzzy_match(self):
+        """Test misspelt and later words of a name still match."""
+        self._link(['Ada Lovelace'], 1)
+        Author.objects.create(name='Alan Turing')
+
+        for query in ('lovelace', 'Lovelase'):
+            response = self.client.get(AUTHORS_URL, {'q': query})
+            self.assertEqual([match['name'] for match in response.data], ['Ada Lovelace'], query)
+
+    def test_tags(self):
+        """Test tags are suggested from their own endpoint."""
+        self._link(['Machine Learning'], 2, relation='tags')
+        Author.objects.create(name='Machine Author')
+
+        response = self.client.get(TAGS_URL, {'q': 'machine'})
+
+        self.assertEqual(response.data, [{'name': 'Machine Learning', 'article_count': 2}])
+
+    def test_limit(self):
+        """Test at most `limit` names are returned."""
+        for i in range(5):
+            Author.objects.create(name=f'Author {i}')
+
+        response = self.client.get(AUTHORS_URL, {'q': 'author', 'limit': 2})
+
+        self.assertEqual(len(response.data), 2)
+
+    def test_invalid_params(self):
+        """Test a missing query or an out of range limit is rejected."""
+        for params in ({}, {'q': ' '}, {'q': 'a' * 101}, {'q': 'ada', 'limit': 0}, {'q': 'ada', 'limit': 'ten'}):
+            response = self.client.get(AUTHORS_URL, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, params)
+
+    def test_requires_authentication(self):
+        """Test anonymous requests are rejected."""
+        response = APIClient().get(AUTHORS_URL, {'q': 'ada'})
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_hot_queries_cached(self):
+        """Test repeated queries are answered without a query until a name changes."""
+        author = Author.objects.create(name='Ada Lovelace')
+
+        with self.assertNumQueries(1):
+            self.client.get(AUTHORS_URL, {'q': 'Ada'})
+        with self.assertNumQueries(0):
+            response = self.client.get(AUTHORS_URL, {'q': 'ada '})
+        self.assertEqual(response.data, [{'name': 'Ada Lovelace', 'article_count': 0}])
+
+        author.name = 'Ada King'
+        author.save()
+        response = self.client.get(AUTHORS_URL, {'q': 'ada'})
+
+        self.assertEqual(response.data, [{'name': 'Ada King', 'article_count': 0}])
+
+    @benchmark
+    def test_autocomplete_benchmark(self):
+        """Benchmark fresh autocomplete queries against cached ones."""
+        Author.objects.bulk_create([Author(name=f'Author {i:03d}') for i in range(500)])
+        prefixes = [f'Author {i:02d}' for i in range(10)]
+
+        started = time.perf_counter()
+        for prefix in prefixes:
+            self.client.get(AUTHORS_URL, {'q': prefix})
+        fresh = (time.perf_counter() - started) / len(prefixes)
+
+        started = time.perf_counter()
+        for prefix in prefixes:
+            self.client.get(AUTHORS_URL, {'q': prefix})
+        cached = (time.perf_counter() - started) / len(prefixes)
 
+        print(f'\nAutocomplete latency: fresh {fresh * 1000:.2f}ms, cached {cached * 1000:.2f}ms')
@@ -7,6 +7,9 @@ from article import views  # Make sure to import your views from the article app
 
 router = DefaultRouter()
 router.register('articles', views.ArticleViewSet)  # Register ArticleViewSet with the router
+router.register(r'articles/(?P<article_pk>[^/.]+)/comments', views.CommentViewSet, basename='article-comment')
+router.register('authors', views.AuthorAutocompleteViewSet, basename='author')
+router.register('tags', views.TagAutocompleteViewSet, basename='tag')
 
 app_name = 'article'
 
@@ -1,76 +1,661 @@
 """
 Views for the article APIs.
 """
+import csv
+import datetime
+import hashlib
+
 from drf_spectacular.utils import (
     extend_schema_view,
     extend_schema,
     OpenApiParameter,
     OpenApiTypes,
 )
-from rest_framework import viewsets, mixins
-from rest_framework.authentication import TokenAuthentication
-from rest_framework.permissions import IsAuthenticated
+from django.conf import settings
+from django.contrib.postgres.search import (
+    SearchHeadline,
+    SearchQuery,
+    SearchRank,
+)
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
+from django.http import Http404, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
+from django.utils.dateparse import parse_date
+from django.utils.http import http_date, quote_etag
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import SAFE_METHODS, IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
 from rest_framework.exceptions import ValidationError, PermissionDenied
 from django.contrib.auth import get_user_model
 
-from core.models import Article, Author, Tag
+from core.models import Article, Author, Comment, Tag
 from article import serializers
+from article.autocomplete import autocomplete
+from article.batch import write_articles
+from article.cache import get_stats, list_cache, normalize_params
+from article.facets import get_facets, get_global_facets
+from article.pagination import ArticlePagination, CommentPagination
+from user.authentication import CachedTokenAuthentication
 
 User = get_user_model()
 
+# Text search configuration used by the search_vector trigger.
+SEARCH_CONFIG = 'english'
+
+# Rows fetched per round trip from the server-side cursor of an export.
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_FIELDS = ['id', 'title', 'abstract', 'publication_date', 'authors', 'tags']
+# Separator between names in CSV exports, as read by import_articles.
+EXPORT_NAME_SEPARATOR = ';'
+
+# Columns each article field renders from, so sparse fieldsets load only those.
+ARTICLE_FIELD_COLUMNS = {
+    'id': ['id'],
+    'title': ['title'],
+    'abstract': ['abstract'],
+    'publication_date': ['publication_date'],
+    'authors': ['author_names'],
+    'tags': ['tag_names'],
+    'created_by': ['createdBy', 'createdBy__name'],
+    'comment_count': ['comment_count'],
+}
+# Columns the pagination cursor reads from every row.
+CURSOR_COLUMNS = ['id', 'publication_date']
+
+FIELDSET_PARAMETERS = [
+    OpenApiParameter(
+        'fields',
+        OpenApiTypes.STR,
+        description='Comma separated list of article fields to return, e.g. id,title,publication_date',
+    ),
+    OpenApiParameter('exclude', OpenApiTypes.STR, description='Comma separated list of article fields to leave out'),
+]
+
+FILTER_PARAMETERS = [
+    OpenApiParameter('year', OpenApiTypes.INT, description='Year to filter'),
+    OpenApiParameter('month', OpenApiTypes.INT, description='Month to filter'),
+    OpenApiParameter(
+        'published_after',
+        OpenApiTypes.DATE,
+        description='Only articles published on or after this date (YYYY-MM-DD)',
+    ),
+    OpenApiParameter(
+        'published_before',
+        OpenApiTypes.DATE,
+        description='Only articles published before this date (YYYY-MM-DD)',
+    ),
+    OpenApiParameter('authors', OpenApiTypes.STR, description='Comma separated list of author names to filter'),
+    OpenApiParameter('tags', OpenApiTypes.STR, description='Comma separated list of tag names to filter'),
+    OpenApiParameter(
+        'authors_mode',
+        OpenApiTypes.STR,
+        enum=['any', 'all'],
+        description='Match articles by any (default) or all of the authors',
+    ),
+    OpenApiParameter(
+        'tags_mode',
+        OpenApiTypes.STR,
+        enum=['any', 'all'],
+        description='Match articles with any (default) or all of the tags',
+    ),
+    OpenApiParameter(
+        'keyword',
+        OpenApiTypes.STR,
+        description='Keywords to search in title and abstract, ranked by relevance. '
+                    'Supports "quoted phrases", OR and -exclusions',
+    ),
+    OpenApiParameter('phrase', OpenApiTypes.STR, description='Exact phrase to search in title and abstract'),
+]
+
+
+class Echo:
+    """File-like object that returns what is written, for streaming CSV."""
+
+    def write(self, value):
+        return value
+
+
 @extend_schema_view(
     list=extend_schema(
-        parameters=[
-            OpenApiParameter('year', OpenApiTypes.INT, description='Year to filter'),
-            OpenApiParameter('month', OpenApiTypes.INT, description='Month to filter'),
-            OpenApiParameter('authors', OpenApiTypes.STR, description='Comma separated list of author IDs to filter'),
-            OpenApiParameter('tags', OpenApiTypes.STR, description='Comma separated list of tag names to filter'),
-            # OpenApiParameter('keyword', OpenApiTypes.STR, description='Keyword to search in title and abstract'),
-            # Add other parameters as needed
+        parameters=FILTER_PARAMETERS + FIELDSET_PARAMETERS + [
+            OpenApiParameter(
+                'highlight',
+                OpenApiTypes.BOOL,
+                description='Include an abstract snippet with search matches in <mark> tags',
+            ),
         ]
-    )
+    ),
+    retrieve=extend_schema(parameters=FIELDSET_PARAMETERS),
+    export=extend_schema(
+        parameters=FILTER_PARAMETERS + [
+            OpenApiParameter(
+                'export_format',
+                OpenApiTypes.STR,
+                enum=['ndjson', 'csv'],
+                description='Export as newline delimited JSON (default) or CSV',
+            ),
+        ],
+        responses=OpenApiTypes.STR,
+    ),
+    batch=extend_schema(
+        request=serializers.BatchOperationSerializer(many=True),
+        responses=serializers.BatchResultSerializer(many=True),
+    ),
+    facets=extend_schema(
+        parameters=FILTER_PARAMETERS + [
+            OpenApiParameter(
+                'facet_size',
+                OpenApiTypes.INT,
+                description='Number of most common tags and authors to count',
+            ),
+        ],
+        responses=serializers.FacetsSerializer,
+    ),
 )
 class ArticleViewSet(viewsets.ModelViewSet):
     """View for managing article APIs."""
     serializer_class = serializers.ArticleDetailSerializer
     queryset = Article.objects.all()
-    authentication_classes = (TokenAuthentication,)
+    authentication_classes = (CachedTokenAuthentication,)
     permission_classes = (IsAuthenticated,)
+    pagination_class = ArticlePagination
 
     def _params_to_ints(self, qs):
         """Convert a list of strings to integers."""
         return [int(str_id) for str_id in qs.split(',')]
 
+    def _params_to_bool(self, value):
+        """Convert a query string flag to a boolean."""
+        return value is not None and value.lower() in ('1', 'true', 'yes')
+
+    def _search_query(self):
+        """Return the full-text query for the keyword/phrase params, if any."""
+        keyword = self.request.query_params.get('keyword')
+        phrase = self.request.query_params.get('phrase')
+        query = None
+        if keyword:
+            query = SearchQuery(keyword, config=SEARCH_CONFIG, search_type='websearch')
+        if phrase:
+            phrase_query = SearchQuery(phrase, config=SEARCH_CONFIG, search_type='phrase')
+            query = phrase_query if query is None else query & phrase_query
+        return query
+
+    def get_pagination_ordering(self):
+        """Order search results by relevance, everything else newest first."""
+        if self._search_query() is not None:
+            return ['-rank', 'id']
+        return ['-publication_date', 'id']
+
+    def _param_to_int(self, name, minimum, maximum):
+        """Return an integer query param within bounds, or None if missing."""
+        value = self.request.query_params.get(name)
+        if not value:
+            return None
+        try:
+            number = int(value)
+        except ValueError:
+            number = None
+        if number is None or not minimum <= number <= maximum:
+            raise ValidationError({name: f'Must be an integer between {minimum} and {maximum}.'})
+        return number
+
+    def _param_to_date(self, name):
+        """Return a YYYY-MM-DD query param as a date, or None if missing."""
+        value = self.request.query_params.get(name)
+        if not value:
+            return None
+        try:
+            parsed = parse_date(value)
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            raise ValidationError({name: 'Must be a date in YYYY-MM-DD format.'})
+        return parsed
+
+    def _filter_dates(self, queryset):
+        """
+        Filter `queryset` by publication date as half-open ranges.
+
+        Unlike `__year`/`__month` lookups, which wrap the column in EXTRACT(),
+        plain range comparisons can use the publication_date index.
+        """
+        year = self._param_to_int('year', datetime.MINYEAR, datetime.MAXYEAR - 1)
+        month = self._param_to_int('month', 1, 12)
+        published_after = self._param_to_date('published_after')
+        published_before = self._param_to_date('published_before')
+
+        # Filter by year, and month within it, if provided
+        if year and month:
+            start = datetime.date(year, month, 1)
+            end = datetime.date(year + month // 12, month % 12 + 1, 1)
+            queryset = queryset.filter(publication_date__gte=start, publication_date__lt=end)
+        elif year:
+            queryset = queryset.filter(
+                publication_date__gte=datetime.date(year, 1, 1),
+                publication_date__lt=datetime.date(year + 1, 1, 1),
+            )
+        elif month:
+            # The same month of every year is not a single range.
+            queryset = queryset.filter(publication_date__month=month)
+
+        if published_after:
+            queryset = queryset.filter(publication_date__gte=published_after)
+        if published_before:
+            queryset = queryset.filter(publication_date__lt=published_before)
+
+        return queryset
+
+    def _filter_names(self, queryset, relation, field):
+        """
+        Filter `queryset` by the comma separated names of a relation.
+
+        Matches against the GIN-indexed name arrays of the articles, so no
+        link table is joined: `any` mode is an overlap and `all` mode a
+        containment test.
+        """
+        names = self.request.query_params.get(relation)
+        mode = self.request.query_params.get(f'{relation}_mode') or 'any'
+        if mode not in ('any', 'all'):
+            raise ValidationError({f'{relation}_mode': 'Must be one of: any, all.'})
+        if not names:
+            return queryset
+
+        names = sorted({name.strip() for name in names.split(',') if name.strip()})
+        if not names:
+            return queryset
+        lookup = 'overlap' if mode == 'any' else 'contains'
+        return queryset.filter(**{f'{field}_names__{lookup}': names})
+
+    def _apply_filters(self, queryset):
+        """Filter and order `queryset` by the query params of the request."""
+        queryset = self._filter_dates(queryset)
+        queryset = self._filter_names(queryset, 'authors', 'author')
+        queryset = self._filter_names(queryset, 'tags', 'tag')
+
+        # Search title and abstract through the GIN-indexed search vector
+        query = self._search_query()
+        if query is not None:
+            # ts_rank returns a real; widen it so the pagination cursor
+            # round-trips the exact value.
+            queryset = queryset.filter(search_vector=query).annotate(
+                rank=Cast(SearchRank(F('search_vector'), query), FloatField()),
+            )
+
+        return queryset.order_by(*self.get_pagination_ordering())
+
+    def _params_to_fields(self, name):
+        """Return the article fields listed in a query param, or None if missing."""
+        value = self.request.query_params.get(name)
+        if value is None:
+            return None
+        fields = [field.strip() for field in value.split(',') if field.strip()]
+        unknown = [field for field in fields if field not in ARTICLE_FIELD_COLUMNS]
+        if unknown:
+            raise ValidationError({
+                name: f'Unknown fields: {", ".join(unknown)}. '
+                      f'Choose from: {", ".join(ARTICLE_FIELD_COLUMNS)}.'
+            })
+        return fields
+
+    def get_sparse_fields(self):
+        """
+        Return the article fields selected by `fields` and `exclude`.
+
+        Returns None when every field is rendered. Only reads are trimmed,
+        since writes save and return whole articles.
+        """
+        if self.action not in ('list', 'retrieve') or self.request.method not in SAFE_METHODS:
+            return None
+        fields = self._params_to_fields('fields')
+        exclude = self._params_to_fields('exclude')
+        if fields is None and exclude is None:
+            return None
+        fields = fields if fields is not None else list(ARTICLE_FIELD_COLUMNS)
+        return [field for field in fields if field not in (exclude or [])]
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.get_sparse_fields()
+        if fields is not None:
+            kwargs.setdefault('fields', fields)
+        return super().get_serializer(*args, **kwargs)
+
     def get_queryset(self):
         queryset = super().get_queryset()
-        year = self.request.query_params.get('year')
-        month = self.request.query_params.get('month')
-        author_names = self.request.query_params.get('authors')
-        tag_names = self.request.query_params.get('tags')
+        fields = self.get_sparse_fields()
+        if fields is None:
+            # Load the creator with a join. Authors and tags render from the
+            # articles' name arrays, so the whole page is a single query.
+            queryset = queryset.select_related('createdBy')
+        else:
+            # Load only the requested columns, and join the creator only
+            # when its name is rendered.
+            columns = CURSOR_COLUMNS + [column for field in fields for column in ARTICLE_FIELD_COLUMNS[field]]
+            if 'created_by' in fields:
+                queryset = queryset.select_related('createdBy')
+            queryset = queryset.only(*dict.fromkeys(columns))
+        if self.action in ('update', 'partial_update'):
+            queryset = queryset.select_for_update(of=('self',))
+        queryset = self._apply_filters(queryset)
 
-        # Filter by year if provided
-        if year:
-            queryset = queryset.filter(publication_date__year=year)
+        query = self._search_query()
+        if query is not None and self._params_to_bool(self.request.query_params.get('highlight')):
+            queryset = queryset.annotate(
+                headline=SearchHeadline(
+                    'abstract',
+                    query,
+                    config=SEARCH_CONFIG,
+                    start_sel='<mark>',
+                    stop_sel='</mark>',
+                ),
+            )
 
-        # Filter by month if provided
-        if month:
-            queryset = queryset.filter(publication_date__month=month)
+        return queryset
+
+    def _with_validators(self, response, etag, last_modified):
+        if etag:
+            response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        # The browsable API renders the current user, so never validate it.
+        if request.accepted_renderer.format == 'api':
+            return super().list(request, *args, **kwargs)
+
+        etag, last_modified = list_cache.get_validators(request)
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = list_cache.fetch(request, lambda: self._render_list(request, *args, **kwargs))
+        return self._with_validators(response, etag, last_modified)
+
+    def _render_list(self, request, *args, **kwargs):
+        """Build and render the list response so its bytes can be cached."""
+        response = self._list_rows(request)
+        response.accepted_renderer = request.accepted_renderer
+        response.accepted_media_type = request.accepted_media_type
+        response.renderer_context = self.get_renderer_context()
+        return response.render()
+
+    def _list_rows(self, request):
+        """
+        Build the list response from `.values()` rows.
 
-        # Filter by authors if provided
-        if author_names:
-            author_names = author_names.split(',')
-            queryset = queryset.filter(authors__name__in=author_names)
+        Renders the same data as `ArticleSerializer` without building a
+        model instance and running the serializer fields per article.
+        """
+        fields = self.get_sparse_fields()
+        queryset = self.filter_queryset(self.get_queryset())
+        # Annotations (rank, headline) are read by the cursor and rendered.
+        columns = serializers.ArticleRowSerializer.get_columns(fields) + CURSOR_COLUMNS
+        rows = queryset.values(*dict.fromkeys(columns + list(queryset.query.annotations)))
+        page = self.paginate_queryset(rows)
+        return self.get_paginated_response(serializers.ArticleRowSerializer(page, fields).data)
 
-        # Filter by tags if provided
-        if tag_names:
-            tag_names = tag_names.split(',')
-            queryset = queryset.filter(tags__name__in=tag_names)
+    def retrieve(self, request, *args, **kwargs):
+        if request.accepted_renderer.format == 'api':
+            return super().retrieve(request, *args, **kwargs)
 
-        return queryset.distinct().order_by('-publication_date')
+        # Check the validators with a single-column query before loading
+        # and serializing the article.
+        pk = kwargs[self.lookup_url_kwarg or self.lookup_field]
+        try:
+            updated_at = Article.objects.filter(pk=pk).values_list('updated_at', flat=True).first()
+        except DjangoValidationError:
+            updated_at = None
+        if updated_at is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        # Fieldsets, search highlights and filters all change the
+        # representation, so every query param is part of the ETag.
+        params = normalize_params(request.query_params)
+        etag = quote_etag(hashlib.md5(
+            f'{pk}|{updated_at.isoformat()}|{request.accepted_media_type}|{params}'.encode('utf-8')
+        ).hexdigest())
+        last_modified = int(updated_at.timestamp())
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = super().retrieve(request, *args, **kwargs)
+        return self._with_validators(response, etag, last_modified)
 
     def update(self, request, *args, **kwargs):
-        article = self.get_object()
-        if article.createdBy != request.user:
-            raise PermissionDenied("You do not have permission to edit this article.")
+        partial = kwargs.pop('partial', False)
+        with transaction.atomic():
+            # Load and lock the article once, for the permission check and
+            # the update, so concurrent edits of its links serialize.
+            article = self.get_object()
+            if article.createdBy_id != request.user.id:
+                raise PermissionDenied("You do not have permission to edit this article.")
+
+            serializer = self.get_serializer(article, data=request.data, partial=partial)
+            serializer.is_valid(raise_exception=True)
+            self.perform_update(serializer)
+        return Response(serializer.data)
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """Stream every article matching the filters as NDJSON or CSV."""
+        export_format = request.query_params.get('export_format', 'ndjson')
+        if export_format not in ('ndjson', 'csv'):
+            raise ValidationError({'export_format': 'Must be one of: ndjson, csv.'})
+
+        rows = self._apply_filters(Article.objects.all()).values_list(
+            'id', 'title', 'abstract', 'publication_date', 'author_names', 'tag_names',
+        ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+        if export_format == 'csv':
+            content, content_type = self._export_csv(rows), 'text/csv'
+        else:
+            content, content_type = self._export_ndjson(rows), 'application/x-ndjson'
+
+        response = StreamingHttpResponse(content, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="articles.{export_format}"'
+        return response
+
+    @action(detail=False, methods=['post'])
+    def batch(self, request):
+        """Create, update and delete many articles in one transaction."""
+        if isinstance(request.data, list) and len(request.data) > settings.ARTICLE_MAX_BATCH_SIZE:
+            raise ValidationError(f'A batch holds at most {settings.ARTICLE_MAX_BATCH_SIZE} operations.')
+        operations = serializers.BatchOperationSerializer(data=request.data, many=True)
+        operations.is_valid(raise_exception=True)
+        operations = operations.validated_data
+
+        with transaction.atomic():
+            articles = Article.objects.select_for_update().in_bulk(
+                [operation['id'] for operation in operations if 'id' in operation]
+            )
+            errors = self._check_batch(operations, articles)
+            creates = self._validate_batch(operations, 'create', errors)
+            updates = self._validate_batch(operations, 'update', errors, partial=True)
+            if any(errors):
+                raise ValidationError(errors)
+
+            created = iter(write_articles(
+                request.user,
+                creates=list(creates.values()),
+                updates=[(articles[operations[index]['id']], data) for index, data in updates.items()],
+                deletes=[articles[operation['id']] for operation in operations if operation['op'] == 'delete'],
+            ))
+
+        results = []
+        for operation in operations:
+            if operation['op'] == 'create':
+                results.append({'op': 'create', 'id': next(created).pk, 'status': status.HTTP_201_CREATED})
+            elif operation['op'] == 'update':
+                results.append({'op': 'update', 'id': operation['id'], 'status': status.HTTP_200_OK})
+            else:
+                results.append({'op': 'delete', 'id': operation['id'], 'status': status.HTTP_204_NO_CONTENT})
+
+        # Load the written articles to render with a single query.
+        written = Article.objects.select_related('createdBy').in_bulk(
+            [result['id'] for result in results if result['op'] != 'delete']
+        )
+        for result in results:
+            if result['op'] != 'delete':
+                result['article'] = written[result['id']]
+        return Response(serializers.BatchResultSerializer(results, many=True).data)
+
+    def _check_batch(self, operations, articles):
+        """Return per-operation errors for missing or repeated articles."""
+        errors = [{} for _ in operations]
+        seen = set()
+        for operation, error in zip(operations, errors):
+            if 'id' not in operation:
+                continue
+            article = articles.get(operation['id'])
+            if article is None:
+                error['id'] = ['Not found.']
+            elif operation['id'] in seen:
+                error['id'] = ['An article may only appear once per batch.']
+            elif article.createdBy_id != self.request.user.id:
+                raise PermissionDenied(f"You do not have permission to edit article {article.pk}.")
+            seen.add(operation['id'])
+        return errors
+
+    def _validate_batch(self, operations, op, errors, partial=False):
+        """Validate the article data of every `op` operation in one pass."""
+        indexes = [index for index, operation in enumerate(operations) if operation['op'] == op]
+        serializer = self.get_serializer(
+            data=[operations[index]['data'] for index in indexes],
+            many=True,
+            partial=partial,
+        )
+        if serializer.is_valid():
+            return dict(zip(indexes, serializer.validated_data))
+        for index, error in zip(indexes, serializer.errors):
+            if error:
+                errors[index]['data'] = error
+        return {}
+
+    @action(detail=False, methods=['get'])
+    def facets(self, request):
+        """Count the articles matching the filters per tag, author and year."""
+        size = self._param_to_int('facet_size', 1, settings.ARTICLE_MAX_FACET_SIZE)
+        if not any(request.query_params.get(param.name) for param in FILTER_PARAMETERS):
+            return Response(get_global_facets(size))
+
+        article_ids = self._apply_filters(Article.objects.all()).order_by().values('pk')
+        return Response(get_facets(article_ids, size))
+
+    @action(detail=False, methods=['get'], url_path='cache-stats', permission_classes=[IsAdminUser])
+    def cache_stats(self, request):
+        """Report list cache hits and misses, for tuning its timeout."""
+        return Response(get_stats())
+
+    def _export_ndjson(self, rows):
+        encoder = DjangoJSONEncoder(ensure_ascii=False, separators=(',', ':'))
+        for row in rows:
+            yield encoder.encode(dict(zip(EXPORT_FIELDS, row))) + '\n'
+
+    def _export_csv(self, rows):
+        writer = csv.writer(Echo())
+        yield writer.writerow(EXPORT_FIELDS)
+        for pk, title, abstract, publication_date, authors, tags in rows:
+            yield writer.writerow([
+                pk,
+                title,
+                abstract,
+                publication_date,
+                EXPORT_NAME_SEPARATOR.join(authors),
+                EXPORT_NAME_SEPARATOR.join(tags),
+            ])
+
+
+class CommentViewSet(mixins.ListModelMixin,
+                     mixins.CreateModelMixin,
+                     mixins.DestroyModelMixin,
+                     viewsets.GenericViewSet):
+    """View for listing, adding and deleting the comments of an article."""
+    serializer_class = serializers.CommentSerializer
+    queryset = Comment.objects.all()
+    authentication_classes = (CachedTokenAuthentication,)
+    permission_classes = (IsAuthenticated,)
+    pagination_class = CommentPagination
+
+    def get_article_id(self):
+        """Return the id of the article in the URL, or raise 404."""
+        if not hasattr(self, '_article_id'):
+            try:
+                article = get_object_or_404(Article.objects.only('pk'), pk=self.kwargs['article_pk'])
+            except DjangoValidationError:
+                raise Http404
+            self._article_id = article.pk
+        return self._article_id
+
+    def get_queryset(self):
+        return super().get_queryset().filter(
+            article_id=self.get_article_id(),
+        ).select_related('commentedBy')
+
+    def perform_create(self, serializer):
+        # Insert the comment and count it on the article together.
+        with transaction.atomic():
+            serializer.save(article_id=self.get_article_id(), commentedBy=self.request.user)
+
+    def perform_destroy(self, instance):
+        if instance.commentedBy_id != self.request.user.id:
+            raise PermissionDenied("You do not have permission to delete this comment.")
+        with transaction.atomic():
+            instance.delete()
+
+
+@extend_schema_view(
+    list=extend_schema(
+        parameters=[
+            OpenApiParameter(
+                'q',
+                OpenApiTypes.STR,
+                required=True,
+                description='Start of, or words similar to, the name',
+            ),
+            OpenApiParameter('limit', OpenApiTypes.INT, description='Number of names to return'),
+        ],
+        responses=serializers.NameMatchSerializer(many=True),
+    ),
+)
+class NameAutocompleteViewSet(viewsets.GenericViewSet):
+    """Base view suggesting author or tag names as they are typed."""
+    serializer_class = serializers.NameMatchSerializer
+    authentication_classes = (CachedTokenAuthentication,)
+    permission_classes = (IsAuthenticated,)
+    pagination_class = None
+    # Longer queries cannot match a name, and only slow the trigram search.
+    max_query_length = 100
+
+    def list(self, request, *args, **kwargs):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            raise ValidationError({'q': 'This query parameter is required.'})
+        if len(query) > self.max_query_length:
+            raise ValidationError({'q': f'Must be at most {self.max_query_length} characters.'})
+
+        limit = request.query_params.get('limit')
+        if limit is None:
+            limit = settings.AUTOCOMPLETE_SIZE
+        else:
+            try:
+                limit = int(limit)
+            except ValueError:
+                limit = None
+            if limit is None or not 1 <= limit <= settings.AUTOCOMPLETE_MAX_SIZE:
+                raise ValidationError({'limit': f'Must be an integer between 1 and {settings.AUTOCOMPLETE_MAX_SIZE}.'})
+
+        matches = autocomplete(self.queryset.model, query, limit)
+        return Response(self.get_serializer(matches, many=True).data)
+
+
+class AuthorAutocompleteViewSet(NameAutocompleteViewSet):
+    """View suggesting author names."""
+    queryset = Author.objects.all()
+
 
-        return super().update(request, *args, **kwargs)
\ No newline at end of file
+class TagAutocompleteViewSet(NameAutocompleteViewSet):
+    """View suggesting tag names."""
+    queryset = Tag.objects.all()
@@ -3,6 +3,7 @@ Django admin customization.
 """
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.db.models import Q
 from core import models
 from django.utils.translation import gettext_lazy as _
 
@@ -43,8 +44,30 @@ class UserAdmin(BaseUserAdmin):
     )
 
 
+class ArticleAdmin(admin.ModelAdmin):
+    """Define the admin pages for articles."""
+    list_display = ['title', 'publication_date']
+    # Kept in sync with the authors, tags and comments by signal handlers.
+    readonly_fields = ['author_names', 'tag_names', 'comment_count', 'updated_at']
+
+
+class NameAdmin(admin.ModelAdmin):
+    """Define the admin pages for authors and tags."""
+    ordering = ['name']
+    search_fields = ['name']
+
+    def get_search_results(self, request, queryset, search_term):
+        # Prefix and fuzzy matches, served by the trigram index on name.
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        return queryset.filter(
+            Q(name__iprefix=search_term) | Q(name__trigram_word_similar=search_term),
+        ), False
+
+
 # Models manageable by Django admin interface
 admin.site.register(models.User, UserAdmin)
-admin.site.register(models.Article)
-admin.site.register(models.Tag)
-admin.site.register(models.Author)
+admin.site.register(models.Article, ArticleAdmin)
+admin.site.register(models.Tag, NameAdmin)
+admin.site.register(models.Author, NameAdmin)
@@ -0,0 +1,81 @@
+"""
+Database connection probing and health checks of persistent connections.
+"""
+import time
+
+from psycopg2 import OperationalError as Psycopg2OpError
+
+from django.conf import settings
+from django.core.signals import request_finished, request_started
+from django.db import connections
+from django.db.utils import OperationalError
+from django.dispatch import receiver
+
+
+# Errors raised while the database is down or still starting.
+DATABASE_ERRORS = (Psycopg2OpError, OperationalError)
+
+
+def probe_database(alias='default'):
+    """
+    Return None if the `alias` database answers a query, else the error.
+
+    A connection that fails the probe is closed, so the next attempt opens
+    a fresh one instead of reusing it.
+    """
+    connection = connections[alias]
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+    except DATABASE_ERRORS as error:
+        try:
+            connection.close()
+        except DATABASE_ERRORS:
+            pass
+        return error
+    return None
+
+
+def database_errors(aliases):
+    """
+    Return `{alias: error}` for the databases in `aliases` that are unavailable.
+
+    The connectivity check shared by `wait_for_db` and the readiness probe.
+    """
+    errors = {}
+    for alias in aliases:
+        error = probe_database(alias)
+        if error is not None:
+            errors[alias] = error
+    return errors
+
+
+@receiver(request_started)
+def check_persistent_connections(**kwargs):
+    """
+    Close persistent connections that broke while idle, before reuse.
+
+    Runs after Django closes the connections past CONN_MAX_AGE. A connection
+    used within DB_CONN_HEALTH_CHECK_IDLE seconds is trusted, so busy
+    workers do not pay for a round trip on every request.
+    """
+    if not settings.DB_CONN_HEALTH_CHECKS:
+        return
+    now = time.monotonic()
+    for connection in connections.all():
+        if connection.connection is None or connection.in_atomic_block:
+            continue
+        last_used = getattr(connection, 'last_request_finished', None)
+        if last_used is not None and now - last_used < settings.DB_CONN_HEALTH_CHECK_IDLE:
+            continue
+        if not connection.is_usable():
+            connection.close()
+
+
+@receiver(request_finished)
+def note_connection_use(**kwargs):
+    """Note when each open connection last served a request."""
+    now = time.monotonic()
+    for connection in connections.all():
+        if connection.connection is not None:
+            connection.last_request_finished = now
@@ -0,0 +1,198 @@
+"""
+Per-request instrumentation: database, authentication, serialization and
+rendering time, reported as Server-Timing headers and Prometheus histograms.
+"""
+import contextvars
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import ExitStack, contextmanager
+
+from django.db import connections
+from django.http import HttpResponse
+
+
+# Phases timed with `timed()`, in Server-Timing order.
+PHASES = ('auth', 'serialize', 'render')
+SECONDS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+_current = contextvars.ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    """Measurements of a single request."""
+    __slots__ = ('queries', 'db', 'phases', 'total')
+
+    def __init__(self):
+        self.queries = 0
+        self.db = 0.0
+        self.phases = defaultdict(float)
+        self.total = 0.0
+
+    def record_query(self, execute, sql, params, many, context):
+        """Time a query, as a database connection execute wrapper."""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db += time.perf_counter() - started
+            self.queries += 1
+
+    def server_timing(self):
+        """Return the measurements as a Server-Timing header value."""
+        metrics = [f'db;dur={self.db * 1000:.2f};desc="{self.queries} queries"']
+        metrics += [
+            f'{phase};dur={self.phases[phase] * 1000:.2f}'
+            for phase in PHASES if phase in self.phases
+        ]
+        metrics.append(f'total;dur={self.total * 1000:.2f}')
+        return ', '.join(metrics)
+
+
+@contextmanager
+def timed(phase):
+    """Add the time spent in the block to `phase` of the current request."""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.phases[phase] += time.perf_counter() - started
+
+
+class Histogram:
+    """A Prometheus histogram with fixed bucket bounds."""
+    __slots__ = ('bounds', 'counts', 'sum')
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        # One count per bound plus +Inf, not cumulative until exported.
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    def samples(self):
+        """Yield `(le, cumulative count)` pairs, ending with +Inf."""
+        cumulative = 0
+        for bound, count in zip(list(self.bounds) + ['+Inf'], self.counts):
+            cumulative += count
+            yield bound, cumulative
+
+
+class MetricsRegistry:
+    """
+    Per-route request histograms of this process.
+
+    Each worker process keeps its own, so a scrape sees the process that
+    served it. Observing a request costs a lock and a few bisects.
+    """
+    # Exported metrics with their help text and bucket bounds.
+    METRICS = {
+        'http_request_duration_seconds': ('Total time to handle a request.', SECONDS_BUCKETS),
+        'http_request_db_seconds': ('Time spent in database queries per request.', SECONDS_BUCKETS),
+        'http_request_db_queries': ('Database queries per request.', QUERY_BUCKETS),
+        'http_request_phase_seconds': (
+            'Time spent authenticating, serializing and rendering per request.',
+            SECONDS_BUCKETS,
+        ),
+    }
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+
+    def _observe(self, name, labels, value):
+        key = (name, labels)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = Histogram(self.METRICS[name][1])
+        histogram.observe(value)
+
+    def observe(self, route, method, status, metrics):
+        """Record the measurements of a request to `route`."""
+        labels = (('route', route), ('method', method), ('status', f'{status // 100}xx'))
+        with self._lock:
+            self._observe('http_request_duration_seconds', labels, metrics.total)
+            self._observe('http_request_db_seconds', labels, metrics.db)
+            self._observe('http_request_db_queries', labels, metrics.queries)
+            for phase, seconds in metrics.phases.items():
+                self._observe('http_request_phase_seconds', labels + (('phase', phase),), seconds)
+
+    def clear(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def render(self):
+        """Return the histograms in the Prometheus text exposition format."""
+        with self._lock:
+            histograms = [
+                (name, labels, list(histogram.samples()), histogram.sum)
+                for (name, labels), histogram in sorted(self._histograms.items(), key=lambda item: item[0])
+            ]
+
+        lines = []
+        for metric, (description, _) in self.METRICS.items():
+            lines.append(f'# HELP {metric} {description}')
+            lines.append(f'# TYPE {metric} histogram')
+            for name, labels, samples, total in histograms:
+                if name != metric:
+                    continue
+                label_text = ','.join(f'{key}="{_escape(value)}"' for key, value in labels)
+                for bound, count in samples:
+                    lines.append(f'{name}_bucket{{{label_text},le="{bound}"}} {count}')
+                lines.append(f'{name}_sum{{{label_text}}} {total}')
+                lines.append(f'{name}_count{{{label_text}}} {samples[-1][1]}')
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+registry = MetricsRegistry()
+
+
+class InstrumentationMiddleware:
+    """
+    Measure every request and report it in a Server-Timing header.
+
+    Queries are counted and timed by an execute wrapper on each database
+    connection. Authentication, serialization and rendering report their
+    time through `timed()`. The body of a streaming response is produced
+    after this middleware returns, so it is not measured.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics.record_query))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        metrics.total = time.perf_counter() - started
+
+        response['Server-Timing'] = metrics.server_timing()
+        match = request.resolver_match
+        registry.observe(match.view_name if match else 'unmatched', request.method, response.status_code, metrics)
+        return response
+
+
+def metrics_view(request):
+    """Serve the request histograms for Prometheus to scrape."""
+    return HttpResponse(registry.render(), content_type=PROMETHEUS_CONTENT_TYPE)
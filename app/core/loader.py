@@ -0,0 +1,172 @@
+"""
+Bulk loading of articles with PostgreSQL COPY.
+"""
+import csv
+import io
+import uuid
+
+from django.db import connections, transaction
+from django.utils.dateparse import parse_date
+
+from core.models import Article, Author, Tag
+from core.signals import articles_bulk_loaded
+
+
+# Namespace for article ids derived from their content, so loading the same
+# record twice targets the same row.
+ARTICLE_NAMESPACE = uuid.UUID('6f0d4c9e-8d8a-4c1b-9a7e-2f6f3f0a5b11')
+
+STAGING_TABLES = """
+CREATE TEMP TABLE IF NOT EXISTS import_article (
+    id uuid,
+    title varchar(255),
+    abstract text,
+    publication_date date
+);
+CREATE TEMP TABLE IF NOT EXISTS import_author (name varchar(255));
+CREATE TEMP TABLE IF NOT EXISTS import_tag (name varchar(50));
+CREATE TEMP TABLE IF NOT EXISTS import_article_author (article_id uuid, position integer, name varchar(255));
+CREATE TEMP TABLE IF NOT EXISTS import_article_tag (article_id uuid, position integer, name varchar(50));
+TRUNCATE import_article, import_author, import_tag, import_article_author, import_article_tag;
+"""
+
+MERGE_STAGED_ROWS = """
+INSERT INTO core_author (name)
+    SELECT name FROM import_author
+    ON CONFLICT DO NOTHING;
+INSERT INTO core_tag (name)
+    SELECT name FROM import_tag
+    ON CONFLICT DO NOTHING;
+INSERT INTO core_article (
+    id, title, abstract, publication_date, "createdBy_id", updated_at, author_names, tag_names, comment_count
+)
+    SELECT id, title, abstract, publication_date, %(created_by)s, now(), '{}', '{}', 0 FROM import_article
+    ON CONFLICT DO NOTHING;
+INSERT INTO core_article_authors (article_id, author_id)
+    SELECT staged.article_id, author.id
+    FROM import_article_author staged JOIN core_author author ON author.name = staged.name
+    ORDER BY staged.article_id, staged.position
+    ON CONFLICT DO NOTHING;
+INSERT INTO core_article_tags (article_id, tag_id)
+    SELECT staged.article_id, tag.id
+    FROM import_article_tag staged JOIN core_tag tag ON tag.name = staged.name
+    ORDER BY staged.article_id, staged.position
+    ON CONFLICT DO NOTHING;
+UPDATE core_article SET
+    author_names = ARRAY(
+        SELECT author.name
+        FROM core_article_authors link JOIN core_author author ON author.id = link.author_id
+        WHERE link.article_id = core_article.id
+        ORDER BY link.id
+    ),
+    tag_names = ARRAY(
+        SELECT tag.name
+        FROM core_article_tags link JOIN core_tag tag ON tag.id = link.tag_id
+        WHERE link.article_id = core_article.id
+        ORDER BY link.id
+    ),
+    updated_at = now()
+    WHERE id IN (SELECT id FROM import_article);
+"""
+
+
+class InvalidRecord(ValueError):
+    """Raised when a record cannot be loaded as an article."""
+
+
+def article_id(record):
+    """Return the record's id, or one derived from its content."""
+    if record.get('id'):
+        return uuid.UUID(str(record['id']))
+    key = '\x1f'.join([record['title'], str(record['publication_date']), record['abstract']])
+    return uuid.uuid5(ARTICLE_NAMESPACE, key)
+
+
+class ArticleLoader:
+    """
+    Load batches of article records through COPY into staging tables.
+
+    Each record is a mapping with `title`, `abstract`, `publication_date`
+    and lists of `authors` and `tags` names, plus an optional `id`. A batch
+    is staged with COPY and merged into the real tables with set-based
+    `INSERT ... ON CONFLICT DO NOTHING` statements in one transaction, so
+    loading a batch again is a no-op.
+    """
+
+    def __init__(self, using='default', created_by=None):
+        self.using = using
+        self.created_by = created_by
+        self.title_length = Article._meta.get_field('title').max_length
+        self.author_length = Author._meta.get_field('name').max_length
+        self.tag_length = Tag._meta.get_field('name').max_length
+
+    def clean(self, record):
+        """Validate a record and return it as a tuple of staged values."""
+        try:
+            title = record['title'].strip()
+            abstract = str(record['abstract'])
+            publication_date = parse_date(str(record['publication_date']))
+            authors = [name.strip() for name in record.get('authors') or []]
+            tags = [name.strip() for name in record.get('tags') or []]
+            pk = article_id(record)
+        except (KeyError, TypeError, AttributeError, ValueError) as error:
+            raise InvalidRecord(f'Malformed record: {error!r}')
+
+        if not title or publication_date is None:
+            raise InvalidRecord('A title and a YYYY-MM-DD publication_date are required.')
+        if not authors:
+            raise InvalidRecord('At least one author is required.')
+        if len(title) > self.title_length:
+            raise InvalidRecord(f'Title is longer than {self.title_length} characters.')
+        if any(len(name) > self.author_length for name in authors):
+            raise InvalidRecord(f'Author name is longer than {self.author_length} characters.')
+        if any(len(name) > self.tag_length for name in tags):
+            raise InvalidRecord(f'Tag name is longer than {self.tag_length} characters.')
+
+        return pk, title, abstract, publication_date, authors, tags
+
+    def load_batch(self, records):
+        """Load cleaned `records` in one transaction."""
+        articles = io.StringIO()
+        article_authors = io.StringIO()
+        article_tags = io.StringIO()
+        article_writer = csv.writer(articles, quoting=csv.QUOTE_ALL)
+        author_writer = csv.writer(article_authors, quoting=csv.QUOTE_ALL)
+        tag_writer = csv.writer(article_tags, quoting=csv.QUOTE_ALL)
+        # Quote every value so empty strings are not read back as NULL, and
+        # dedupe names in process so each is staged and merged once.
+        authors = set()
+        tags = set()
+
+        for pk, title, abstract, publication_date, author_names, tag_names in records:
+            article_writer.writerow([pk, title, abstract, publication_date])
+            # Links are inserted by position, so the name arrays keep the
+            # order of the record.
+            for position, name in enumerate(dict.fromkeys(author_names)):
+                author_writer.writerow([pk, position, name])
+                authors.add(name)
+            for position, name in enumerate(dict.fromkeys(tag_names)):
+                tag_writer.writerow([pk, position, name])
+                tags.add(name)
+
+        with transaction.atomic(using=self.using):
+            with connections[self.using].cursor() as cursor:
+                cursor.execute(STAGING_TABLES)
+                self._copy(cursor, 'import_article (id, title, abstract, publication_date)', articles)
+                self._copy(cursor, 'import_author (name)', self._lines(authors))
+                self._copy(cursor, 'import_tag (name)', self._lines(tags))
+                self._copy(cursor, 'import_article_author (article_id, position, name)', article_authors)
+                self._copy(cursor, 'import_article_tag (article_id, position, name)', article_tags)
+                cursor.execute(MERGE_STAGED_ROWS, {'created_by': self.created_by})
+
+        articles_bulk_loaded.send(sender=Article, using=self.using)
+        return len(records)
+
+    def _lines(self, values):
+        buffer = io.StringIO()
+        csv.writer(buffer, quoting=csv.QUOTE_ALL).writerows([value] for value in values)
+        return buffer
+
+    def _copy(self, cursor, table, buffer):
+        buffer.seek(0)
+        cursor.copy_expert(f'COPY {table} FROM STDIN WITH (FORMAT csv)', buffer)
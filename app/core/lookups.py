@@ -0,0 +1,41 @@
+"""
+Trigram lookups and functions for fuzzy name matching.
+
+Both lookups are served by `gin_trgm_ops` indexes.
+"""
+from django.contrib.postgres.lookups import PostgresOperatorLookup
+from django.db.models import CharField, FloatField, Func, Value, lookups
+
+
+@CharField.register_lookup
+class TrigramWordSimilar(PostgresOperatorLookup):
+    """Match values containing a word similar to the right-hand side."""
+    lookup_name = 'trigram_word_similar'
+    postgres_operator = '%%>'
+
+
+@CharField.register_lookup
+class IPrefix(lookups.IStartsWith):
+    """
+    Case-insensitive prefix match written with ILIKE.
+
+    `istartswith` compares UPPER() of the column, which a trigram index on
+    the column cannot serve.
+    """
+    lookup_name = 'iprefix'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} ILIKE {rhs}', lhs_params + rhs_params
+
+
+class TrigramWordSimilarity(Func):
+    """Similarity of `string` to the most similar extent of words in `expression`."""
+    function = 'WORD_SIMILARITY'
+    output_field = FloatField()
+
+    def __init__(self, string, expression, **extra):
+        if not hasattr(string, 'resolve_expression'):
+            string = Value(string)
+        super().__init__(string, expression, **extra)
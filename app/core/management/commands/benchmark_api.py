@@ -0,0 +1,68 @@
+"""
+Django command to benchmark the API endpoints in-process.
+"""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from article.benchmark import EndpointBenchmark
+
+
+class Command(BaseCommand):
+    """Django command to measure latency, queries and throughput per endpoint."""
+    help = (
+        'Send requests to the list (with each filter), retrieve, create, '
+        'update and token endpoints in-process and report p50/p99 latency, '
+        'queries per request and throughput. Writes are committed, and '
+        'the articles and user the benchmark created are deleted afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=100, help='Requests per scenario.')
+        parser.add_argument(
+            '--scenario',
+            action='append',
+            dest='scenarios',
+            help='Scenario to run, may be repeated. Runs all of them by default.',
+        )
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--cache',
+            action='store_true',
+            help='Serve lists from the list cache instead of the database.',
+        )
+        parser.add_argument(
+            '--output',
+            help='File to write the report to as JSON, for diffing between releases.',
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        if options['requests'] <= 0:
+            raise CommandError('--requests must be positive.')
+
+        benchmark = EndpointBenchmark(
+            requests=options['requests'],
+            seed=options['seed'],
+            cache=options['cache'],
+        )
+        try:
+            report = benchmark.run(options['scenarios'])
+        except ValueError as error:
+            raise CommandError(str(error))
+
+        self.stdout.write(
+            f'{report["articles"]} articles, {report["requests"]} requests per scenario\n'
+            f'{"scenario":<22}{"p50 ms":>10}{"p99 ms":>10}{"queries":>10}{"req/s":>10}{"errors":>8}'
+        )
+        for name, result in report['scenarios'].items():
+            self.stdout.write(
+                f'{name:<22}{result["p50_ms"]:>10.2f}{result["p99_ms"]:>10.2f}'
+                f'{result["queries_per_request"]:>10.2f}{result["throughput_rps"]:>10.1f}{result["errors"]:>8}'
+            )
+
+        if options['output']:
+            with open(options['output'], 'w') as stream:
+                json.dump(report, stream, indent=2, sort_keys=True)
+                stream.write('\n')
+            self.stdout.write(self.style.SUCCESS(f'Wrote {options["output"]}.'))
@@ -0,0 +1,138 @@
+"""
+Django command to bulk import articles from JSONL or CSV files.
+"""
+import csv
+import itertools
+import json
+import os
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from core.loader import ArticleLoader, InvalidRecord
+
+
+def read_jsonl(stream):
+    """Yield one record per non-blank line."""
+    for number, line in enumerate(stream, 1):
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as error:
+                raise CommandError(f'Line {number}: invalid JSON: {error.msg}.')
+
+
+def read_csv(stream, separator):
+    """Yield one record per row, splitting the authors and tags columns."""
+    for row in csv.DictReader(stream):
+        for column in ('authors', 'tags'):
+            value = row.get(column) or ''
+            row[column] = [name for name in value.split(separator) if name.strip()]
+        yield row
+
+
+class Command(BaseCommand):
+    """Django command to import articles."""
+    help = (
+        'Stream articles from a JSONL or CSV file into the database with '
+        'COPY, in batches that each commit on their own.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='JSONL or CSV file to import.')
+        parser.add_argument(
+            '--format',
+            choices=['jsonl', 'csv'],
+            help='Input format, guessed from the file extension by default.',
+        )
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--separator',
+            default=';',
+            help='Separator between names in the CSV authors and tags columns.',
+        )
+        parser.add_argument(
+            '--created-by',
+            help='Email of the user to record as creator of the articles.',
+        )
+        parser.add_argument(
+            '--checkpoint',
+            help='File recording how many records are committed. '
+                 'Defaults to PATH.checkpoint.',
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Skip the records committed by a previous run.',
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        path = options['path']
+        file_format = options['format'] or ('csv' if path.endswith('.csv') else 'jsonl')
+        batch_size = options['batch_size']
+        checkpoint = options['checkpoint'] or f'{path}.checkpoint'
+        if batch_size <= 0:
+            raise CommandError('--batch-size must be positive.')
+
+        created_by = None
+        if options['created_by']:
+            try:
+                created_by = get_user_model().objects.get(email=options['created_by']).pk
+            except get_user_model().DoesNotExist:
+                raise CommandError(f'No user with email {options["created_by"]}.')
+
+        skip = self._read_checkpoint(checkpoint) if options['resume'] else 0
+        loader = ArticleLoader(created_by=created_by)
+
+        with open(path, newline='', encoding='utf-8') as stream:
+            if file_format == 'csv':
+                records = read_csv(stream, options['separator'])
+            else:
+                records = read_jsonl(stream)
+            if skip:
+                self.stdout.write(f'Resuming after {skip} records . . .')
+                records = itertools.islice(records, skip, None)
+
+            loaded = self._import(loader, records, skip, batch_size, checkpoint)
+
+        self.stdout.write(self.style.SUCCESS(f'Imported {loaded} articles.'))
+
+    def _import(self, loader, records, position, batch_size, checkpoint):
+        """Load `records` batch by batch, checkpointing after each commit."""
+        started = time.monotonic()
+        loaded = 0
+        while True:
+            batch = []
+            for record in itertools.islice(records, batch_size):
+                try:
+                    batch.append(loader.clean(record))
+                except InvalidRecord as error:
+                    raise CommandError(f'Record {position + len(batch) + 1}: {error}')
+            if not batch:
+                return loaded
+
+            loader.load_batch(batch)
+            loaded += len(batch)
+            position += len(batch)
+            self._write_checkpoint(checkpoint, position)
+
+            elapsed = time.monotonic() - started
+            self.stdout.write(
+                f'Imported {loaded} articles '
+                f'({loaded / elapsed if elapsed else 0:.0f} rows/sec) . . .'
+            )
+
+    def _read_checkpoint(self, checkpoint):
+        try:
+            with open(checkpoint) as stream:
+                return int(stream.read().strip() or 0)
+        except FileNotFoundError:
+            return 0
+
+    def _write_checkpoint(self, checkpoint, position):
+        # Replace the file atomically so a crash never leaves it half written.
+        with open(f'{checkpoint}.tmp', 'w') as stream:
+            stream.write(str(position))
+        os.replace(f'{checkpoint}.tmp', checkpoint)
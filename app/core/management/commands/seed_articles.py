@@ -0,0 +1,90 @@
+"""
+Django command to generate synthetic articles for load testing.
+"""
+import itertools
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from core.loader import ArticleLoader
+from core.synthetic import ArticleGenerator
+
+
+class Command(BaseCommand):
+    """Django command to seed the database with synthetic articles."""
+    help = (
+        'Generate realistic articles with Zipf distributed authors and tags '
+        'and load them with COPY, in batches that each commit on their own.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('count', type=int, help='Number of articles to generate.')
+        parser.add_argument('--batch-size', type=int, default=10000)
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Seed of the generator. Seeding again with the same seed and '
+                 'count adds nothing.',
+        )
+        parser.add_argument('--start', type=int, default=0, help='Index of the first article to generate.')
+        parser.add_argument('--authors', type=int, default=50000, help='Number of distinct authors.')
+        parser.add_argument('--tags', type=int, default=2000, help='Number of distinct tags.')
+        parser.add_argument('--start-year', type=int, default=1990)
+        parser.add_argument('--end-year', type=int, default=2024)
+        parser.add_argument(
+            '--exponent',
+            type=float,
+            default=1.1,
+            help='Zipf exponent of the author and tag popularity.',
+        )
+        parser.add_argument(
+            '--created-by',
+            help='Email of the user to record as creator of the articles.',
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        count = options['count']
+        batch_size = options['batch_size']
+        if count < 0 or batch_size <= 0:
+            raise CommandError('count must not be negative and --batch-size must be positive.')
+        if options['authors'] <= 0 or options['tags'] <= 0:
+            raise CommandError('--authors and --tags must be positive.')
+        if options['start_year'] > options['end_year']:
+            raise CommandError('--start-year must not be after --end-year.')
+
+        created_by = None
+        if options['created_by']:
+            try:
+                created_by = get_user_model().objects.get(email=options['created_by']).pk
+            except get_user_model().DoesNotExist:
+                raise CommandError(f'No user with email {options["created_by"]}.')
+
+        generator = ArticleGenerator(
+            seed=options['seed'],
+            authors=options['authors'],
+            tags=options['tags'],
+            start_year=options['start_year'],
+            end_year=options['end_year'],
+            exponent=options['exponent'],
+        )
+        loader = ArticleLoader(created_by=created_by)
+        records = generator.records(count, start=options['start'])
+
+        started = time.monotonic()
+        loaded = 0
+        while True:
+            batch = [loader.clean(record) for record in itertools.islice(records, batch_size)]
+            if not batch:
+                break
+            loader.load_batch(batch)
+            loaded += len(batch)
+            elapsed = time.monotonic() - started
+            self.stdout.write(
+                f'Seeded {loaded} of {count} articles '
+                f'({loaded / elapsed if elapsed else 0:.0f} rows/sec) . . .'
+            )
+
+        self.stdout.write(self.style.SUCCESS(f'Seeded {loaded} articles.'))
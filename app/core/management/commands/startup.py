@@ -0,0 +1,55 @@
+"""
+Django command to prepare the database and caches before serving.
+"""
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.executor import MigrationExecutor
+
+from core.warmup import warm_caches
+
+
+class Command(BaseCommand):
+    """
+    Django command to wait for the database, migrate and warm caches.
+
+    Warming only helps the server when the caches are shared, since this
+    command runs in its own process.
+    """
+    help = (
+        'Wait for the database, apply migrations only when some are '
+        'unapplied and optionally warm the caches.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help='Database alias to migrate.')
+        parser.add_argument('--timeout', type=float, default=120, help='Seconds to wait for the database.')
+        parser.add_argument(
+            '--warm', action='store_true',
+            help=(
+                'Warm the token, facet and schema caches. Only useful with a shared '
+                'CACHE_BACKEND, as the local memory caches of this process are gone '
+                'once it exits; set READY_WARM_CACHES to warm each server process.'
+            ),
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        database = options['database']
+        call_command('wait_for_db', timeout=options['timeout'], stdout=self.stdout)
+
+        if self.migration_plan(database):
+            call_command('migrate', database=database, interactive=False, stdout=self.stdout)
+        else:
+            self.stdout.write('No migrations to apply.')
+
+        if options['warm']:
+            for name, duration in warm_caches().items():
+                self.stdout.write(f'Warmed {name} in {duration * 1000:.0f}ms.')
+
+        self.stdout.write(self.style.SUCCESS('Startup complete.'))
+
+    def migration_plan(self, database):
+        """Return the migrations `migrate` would apply, without touching the schema."""
+        executor = MigrationExecutor(connections[database])
+        return executor.migration_plan(executor.loader.graph.leaf_nodes())
@@ -0,0 +1,65 @@
+"""
+Django command to backfill or verify the denormalized article names.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import Article
+from core.signals import articles_bulk_loaded
+
+
+class Command(BaseCommand):
+    """Django command to sync the author and tag name arrays of articles."""
+    help = (
+        'Copy the linked author and tag names into the name arrays of the '
+        'articles where they differ, or only report them with --verify.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--verify',
+            action='store_true',
+            help='Report articles whose names are out of sync and fail if '
+                 'there are any, without changing them.',
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        batch_size = options['batch_size']
+        if batch_size <= 0:
+            raise CommandError('--batch-size must be positive.')
+
+        stale = 0
+        synced = 0
+        for batch in self._batches(batch_size):
+            stale_ids = list(Article.objects.filter(pk__in=batch).stale_names().values_list('pk', flat=True))
+            stale += len(stale_ids)
+            if options['verify']:
+                for pk in stale_ids:
+                    self.stdout.write(f'Out of sync: {pk}')
+            elif stale_ids:
+                synced += Article.objects.filter(pk__in=stale_ids).sync_names()
+
+        if options['verify']:
+            if stale:
+                raise CommandError(f'{stale} articles have out of sync names.')
+            self.stdout.write(self.style.SUCCESS('All article names are in sync.'))
+            return
+
+        if synced:
+            # Updates bypass the model signals, like bulk loads.
+            articles_bulk_loaded.send(sender=Article, using='default')
+        self.stdout.write(self.style.SUCCESS(f'Synced the names of {synced} articles.'))
+
+    def _batches(self, batch_size):
+        """Yield the article ids in batches, walking the primary key."""
+        last = None
+        while True:
+            articles = Article.objects.order_by('pk')
+            if last is not None:
+                articles = articles.filter(pk__gt=last)
+            batch = list(articles.values_list('pk', flat=True)[:batch_size])
+            if not batch:
+                return
+            yield batch
+            last = batch[-1]
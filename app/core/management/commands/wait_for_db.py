@@ -1,30 +1,55 @@
 """
 Django command to wait for the database to be available.
 """
+import random
 import time
 
-from psycopg2 import OperationalError as Psycopg2OpError
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
 
-from django.db import connections # noqa
-from django.db.utils import OperationalError
-from django.core.management.base import BaseCommand
+from core.db import database_errors
 
 
 class Command(BaseCommand):
     """Django command to wait for database."""
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database',
+            action='append',
+            dest='databases',
+            help='Database alias to wait for, may be repeated. Defaults to every database but the replicas.',
+        )
+        parser.add_argument(
+            '--timeout',
+            type=float,
+            default=120,
+            help='Seconds to wait in total before failing.',
+        )
+        parser.add_argument('--initial-delay', type=float, default=0.1, help='Seconds before the first retry.')
+        parser.add_argument('--max-delay', type=float, default=5, help='Longest wait between retries.')
+
     def handle(self, *args, **options):
         """Entrypoint for command."""
+        pending = options['databases'] or [
+            alias for alias in settings.DATABASES if alias not in settings.DATABASE_REPLICAS
+        ]
+        unknown = set(pending) - set(settings.DATABASES)
+        if unknown:
+            raise CommandError(f'Unknown databases: {", ".join(sorted(unknown))}.')
+
         self.stdout.write('\nWaiting for database . . .')
-        db_up = False
-        while db_up is False:
-            try:
-                self.check(databases=['default'])
-                db_up = True
-            except (Psycopg2OpError, OperationalError):
-                self.stdout.write(
-                    'Database unavailable, waiting 1 second . . .')
-
-                time.sleep(1)
+        deadline = time.monotonic() + options['timeout']
+        delay = options['initial_delay']
+        while database_errors(pending):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise CommandError(f'Database unavailable after {options["timeout"]:g} seconds.')
+            # Back off exponentially, with jitter so restarting workers
+            # do not retry in lockstep.
+            wait = min(delay * random.uniform(0.5, 1), remaining)
+            self.stdout.write(f'Database unavailable, waiting {wait:.2f} seconds . . .')
+            time.sleep(wait)
+            delay = min(delay * 2, options['max_delay'])
 
         self.stdout.write(self.style.SUCCESS('Database available!'))
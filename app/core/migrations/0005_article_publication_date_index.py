@@ -0,0 +1,17 @@
+# Generated by Django 3.2.25 on 2026-10-16 22:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_article_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['-publication_date', 'id'], name='core_article_pub_date_id_idx'),
+        ),
+    ]
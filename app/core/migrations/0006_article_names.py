@@ -0,0 +1,52 @@
+# Generated by Django 3.2.25 on 2026-10-16 20:58
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_article_publication_date_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='author_names',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=255), blank=True, default=list, editable=False, size=None),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='tag_names',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=50), blank=True, default=list, editable=False, size=None),
+        ),
+        # Backfill before building the indexes.
+        migrations.RunSQL(
+            sql="""
+                UPDATE core_article SET
+                    author_names = ARRAY(
+                        SELECT author.name
+                        FROM core_article_authors link JOIN core_author author ON author.id = link.author_id
+                        WHERE link.article_id = core_article.id
+                        ORDER BY link.id
+                    ),
+                    tag_names = ARRAY(
+                        SELECT tag.name
+                        FROM core_article_tags link JOIN core_tag tag ON tag.id = link.tag_id
+                        WHERE link.article_id = core_article.id
+                        ORDER BY link.id
+                    );
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['author_names'], name='core_articl_author__ba6feb_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['tag_names'], name='core_articl_tag_nam_090c15_gin'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 3.2.25 on 2026-10-16 21:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_article_names'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunSQL(
+            sql="""
+                UPDATE core_article SET comment_count = (
+                    SELECT COUNT(*) FROM core_comment WHERE core_comment.article_id = core_article.id
+                );
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['article', 'createdAt', 'id'], name='core_comment_art_created_idx'),
+        ),
+    ]
@@ -2,7 +2,14 @@
 Database models.
 """
 from django.conf import settings
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models import Case, Count, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 from django.contrib.auth.models import (
     AbstractBaseUser,
     BaseUserManager,
@@ -10,6 +17,8 @@ from django.contrib.auth.models import (
 )
 import uuid
 
+from core.lookups import TrigramWordSimilarity
+
 # AbstractBaseUser has the functionality for the authentication
 
 
@@ -49,19 +58,120 @@ class User(AbstractBaseUser, PermissionsMixin):
     USERNAME_FIELD = 'email'
 
 
+class NameManager(models.Manager):
+    """Manager for models identified by a unique name."""
+
+    def resolve(self, names):
+        """
+        Return a `{name: id}` map for `names`, creating the missing ones.
+
+        Runs a fixed number of queries however many names are given. Names
+        created concurrently by another transaction are picked up instead
+        of raising an IntegrityError.
+        """
+        names = list(dict.fromkeys(names))
+        if not names:
+            return {}
+
+        ids = dict(self.filter(name__in=names).values_list('name', 'id'))
+        missing = [name for name in names if name not in ids]
+        if missing:
+            self.bulk_create(
+                [self.model(name=name) for name in missing],
+                ignore_conflicts=True,
+            )
+            ids.update(self.filter(name__in=missing).values_list('name', 'id'))
+
+        return ids
+
+    def autocomplete(self, query, limit, candidates):
+        """
+        Return up to `limit` names matching `query`, with their article counts.
+
+        Names starting with `query` come first, then names containing a
+        word similar to it. Both matches are served by the trigram index on
+        `name`. Only the `candidates` most similar names are counted and
+        ranked, by similarity and then by article count.
+        """
+        matches = self.filter(
+            Q(name__iprefix=query) | Q(name__trigram_word_similar=query),
+        ).annotate(
+            similarity=TrigramWordSimilarity(query, 'name'),
+        ).order_by('-similarity', 'name').values('pk')[:candidates]
+
+        return list(self.filter(pk__in=matches).annotate(
+            is_prefix=Case(When(name__iprefix=query, then=True), default=False, output_field=models.BooleanField()),
+            similarity=TrigramWordSimilarity(query, 'name'),
+            article_count=Count('article'),
+        ).order_by('-is_prefix', '-similarity', '-article_count', 'name').values('name', 'article_count')[:limit])
+
+
 class Tag(models.Model):
     name = models.CharField(max_length=50, unique=True)
 
+    objects = NameManager()
+
+    class Meta:
+        indexes = [
+            # Serves the prefix and fuzzy matches of the tag autocomplete.
+            GinIndex(fields=['name'], name='core_tag_name_trgm', opclasses=['gin_trgm_ops']),
+        ]
+
     def __str__(self):
         return self.name
 
 class Author(models.Model):
     name = models.CharField(max_length=255, unique=True)
 
+    objects = NameManager()
+
+    class Meta:
+        indexes = [
+            # Serves the prefix and fuzzy matches of the author autocomplete.
+            GinIndex(fields=['name'], name='core_author_name_trgm', opclasses=['gin_trgm_ops']),
+        ]
+
     def __str__(self):
         return self.name
 
 
+class ArticleQuerySet(models.QuerySet):
+    """QuerySet for articles and their denormalized author and tag names."""
+
+    def _linked_names(self, relation, field):
+        """Return an expression for the names linked to each article, in link order."""
+        names = getattr(self.model, relation).through.objects.filter(
+            article=OuterRef('pk'),
+        ).values('article').annotate(
+            # Subqueries drop their ORDER BY, so order within the aggregate.
+            names=ArrayAgg(f'{field}__name', ordering='id'),
+        ).values('names')
+        output_field = ArrayField(models.CharField(max_length=255))
+        return Coalesce(Subquery(names, output_field=output_field), Value([], output_field=output_field))
+
+    def sync_names(self):
+        """
+        Copy the linked author and tag names into the articles' name arrays.
+
+        Runs as a single UPDATE and marks the articles as modified.
+        """
+        return self.update(
+            author_names=self._linked_names('authors', 'author'),
+            tag_names=self._linked_names('tags', 'tag'),
+            updated_at=timezone.now(),
+        )
+
+    def stale_names(self):
+        """Return the articles whose name arrays differ from their links."""
+        return self.alias(
+            linked_author_names=self._linked_names('authors', 'author'),
+            linked_tag_names=self._linked_names('tags', 'tag'),
+        ).filter(
+            ~Q(author_names=models.F('linked_author_names'))
+            | ~Q(tag_names=models.F('linked_tag_names'))
+        )
+
+
 class Article(models.Model):
     id = models.UUIDField(
         primary_key=True,
@@ -74,9 +184,47 @@ class Article(models.Model):
     authors = models.ManyToManyField(Author)
     tags = models.ManyToManyField(Tag, blank=True)
     createdBy = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, null=True)
+    # Weighted title/abstract tsvector, maintained by a database trigger so
+    # every write path (ORM, bulk loads, raw SQL) keeps it current.
+    search_vector = SearchVectorField(null=True, editable=False)
+    # Bumped on every write, including author/tag link changes, to serve
+    # conditional requests.
+    updated_at = models.DateTimeField(auto_now=True)
+    # Copies of the linked names, in link order, so lists can be filtered
+    # and rendered from this table alone. Kept in sync by signal handlers
+    # on every link change; see `ArticleQuerySet.sync_names`.
+    author_names = ArrayField(models.CharField(max_length=255), default=list, blank=True, editable=False)
+    tag_names = ArrayField(models.CharField(max_length=50), default=list, blank=True, editable=False)
+    # Maintained by signal handlers on comment create and delete.
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = ArticleQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector']),
+            GinIndex(fields=['author_names']),
+            GinIndex(fields=['tag_names']),
+            # Serves both date range filters and the default newest-first
+            # keyset ordering, so a separate publication_date index would
+            # only duplicate its leading column.
+            models.Index(fields=['-publication_date', 'id'], name='core_article_pub_date_id_idx'),
+        ]
+
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        # The comment count only changes atomically in the database, so a
+        # full save of an instance loaded earlier must not write it back.
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'comment_count' and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
+
 
 class Comment(models.Model):
     article = models.ForeignKey(Article, related_name='comments', on_delete=models.CASCADE)
@@ -84,5 +232,11 @@ class Comment(models.Model):
     content = models.TextField()
     createdAt = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Serves the keyset pagination of an article's comments.
+            models.Index(fields=['article', 'createdAt', 'id'], name='core_comment_art_created_idx'),
+        ]
+
     def __str__(self):
         return f'Comment by {self.commentedBy.name} on {self.article.title}'
\ No newline at end of file
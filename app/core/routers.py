@@ -0,0 +1,205 @@
+"""
+Routing of reads to replica databases, with read-your-writes stickiness.
+"""
+import contextvars
+import hashlib
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from core.db import DATABASE_ERRORS
+
+# Replication lag in seconds, 0 when the replica has replayed everything it
+# received, and NULL on a server that is not replicating.
+LAG_SQL = '''
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+'''
+
+_current = contextvars.ContextVar('database_routing', default=None)
+
+
+class RoutingState:
+    """How the current request reads, and whether it has written."""
+
+    def __init__(self, use_replica):
+        self.use_replica = use_replica
+        self.wrote = False
+
+
+@contextmanager
+def use_primary():
+    """
+    Read from the primary within the block, even in a safe request.
+
+    For work whose result outlives the request and is shared with other
+    clients, such as filling the list and facet caches. A replica may not
+    have replayed the write that invalidated them yet, and its stale
+    result would be cached under the new generation.
+    """
+    state = _current.get()
+    if state is None or not state.use_replica:
+        yield
+        return
+    state.use_replica = False
+    try:
+        yield
+    finally:
+        state.use_replica = not state.wrote
+
+
+class ReplicaMonitor:
+    """
+    Per-process view of which replicas are usable.
+
+    Each replica's lag is measured at most once every
+    `DB_REPLICA_LAG_CHECK_INTERVAL` seconds. A replica that is behind by
+    more than `DB_REPLICA_MAX_LAG` seconds, or cannot be reached, is left
+    out until a later check finds it caught up.
+    """
+
+    def __init__(self):
+        self._checked = {}
+        self._lock = threading.Lock()
+
+    def healthy(self, aliases):
+        now = time.monotonic()
+        return [alias for alias in aliases if self._is_healthy(alias, now)]
+
+    def _is_healthy(self, alias, now):
+        checked = self._checked.get(alias)
+        if checked is not None and now - checked[0] < settings.DB_REPLICA_LAG_CHECK_INTERVAL:
+            return checked[1]
+        with self._lock:
+            checked = self._checked.get(alias)
+            if checked is None or now - checked[0] >= settings.DB_REPLICA_LAG_CHECK_INTERVAL:
+                lag = self.lag(alias)
+                checked = self._checked[alias] = (now, lag is not None and lag <= settings.DB_REPLICA_MAX_LAG)
+        return checked[1]
+
+    def lag(self, alias):
+        """Return how many seconds `alias` is behind, or None if it is unreachable."""
+        connection = connections[alias]
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(LAG_SQL)
+                lag = cursor.fetchone()[0]
+        except DATABASE_ERRORS:
+            try:
+                connection.close()
+            except DATABASE_ERRORS:
+                pass
+            return None
+        return float(lag or 0)
+
+    def clear(self):
+        with self._lock:
+            self._checked.clear()
+
+
+monitor = ReplicaMonitor()
+
+
+class ReplicaRouter:
+    """
+    Send the reads of safe requests to a replica, everything else to the primary.
+
+    Reads go to a replica only inside a request routed by
+    `ReplicaRoutingMiddleware`, so management commands and background work
+    always see their own writes. Once a request writes, its remaining reads
+    also go to the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _current.get()
+        if state is None or not state.use_replica:
+            return DEFAULT_DB_ALIAS
+        if model._meta.label_lower in settings.DB_PRIMARY_READ_MODELS:
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        replicas = monitor.healthy(settings.DATABASE_REPLICAS)
+        if not replicas:
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        state = _current.get()
+        if state is not None:
+            state.wrote = True
+            state.use_replica = False
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        pool = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in pool and obj2._state.db in pool:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas receive the schema from the primary.
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
+
+
+def _sticky_key(request):
+    """
+    Return the cache key of the client making `request`, if it can be told apart.
+
+    Clients are told apart by their Authorization header, else by their
+    session. Once the session middleware has run, its current key is
+    used, which login rotates.
+    """
+    credentials = request.META.get('HTTP_AUTHORIZATION')
+    if not credentials:
+        session = getattr(request, 'session', None)
+        session_key = session.session_key if session is not None else None
+        session_key = session_key or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+        if not session_key:
+            return None
+        credentials = 'session:' + session_key
+    # Never use raw tokens as keys in a shared cache.
+    return 'db:primary:' + hashlib.sha256(credentials.encode('utf-8')).hexdigest()
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Choose the database reads of each request go to.
+
+    Safe requests read from a replica, unless the same credentials or
+    session wrote in the last `DB_REPLICA_STICKY_SECONDS` seconds, so
+    clients read their own writes. Stickiness is kept in the `DB_REPLICA_STICKY_CACHE_ALIAS` cache,
+    so it only holds across processes when that cache is shared.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+
+        key = _sticky_key(request)
+        cache = caches[settings.DB_REPLICA_STICKY_CACHE_ALIAS]
+        use_replica = request.method in ('GET', 'HEAD', 'OPTIONS') and not (key and cache.get(key))
+        state = RoutingState(use_replica)
+        token = _current.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+
+        if state.wrote or request.method not in ('GET', 'HEAD', 'OPTIONS'):
+            # The session may have been created or rotated by this request.
+            key = _sticky_key(request)
+            if key:
+                cache.set(key, True, settings.DB_REPLICA_STICKY_SECONDS)
+        return response
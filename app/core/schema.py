@@ -0,0 +1,46 @@
+"""
+OpenAPI schema generated once per process.
+"""
+import threading
+
+from django.utils import translation
+from drf_spectacular.settings import spectacular_settings
+from drf_spectacular.views import SpectacularAPIView
+from rest_framework.response import Response
+
+_schemas = {}
+_lock = threading.Lock()
+
+
+def get_schema(api_version=None, request=None):
+    """
+    Return the public schema for the active language and `api_version`.
+
+    Endpoints only change on deploy, so the schema is generated on first
+    use and kept for the life of the process.
+    """
+    key = (translation.get_language(), api_version)
+    schema = _schemas.get(key)
+    if schema is None:
+        with _lock:
+            schema = _schemas.get(key)
+            if schema is None:
+                generator = spectacular_settings.DEFAULT_GENERATOR_CLASS(
+                    urlconf=spectacular_settings.SERVE_URLCONF, api_version=api_version,
+                )
+                schema = _schemas[key] = generator.get_schema(request=request, public=True)
+    return schema
+
+
+def clear_schemas():
+    _schemas.clear()
+
+
+class CachedSchemaView(SpectacularAPIView):
+    """Schema view serving the per-process schema."""
+
+    def _get_schema_response(self, request):
+        # Private schemas depend on the requesting user, so are never shared.
+        if not self.serve_public or self.urlconf is not spectacular_settings.SERVE_URLCONF:
+            return super()._get_schema_response(request)
+        return Response(get_schema(api_version=self.api_version, request=request))
@@ -0,0 +1,119 @@
+"""
+Custom signals and signal handlers for the core models.
+"""
+import contextvars
+
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import Signal, receiver
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from core.models import Article, Author, Comment, Tag, User
+
+
+# Sent after articles and their links are written in bulk, bypassing the
+# model save and m2m_changed signals. Provides `using`.
+articles_bulk_loaded = Signal()
+
+# Articles whose deletion is cascading to their comments.
+_deleting_articles = contextvars.ContextVar('deleting_articles', default=frozenset())
+
+
+def is_article_deleting(article_id):
+    """Whether the comments of `article_id` are being deleted along with it."""
+    return article_id in _deleting_articles.get()
+
+
+def touch_articles(queryset):
+    """Mark the articles in `queryset` as modified now."""
+    queryset.update(updated_at=timezone.now())
+
+
+@receiver(m2m_changed, sender=Article.authors.through)
+@receiver(m2m_changed, sender=Article.tags.through)
+def sync_relinked_articles(sender, instance, action, reverse, pk_set, **kwargs):
+    """Keep the name arrays of articles current when authors or tags are relinked."""
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            Article.objects.filter(pk=instance.pk).sync_names()
+            # Callers go on to render or save the instance they relinked.
+            instance.refresh_from_db(fields=['author_names', 'tag_names', 'updated_at'])
+        return
+
+    relation = 'authors' if sender is Article.authors.through else 'tags'
+    if action == 'pre_clear':
+        # The links are gone by post_clear, so note the articles first.
+        instance._linked_article_ids = list(
+            Article.objects.filter(**{relation: instance}).values_list('pk', flat=True)
+        )
+    elif action == 'post_clear':
+        Article.objects.filter(pk__in=instance._linked_article_ids).sync_names()
+    elif action in ('post_add', 'post_remove'):
+        Article.objects.filter(pk__in=pk_set).sync_names()
+
+
+@receiver(post_save, sender=Author)
+@receiver(post_save, sender=Tag)
+def sync_articles_of_renamed(sender, instance, created, **kwargs):
+    """Copy a renamed author or tag into the name arrays of its articles."""
+    if not created:
+        relation = 'authors' if sender is Author else 'tags'
+        Article.objects.filter(**{relation: instance}).sync_names()
+
+
+@receiver(pre_delete, sender=Author)
+@receiver(pre_delete, sender=Tag)
+def note_articles_of_deleted(sender, instance, **kwargs):
+    """Note the articles of an author or tag before its links are deleted."""
+    relation = 'authors' if sender is Author else 'tags'
+    instance._linked_article_ids = list(
+        Article.objects.filter(**{relation: instance}).values_list('pk', flat=True)
+    )
+
+
+@receiver(post_delete, sender=Author)
+@receiver(post_delete, sender=Tag)
+def sync_articles_of_deleted(sender, instance, **kwargs):
+    """Drop a deleted author or tag from the name arrays of its articles."""
+    Article.objects.filter(pk__in=instance._linked_article_ids).sync_names()
+
+
+@receiver(post_save, sender=User)
+def touch_articles_of_creator(sender, instance, created, update_fields, **kwargs):
+    """Articles render their creator's name."""
+    if not created and not (update_fields and set(update_fields) <= {'last_login'}):
+        touch_articles(Article.objects.filter(createdBy=instance))
+
+
+@receiver(post_save, sender=Comment)
+def count_created_comment(sender, instance, created, **kwargs):
+    """Count a new comment on its article, atomically in the database."""
+    if created:
+        Article.objects.filter(pk=instance.article_id).update(
+            comment_count=F('comment_count') + 1,
+            updated_at=timezone.now(),
+        )
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(sender, instance, **kwargs):
+    """Uncount a deleted comment from its article, unless the article goes too."""
+    if is_article_deleting(instance.article_id):
+        return
+    Article.objects.filter(pk=instance.article_id).update(
+        comment_count=Greatest(F('comment_count') - 1, 0),
+        updated_at=timezone.now(),
+    )
+
+
+@receiver(pre_delete, sender=Article)
+def note_deleting_article(sender, instance, **kwargs):
+    """Note an article before the deletion cascades to its comments."""
+    _deleting_articles.set(_deleting_articles.get() | {instance.pk})
+
+
+@receiver(post_delete, sender=Article)
+def forget_deleted_article(sender, instance, **kwargs):
+    """Comments are deleted before their article, so it can be forgotten now."""
+    _deleting_articles.set(_deleting_articles.get() - {instance.pk})
@@ -0,0 +1,119 @@
+"""
+Synthetic article data for load tests and benchmarks.
+"""
+import datetime
+import itertools
+import random
+import uuid
+
+
+FIRST_NAMES = [
+    'Ada', 'Alan', 'Barbara', 'Claude', 'Dana', 'Edsger', 'Emmy', 'Frances',
+    'Grace', 'Hedy', 'Ivan', 'John', 'Katherine', 'Leslie', 'Margaret', 'Niklaus',
+    'Olga', 'Peter', 'Radia', 'Shafi', 'Tim', 'Ursula', 'Vint', 'Whitfield',
+    'Xiao', 'Yann', 'Zhang', 'Maria', 'Ahmed', 'Priya', 'Kenji', 'Sofia',
+]
+LAST_NAMES = [
+    'Lovelace', 'Turing', 'Liskov', 'Shannon', 'Scott', 'Dijkstra', 'Noether',
+    'Allen', 'Hopper', 'Lamarr', 'Sutherland', 'McCarthy', 'Johnson', 'Lamport',
+    'Hamilton', 'Wirth', 'Ladyzhenskaya', 'Naur', 'Perlman', 'Goldwasser',
+    'Berners-Lee', 'Franklin', 'Cerf', 'Diffie', 'Wang', 'LeCun', 'Wei',
+    'Garcia', 'Hassan', 'Sharma', 'Tanaka', 'Rossi',
+]
+TOPIC_WORDS = [
+    'protein', 'folding', 'docking', 'genome', 'neural', 'network', 'quantum',
+    'entanglement', 'graph', 'algorithm', 'compiler', 'database', 'index',
+    'retrieval', 'ranking', 'language', 'model', 'vision', 'robotics', 'control',
+    'climate', 'ocean', 'carbon', 'energy', 'battery', 'catalyst', 'polymer',
+    'crystal', 'galaxy', 'cosmology', 'dark', 'matter', 'particle', 'collider',
+    'vaccine', 'immune', 'cell', 'tissue', 'cancer', 'imaging', 'sensor',
+    'wireless', 'spectrum', 'privacy', 'cryptography', 'consensus', 'distributed',
+    'storage', 'cache', 'scheduling', 'optimization', 'learning', 'inference',
+    'bayesian', 'causal', 'statistics', 'epidemic', 'economics', 'market', 'policy',
+]
+FILLER_WORDS = [
+    'the', 'of', 'and', 'in', 'for', 'with', 'on', 'a', 'we', 'show', 'that',
+    'using', 'novel', 'approach', 'results', 'method', 'study', 'analysis',
+    'large', 'scale', 'efficient', 'robust', 'improved', 'towards', 'via',
+    'evaluation', 'framework', 'data', 'experiments', 'performance',
+]
+# Words of titles and abstracts, 40% of them topic words.
+SENTENCE_WORDS = TOPIC_WORDS + FILLER_WORDS
+SENTENCE_CUM_WEIGHTS = list(itertools.accumulate(
+    [0.4 / len(TOPIC_WORDS)] * len(TOPIC_WORDS) + [0.6 / len(FILLER_WORDS)] * len(FILLER_WORDS)
+))
+# Relative frequency of the number of authors and tags per article.
+AUTHOR_COUNT_WEIGHTS = [30, 25, 18, 12, 7, 4, 2, 1, 1]
+TAG_COUNT_WEIGHTS = [10, 25, 30, 20, 10, 5]
+
+
+def zipf_cum_weights(size, exponent):
+    """Return cumulative Zipf weights for ranks 1..size, for `random.choices`."""
+    return list(itertools.accumulate(1 / rank ** exponent for rank in range(1, size + 1)))
+
+
+def author_name(rank):
+    """Return a unique, realistic author name for `rank`."""
+    first, rest = rank % len(FIRST_NAMES), rank // len(FIRST_NAMES)
+    last, series = rest % len(LAST_NAMES), rest // len(LAST_NAMES)
+    name = f'{FIRST_NAMES[first]} {LAST_NAMES[last]}'
+    return f'{name} {series + 1}' if series else name
+
+
+def tag_name(rank):
+    """Return a unique tag name for `rank`, single words first."""
+    words = len(TOPIC_WORDS)
+    if rank < words:
+        return TOPIC_WORDS[rank]
+    rank -= words
+    name = f'{TOPIC_WORDS[rank % words]} {TOPIC_WORDS[rank // words % words]}'
+    return f'{name} {rank // words ** 2 + 1}' if rank >= words ** 2 else name
+
+
+class ArticleGenerator:
+    """
+    Generate realistic article records, as read by `ArticleLoader.clean`.
+
+    Authors and tags are drawn from Zipf distributions, so a few are on a
+    large share of the articles and most on very few. Publication dates
+    grow more frequent towards `end_year`, as publication volumes do. The
+    same seed always yields the same records, ids included, so seeding
+    again is a no-op.
+    """
+
+    def __init__(self, seed=0, authors=50000, tags=2000, start_year=1990, end_year=2024,
+                 exponent=1.1, growth=1.08):
+        self.seed = seed
+        self.authors = authors
+        self.tags = tags
+        self.years = list(range(start_year, end_year + 1))
+        self.year_weights = [growth ** index for index in range(len(self.years))]
+        self.author_weights = zipf_cum_weights(authors, exponent)
+        self.tag_weights = zipf_cum_weights(tags, exponent)
+
+    def records(self, count, start=0):
+        """Yield `count` records, starting from the `start`th one."""
+        for index in range(start, start + count):
+            yield self.record(index)
+
+    def record(self, index):
+        """Return the `index`th record."""
+        rng = random.Random(f'{self.seed}:{index}')
+        year = rng.choices(self.years, self.year_weights)[0]
+        day = datetime.date(year, 1, 1) + datetime.timedelta(days=rng.randrange(365))
+        author_count = rng.choices(range(1, len(AUTHOR_COUNT_WEIGHTS) + 1), AUTHOR_COUNT_WEIGHTS)[0]
+        tag_count = rng.choices(range(len(TAG_COUNT_WEIGHTS)), TAG_COUNT_WEIGHTS)[0]
+        authors = rng.choices(range(self.authors), cum_weights=self.author_weights, k=author_count)
+        tags = rng.choices(range(self.tags), cum_weights=self.tag_weights, k=tag_count)
+
+        return {
+            'id': str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            'title': self._sentence(rng, rng.randint(5, 12)),
+            'abstract': ' '.join(self._sentence(rng, rng.randint(10, 25)) + '.' for _ in range(rng.randint(3, 7))),
+            'publication_date': day.isoformat(),
+            'authors': [author_name(rank) for rank in authors],
+            'tags': [tag_name(rank) for rank in tags],
+        }
+
+    def _sentence(self, rng, length):
+        return ' '.join(rng.choices(SENTENCE_WORDS, cum_weights=SENTENCE_CUM_WEIGHTS, k=length)).capitalize()
@@ -6,6 +6,8 @@ from django.contrib.auth import get_user_model
 from django.urls import reverse
 from django.test import Client
 
+from core.models import Article, Author, Tag
+
 
 class AdminSiteTests(TestCase):
     """Tests for Django admin."""
@@ -45,3 +47,28 @@ class AdminSiteTests(TestCase):
         res = self.client.get(url)
 
         self.assertEqual(res.status_code, 200)
+
+    def test_edit_article_links_update_names(self):
+        """Test changing an article's authors and tags in the admin syncs its names."""
+        article = Article.objects.create(
+            title='Admin article',
+            abstract='Abstract.',
+            publication_date='2024-01-01',
+        )
+        author = Author.objects.create(name='Ada')
+        tags = [Tag.objects.create(name=name) for name in ('Python', 'Django')]
+        url = reverse('admin:core_article_change', args=[article.id])
+
+        res = self.client.post(url, {
+            'title': 'Admin article',
+            'abstract': 'Abstract.',
+            'publication_date': '2024-01-01',
+            'authors': [author.id],
+            'tags': [tag.id for tag in tags],
+            'createdBy': self.user.id,
+        })
+
+        self.assertEqual(res.status_code, 302)
+        article.refresh_from_db()
+        self.assertEqual(article.author_names, ['Ada'])
+        self.assertEqual(sorted(article.tag_names), ['Django', 'Python'])
@@ -1,38 +1,390 @@
 """
 Test custom Django management commands.
 """
-from unittest.mock import patch
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest.mock import ANY, MagicMock, patch
 
 from psycopg2 import OperationalError as Psycopg2OpError
 
+from django.conf import settings
+from django.contrib.auth import get_user_model
 from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Count
 from django.db.utils import OperationalError
-from django.test import SimpleTestCase
+from django.test import SimpleTestCase, TestCase
+from rest_framework.authtoken.models import Token
+
+from core.models import Article, Author, Tag
+from core.signals import articles_bulk_loaded
+from user.authentication import token_cache
 
 
 # Decorator that allows us to patch for all test methods that fall within
 # that class. Replace with a fake object that is passed as an argument to
 # each class function
-@patch('core.management.commands.wait_for_db.Command.check')
+@patch('core.management.commands.wait_for_db.database_errors')
 class CommandTests(SimpleTestCase):
     """Test commands."""
 
     def test_wait_for_db_ready(self, patched_check):
         """Test waiting for database if database ready."""
-        patched_check.return_value = True
+        patched_check.return_value = {}
 
         call_command('wait_for_db')
 
-        patched_check.assert_called_once_with(databases=['default'])
+        patched_check.assert_called_once_with(['default'])
 
     # Mind the argument ordering (left to right)
     @patch('time.sleep')
     def test_wait_for_db_delay(self, patched_sleep, patched_check):
         """Test waiting for database when getting OperationalError."""
         # We raise exceptions
-        patched_check.side_effect = [Psycopg2OpError] * 2 + [OperationalError] * 3 + [True]
+        patched_check.side_effect = (
+            [{'default': Psycopg2OpError()}] * 2 + [{'default': OperationalError()}] * 3 + [{}]
+        )
 
         call_command('wait_for_db')
 
         self.assertEqual(patched_check.call_count, 6)
-        patched_check.assert_called_with(databases=['default'])
+        patched_check.assert_called_with(['default'])
+
+    @patch('time.sleep')
+    def test_wait_for_db_backs_off(self, patched_sleep, patched_check):
+        """Test the waits between retries grow up to the maximum delay."""
+        patched_check.side_effect = [{'default': OperationalError()}] * 6 + [{}]
+
+        call_command('wait_for_db', '--initial-delay', '1', '--max-delay', '8', stdout=StringIO())
+
+        waits = [call.args[0] for call in patched_sleep.call_args_list]
+        maximums = [1, 2, 4, 8, 8, 8]
+        for wait, maximum in zip(waits, maximums):
+            self.assertTrue(maximum / 2 <= wait <= maximum, waits)
+
+    @patch('time.sleep')
+    def test_wait_for_db_timeout(self, patched_sleep, patched_check):
+        """Test waiting fails once the timeout has passed."""
+        patched_check.return_value = {'default': OperationalError()}
+
+        with patch('time.monotonic', side_effect=[0, 1, 2, 31]):
+            with self.assertRaisesMessage(CommandError, 'Database unavailable after 30 seconds.'):
+                call_command('wait_for_db', '--timeout', '30', stdout=StringIO())
+
+        self.assertEqual(patched_check.call_count, 3)
+
+    def test_wait_for_db_unknown_alias(self, patched_check):
+        """Test naming an unknown database fails."""
+        with self.assertRaisesMessage(CommandError, 'Unknown databases: other.'):
+            call_command('wait_for_db', '--database', 'other', stdout=StringIO())
+
+
+class ImportArticlesCommandTests(TestCase):
+    """Test the import_articles command."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def _write(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'w', encoding='utf-8') as stream:
+            stream.write(content)
+        return path
+
+    def _jsonl(self, count, start=0):
+        return ''.join(
+            json.dumps({
+                'title': f'Imported article {i}',
+                'abstract': f'Abstract about topic {i}.',
+                'publication_date': f'2023-01-{i % 28 + 1:02d}',
+                'authors': [f'Author {i % 3}', 'Shared Author'],
+                'tags': [f'Tag {i % 2}'],
+            }) + '\n'
+            for i in range(start, start + count)
+        )
+
+    def _import(self, *args):
+        call_command('import_articles', *args, stdout=StringIO())
+
+    def test_import_jsonl(self):
+        """Test importing JSONL creates articles, names and links once."""
+        path = self._write('articles.jsonl', self._jsonl(7))
+
+        self._import(path, '--batch-size', '3')
+
+        self.assertEqual(Article.objects.count(), 7)
+        self.assertEqual(Author.objects.count(), 4)
+        self.assertEqual(Tag.objects.count(), 2)
+        article = Article.objects.get(title='Imported article 4')
+        self.assertEqual(
+            sorted(article.authors.values_list('name', flat=True)),
+            ['Author 1', 'Shared Author'],
+        )
+        self.assertEqual(list(article.tags.values_list('name', flat=True)), ['Tag 0'])
+        self.assertEqual(article.author_names, ['Author 1', 'Shared Author'])
+        self.assertEqual(article.tag_names, ['Tag 0'])
+        self.assertFalse(Article.objects.stale_names().exists())
+        self.assertTrue(Article.objects.filter(search_vector='topic').exists())
+
+    def test_import_csv(self):
+        """Test importing CSV splits the author and tag columns."""
+        path = self._write(
+            'articles.csv',
+            'title,abstract,publication_date,authors,tags\n'
+            'First,"An abstract, with a comma",2023-02-01,Grace;Ada,\n'
+            'Second,,2023-02-02,Grace,Compilers;History\n',
+        )
+
+        self._import(path)
+
+        first = Article.objects.get(title='First')
+        self.assertEqual(first.abstract, 'An abstract, with a comma')
+        # Names keep the order of the record.
+        self.assertEqual(first.author_names, ['Grace', 'Ada'])
+        self.assertEqual(first.tags.count(), 0)
+        second = Article.objects.get(title='Second')
+        self.assertEqual(second.abstract, '')
+        self.assertEqual(second.tag_names, ['Compilers', 'History'])
+
+    def test_import_twice_is_idempotent(self):
+        """Test loading the same records again does not duplicate rows."""
+        path = self._write('articles.jsonl', self._jsonl(5))
+
+        self._import(path)
+        self._import(path)
+
+        self.assertEqual(Article.objects.count(), 5)
+        self.assertEqual(Article.authors.through.objects.count(), 10)
+
+    def test_resume_after_failure(self):
+        """Test a failed import resumes after the last committed batch."""
+        path = self._write('articles.jsonl', self._jsonl(4) + '{"title": "Broken"}\n' + self._jsonl(2, start=4))
+
+        with self.assertRaisesMessage(CommandError, 'Record 5'):
+            self._import(path, '--batch-size', '2')
+        self.assertEqual(Article.objects.count(), 4)
+        with open(f'{path}.checkpoint') as stream:
+            self.assertEqual(stream.read(), '4')
+
+        # Fix the bad record and pick up where the import stopped.
+        self._write('articles.jsonl', self._jsonl(6))
+        out = StringIO()
+        call_command('import_articles', path, '--batch-size', '2', '--resume', stdout=out)
+
+        self.assertIn('Resuming after 4 records', out.getvalue())
+        self.assertIn('Imported 2 articles.', out.getvalue())
+        self.assertEqual(Article.objects.count(), 6)
+
+    def test_invalid_json_raises(self):
+        """Test a line that is not JSON is reported by its line number."""
+        path = self._write('articles.jsonl', self._jsonl(2) + '\n{"title": \n')
+
+        with self.assertRaisesMessage(CommandError, 'Line 4: invalid JSON'):
+            self._import(path)
+        self.assertEqual(Article.objects.count(), 0)
+
+    def test_invalid_record_raises(self):
+        """Test records without authors are rejected."""
+        path = self._write('articles.jsonl', json.dumps({
+            'title': 'No authors',
+            'abstract': 'Abstract.',
+            'publication_date': '2023-01-01',
+        }))
+
+        with self.assertRaisesMessage(CommandError, 'At least one author'):
+            self._import(path)
+
+    def test_import_sends_bulk_loaded_signal(self):
+        """Test each committed batch announces the rows it wrote."""
+        path = self._write('articles.jsonl', self._jsonl(3))
+        handler = MagicMock()
+        articles_bulk_loaded.connect(handler, sender=Article)
+        self.addCleanup(articles_bulk_loaded.disconnect, handler, sender=Article)
+
+        self._import(path, '--batch-size', '2')
+
+        self.assertEqual(handler.call_count, 2)
+
+
+class SyncArticleNamesCommandTests(TestCase):
+    """Test the sync_article_names command."""
+
+    def setUp(self):
+        self.articles = []
+        for i in range(5):
+            article = Article.objects.create(
+                title=f'Article {i}',
+                abstract='Abstract.',
+                publication_date='2024-01-01',
+            )
+            article.authors.add(Author.objects.get_or_create(name=f'Author {i % 2}')[0])
+            article.tags.add(Tag.objects.get_or_create(name='Shared')[0])
+            self.articles.append(article)
+        # Drift that bypassed the signal handlers.
+        Article.objects.filter(pk__in=[self.articles[1].pk, self.articles[3].pk]).update(
+            author_names=[], tag_names=['Stale'],
+        )
+
+    def test_verify_reports_stale_articles(self):
+        """Test --verify lists the out of sync articles and fails."""
+        out = StringIO()
+
+        with self.assertRaisesMessage(CommandError, '2 articles have out of sync names.'):
+            call_command('sync_article_names', '--verify', '--batch-size', '2', stdout=out)
+
+        self.assertIn(str(self.articles[1].pk), out.getvalue())
+        self.assertIn(str(self.articles[3].pk), out.getvalue())
+        self.assertEqual(Article.objects.stale_names().count(), 2)
+
+    def test_backfill_syncs_stale_articles_only(self):
+        """Test the backfill rewrites only the out of sync articles."""
+        handler = MagicMock()
+        articles_bulk_loaded.connect(handler, sender=Article)
+        self.addCleanup(articles_bulk_loaded.disconnect, handler, sender=Article)
+        in_sync = Article.objects.get(pk=self.articles[0].pk)
+        out = StringIO()
+
+        call_command('sync_article_names', '--batch-size', '2', stdout=out)
+
+        self.assertIn('Synced the names of 2 articles.', out.getvalue())
+        self.assertFalse(Article.objects.stale_names().exists())
+        article = Article.objects.get(pk=self.articles[3].pk)
+        self.assertEqual(article.author_names, ['Author 1'])
+        self.assertEqual(article.tag_names, ['Shared'])
+        self.assertEqual(Article.objects.get(pk=in_sync.pk).updated_at, in_sync.updated_at)
+        handler.assert_called_once()
+        call_command('sync_article_names', '--verify', stdout=StringIO())
+
+
+class SeedArticlesCommandTests(TestCase):
+    """Test the seed_articles command."""
+
+    def _seed(self, *args):
+        call_command('seed_articles', *args, stdout=StringIO())
+
+    def test_seed_articles(self):
+        """Test seeding loads articles with linked and synced names."""
+        self._seed('200', '--batch-size', '64', '--authors', '100', '--tags', '30')
+
+        self.assertEqual(Article.objects.count(), 200)
+        self.assertFalse(Article.objects.stale_names().exists())
+        self.assertFalse(Article.objects.filter(author_names=[]).exists())
+        self.assertLessEqual(Author.objects.count(), 100)
+        self.assertTrue(Article.objects.filter(search_vector='protein').exists())
+
+    def test_seed_is_zipf_distributed(self):
+        """Test the most popular author and tag are on far more articles than most."""
+        self._seed('500', '--authors', '200', '--tags', '50')
+
+        for relation, field in ((Article.authors.through, 'author'), (Article.tags.through, 'tag')):
+            counts = sorted(
+                relation.objects.values(field).annotate(count=Count('id')).values_list('count', flat=True),
+                reverse=True,
+            )
+            self.assertGreater(counts[0], 5 * counts[len(counts) // 2])
+
+    def test_seed_again_is_idempotent(self):
+        """Test seeding with the same seed adds nothing, and another seed adds more."""
+        self._seed('50')
+        self._seed('50')
+        self.assertEqual(Article.objects.count(), 50)
+
+        self._seed('50', '--seed', '1')
+        self.assertEqual(Article.objects.count(), 100)
+
+
+class BenchmarkApiCommandTests(TestCase):
+    """Test the benchmark_api command."""
+
+    # Queries are counted on the replicas too.
+    databases = {'default', *settings.DATABASE_REPLICAS}
+
+    def setUp(self):
+        call_command('seed_articles', '60', '--authors', '20', '--tags', '10', stdout=StringIO())
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_benchmark_report(self):
+        """Test every scenario is measured, succeeds and cleans up after itself."""
+        authors, tags = Author.objects.count(), Tag.objects.count()
+        path = os.path.join(self.directory.name, 'report.json')
+        out = StringIO()
+
+        call_command('benchmark_api', '--requests', '3', '--output', path, stdout=out)
+
+        with open(path) as stream:
+            report = json.load(stream)
+        self.assertEqual(report['articles'], 60)
+        self.assertIn('list_tags_all', report['scenarios'])
+        for name, result in report['scenarios'].items():
+            self.assertEqual(result['errors'], 0, name)
+            self.assertLessEqual(result['p50_ms'], result['p99_ms'])
+        self.assertIn('retrieve', out.getvalue())
+        self.assertEqual(Article.objects.count(), 60)
+        self.assertEqual((Author.objects.count(), Tag.objects.count()), (authors, tags))
+        self.assertFalse(get_user_model().objects.exists())
+
+    # Every made-up author name is used.
+    @patch('article.benchmark.BENCHMARK_AUTHORS', 2)
+    def test_existing_data_untouched(self):
+        """Test existing accounts and unused names survive the benchmark."""
+        user = get_user_model().objects.create_user(email='benchmark@example.com', password='other', name='Kept')
+        Author.objects.create(name='Benchmark author 1')
+
+        call_command('benchmark_api', '--requests', '20', '--scenario', 'token', '--scenario', 'create',
+                     stdout=StringIO())
+
+        user = get_user_model().objects.get()
+        self.assertEqual(user.email, 'benchmark@example.com')
+        self.assertTrue(user.check_password('other'))
+        self.assertTrue(Author.objects.filter(name='Benchmark author 1').exists())
+        self.assertFalse(Author.objects.filter(name__startswith='Benchmark author ').exclude(
+            name='Benchmark author 1',
+        ).exists())
+        self.assertEqual(Article.objects.count(), 60)
+
+    def test_unknown_scenario(self):
+        """Test naming an unknown scenario fails."""
+        with self.assertRaisesMessage(CommandError, 'Unknown scenarios: nope.'):
+            call_command('benchmark_api', '--scenario', 'nope', stdout=StringIO())
+
+
+@patch('core.management.commands.startup.call_command')
+class StartupCommandTests(TestCase):
+    """Test the startup command."""
+
+    def test_startup_skips_applied_migrations(self, patched_call):
+        """Test migrate is not run when every migration is applied."""
+        out = StringIO()
+
+        call_command('startup', '--timeout', '5', stdout=out)
+
+        patched_call.assert_called_once_with('wait_for_db', timeout=5, stdout=ANY)
+        self.assertIn('No migrations to apply.', out.getvalue())
+
+    @patch('core.management.commands.startup.Command.migration_plan')
+    def test_startup_migrates_pending(self, patched_plan, patched_call):
+        """Test migrate runs when the plan has migrations."""
+        patched_plan.return_value = [(MagicMock(), False)]
+
+        call_command('startup', stdout=StringIO())
+
+        patched_call.assert_called_with('migrate', database='default', interactive=False, stdout=ANY)
+
+    def test_startup_warms_caches(self, patched_call):
+        """Test --warm caches recent tokens and facets."""
+        user = get_user_model().objects.create_user(email='warm@example.com', password='testpass123')
+        token = Token.objects.create(user=user)
+        self.addCleanup(token_cache.delete, token.key)
+        out = StringIO()
+
+        with patch('core.warmup.get_schema') as patched_schema:
+            call_command('startup', '--warm', stdout=out)
+
+        patched_schema.assert_called_once()
+        self.assertEqual(token_cache.get(token.key), user)
+        for name in ('tokens', 'facets', 'schema'):
+            self.assertIn(f'Warmed {name}', out.getvalue())
@@ -0,0 +1,177 @@
+"""
+Tests for the health and readiness probes, persistent connection checks
+and the schema cache.
+"""
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+from django.conf import settings
+from django.db import connection
+from django.db.utils import OperationalError
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from core.db import check_persistent_connections, probe_database
+from core.schema import clear_schemas
+from core.tests.utils import benchmark
+
+
+class HealthEndpointTests(TestCase):
+    """Test the liveness and readiness endpoints."""
+
+    # Readiness probes every configured database, replicas included.
+    databases = {'default', *settings.DATABASE_REPLICAS}
+
+    def test_healthz(self):
+        """Test liveness does not depend on the database."""
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('healthz'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'status': 'ok'})
+
+    def test_readyz(self):
+        """Test readiness probes the database."""
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('readyz'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'status': 'ok', 'databases': {alias: 'ok' for alias in settings.DATABASES}})
+
+    @patch('core.db.probe_database')
+    def test_readyz_unavailable(self, patched_probe):
+        """Test readiness fails while a database is down."""
+        patched_probe.return_value = OperationalError('connection refused')
+
+        response = self.client.get(reverse('readyz'))
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json(), {
+            'status': 'unavailable',
+            'databases': {alias: 'unavailable' for alias in settings.DATABASES},
+        })
+
+    @override_settings(READY_WARM_CACHES=True)
+    @patch('core.views.warm_caches')
+    def test_readyz_warms_once(self, patched_warm):
+        """Test the caches are warmed before the first ready response only."""
+        with patch('core.views._warmed', threading.Event()):
+            self.client.get(reverse('readyz'))
+            response = self.client.get(reverse('readyz'))
+
+        self.assertEqual(response.status_code, 200)
+        patched_warm.assert_called_once_with()
+
+    @override_settings(READY_WARM_CACHES=True)
+    @patch('core.views.warm_caches')
+    @patch('core.db.probe_database')
+    def test_readyz_unavailable_not_warmed(self, patched_probe, patched_warm):
+        """Test nothing is warmed while a database is down."""
+        patched_probe.return_value = OperationalError('connection refused')
+
+        with patch('core.views._warmed', threading.Event()):
+            self.client.get(reverse('readyz'))
+
+        patched_warm.assert_not_called()
+
+
+class SchemaCacheTests(SimpleTestCase):
+    """Test the OpenAPI schema is generated once per process."""
+
+    def setUp(self):
+        clear_schemas()
+        self.addCleanup(clear_schemas)
+
+    def test_schema_generated_once(self):
+        """Test repeated schema requests reuse the first generated schema."""
+        schema = {'openapi': '3.0.3'}
+        with patch('drf_spectacular.generators.SchemaGenerator.get_schema', return_value=schema) as patched:
+            first = self.client.get(reverse('api-schema'), HTTP_ACCEPT='application/vnd.oai.openapi+json')
+            second = self.client.get(reverse('api-schema'), HTTP_ACCEPT='application/vnd.oai.openapi+json')
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.content, second.content)
+        patched.assert_called_once()
+
+
+class PersistentConnectionTests(SimpleTestCase):
+    """Test persistent connections are checked before reuse."""
+
+    def _connection(self, usable=True, last_used=None):
+        wrapper = MagicMock(in_atomic_block=False, last_request_finished=last_used)
+        wrapper.is_usable.return_value = usable
+        return wrapper
+
+    @override_settings(DB_CONN_HEALTH_CHECKS=True, DB_CONN_HEALTH_CHECK_IDLE=1)
+    def test_broken_idle_connection_closed(self):
+        """Test an idle connection that fails the check is closed, a good one kept."""
+        broken = self._connection(usable=False)
+        good = self._connection()
+        recent = self._connection(usable=False, last_used=time.monotonic())
+
+        with patch('core.db.connections') as patched_connections:
+            patched_connections.all.return_value = [broken, good, recent]
+            check_persistent_connections()
+
+        broken.close.assert_called_once()
+        good.close.assert_not_called()
+        # Used moments ago, so trusted without a round trip.
+        recent.is_usable.assert_not_called()
+        recent.close.assert_not_called()
+
+    @override_settings(DB_CONN_HEALTH_CHECKS=False)
+    def test_checks_disabled(self):
+        """Test no connection is checked when health checks are off."""
+        broken = self._connection(usable=False)
+
+        with patch('core.db.connections') as patched_connections:
+            patched_connections.all.return_value = [broken]
+            check_persistent_connections()
+
+        broken.is_usable.assert_not_called()
+
+    def test_probe_closes_failed_connection(self):
+        """Test a failed probe returns the error and drops the connection."""
+        wrapper = MagicMock()
+        wrapper.cursor.side_effect = OperationalError('server closed the connection')
+
+        with patch('core.db.connections', {'default': wrapper}):
+            error = probe_database('default')
+
+        self.assertIsInstance(error, OperationalError)
+        wrapper.close.assert_called_once()
+
+
+class ConnectionReuseBenchmarkTests(TestCase):
+    """Benchmark a query on a new connection against a reused one."""
+
+    @benchmark
+    def test_connection_reuse_benchmark(self):
+        """Benchmark reusing a connection against connecting per request."""
+        requests = 30
+        fresh = connection.copy()
+        self.addCleanup(fresh.close)
+
+        def request(wrapper):
+            with wrapper.cursor() as cursor:
+                cursor.execute('SELECT 1')
+
+        started = time.perf_counter()
+        for _ in range(requests):
+            request(fresh)
+            fresh.close()
+        reconnecting = (time.perf_counter() - started) / requests
+
+        started = time.perf_counter()
+        for _ in range(requests):
+            # A persistent connection is checked before reuse when idle.
+            if fresh.connection is not None:
+                fresh.is_usable()
+            request(fresh)
+        reusing = (time.perf_counter() - started) / requests
+
+        print(
+            f'\nPer-request latency: new connection {reconnecting * 1000:.2f}ms, '
+            f'reused and checked {reusing * 1000:.2f}ms'
+        )
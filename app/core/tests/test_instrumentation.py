@@ -0,0 +1,132 @@
+"""
+Tests for the request instrumentation middleware and metrics endpoint.
+"""
+import time
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.instrumentation import (
+    MetricsRegistry,
+    RequestMetrics,
+    registry,
+    timed,
+)
+from core.models import Article
+from core.tests.utils import benchmark
+
+ARTICLES_URL = reverse('article:article-list')
+METRICS_URL = reverse('metrics')
+
+
+def server_timing(response):
+    """Return the Server-Timing header of `response` as `{name: (dur, desc)}`."""
+    timings = {}
+    for metric in response['Server-Timing'].split(', '):
+        name, *params = metric.split(';')
+        values = dict(param.split('=', 1) for param in params)
+        timings[name] = (float(values['dur']), values.get('desc', '').strip('"'))
+    return timings
+
+
+class RegistryTests(SimpleTestCase):
+    """Test recording and exporting histograms."""
+
+    def test_render_prometheus_histograms(self):
+        """Test observations land in cumulative buckets per route."""
+        metrics_registry = MetricsRegistry()
+        for queries, total in ((1, 0.004), (3, 0.02), (40, 0.3)):
+            metrics = RequestMetrics()
+            metrics.queries = queries
+            metrics.total = total
+            metrics.phases['render'] = 0.001
+            metrics_registry.observe('article:article-list', 'GET', 200, metrics)
+
+        text = metrics_registry.render()
+
+        labels = 'route="article:article-list",method="GET",status="2xx"'
+        self.assertIn('# TYPE http_request_duration_seconds histogram', text)
+        self.assertIn(f'http_request_duration_seconds_bucket{{{labels},le="0.005"}} 1', text)
+        self.assertIn(f'http_request_duration_seconds_bucket{{{labels},le="0.025"}} 2', text)
+        self.assertIn(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 3', text)
+        self.assertIn(f'http_request_duration_seconds_count{{{labels}}} 3', text)
+        self.assertIn(f'http_request_db_queries_bucket{{{labels},le="3"}} 2', text)
+        self.assertIn(f'http_request_db_queries_sum{{{labels}}} 44', text)
+        self.assertIn(f'http_request_phase_seconds_count{{{labels},phase="render"}} 3', text)
+
+    def test_timed_outside_request(self):
+        """Test timing a block outside of a request is a no-op."""
+        with timed('render'):
+            pass
+
+
+@override_settings(ARTICLE_LIST_CACHE_TIMEOUT=0)
+class InstrumentationMiddlewareTests(TestCase):
+    """Test requests are measured and reported."""
+
+    def setUp(self):
+        registry.clear()
+        self.addCleanup(registry.clear)
+        self.user = get_user_model().objects.create_user(
+            email='metrics@example.com',
+            password='testpass123',
+            name='Metric Reader'
+        )
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.user).key}')
+        for i in range(3):
+            Article.objects.create(title=f'Article {i}', abstract='Abstract.', publication_date=date(2024, 1, 1))
+
+    def test_server_timing_header(self):
+        """Test responses report DB, auth, serialization and render time."""
+        response = self.client.get(ARTICLES_URL)
+
+        timings = server_timing(response)
+        self.assertEqual(set(timings), {'db', 'auth', 'serialize', 'render', 'total'})
+        self.assertRegex(timings['db'][1], r'^\d+ queries$')
+        self.assertGreaterEqual(int(timings['db'][1].split()[0]), 1)
+        self.assertLessEqual(timings['serialize'][0], timings['total'][0])
+
+    def test_metrics_endpoint(self):
+        """Test the metrics endpoint exports per-route histograms."""
+        self.client.get(ARTICLES_URL)
+        self.client.get(ARTICLES_URL)
+        self.client.get('/no/such/page/')
+
+        response = self.client.get(METRICS_URL)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        text = response.content.decode()
+        self.assertRegex(
+            text,
+            r'http_request_duration_seconds_count\{route="article:article-list",method="GET",status="2xx"\} 2\n',
+        )
+        self.assertIn('route="unmatched",method="GET",status="4xx"', text)
+        self.assertRegex(text, r'http_request_phase_seconds_count\{route="article:article-list".*phase="auth"\} 2')
+
+    @benchmark
+    def test_overhead_benchmark(self):
+        """Benchmark the time the middleware adds per query."""
+        metrics = RequestMetrics()
+        count = 100000
+
+        def execute(sql, params, many, context):
+            return None
+
+        started = time.perf_counter()
+        for _ in range(count):
+            execute('SELECT 1', None, False, None)
+        bare = time.perf_counter() - started
+        started = time.perf_counter()
+        for _ in range(count):
+            metrics.record_query(execute, 'SELECT 1', None, False, None)
+        wrapped = time.perf_counter() - started
+
+        overhead = (wrapped - bare) / count
+        print(f'\nInstrumentation overhead per query: {overhead * 1e6:.2f}us')
+        self.assertEqual(metrics.queries, count)
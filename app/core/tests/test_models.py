@@ -1,10 +1,14 @@
 """
 Tests for models.
 """
+from unittest.mock import patch
+
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import get_user_model
 
-from core.models import Article, Tag
+from core.models import Article, Author, Comment, Tag
 from django.utils import timezone
 
 
@@ -70,4 +74,123 @@ class ModelTests(TestCase):
 
         self.assertEqual(article.title, "Tech Article")
         self.assertIn(tag1, article.tags.all())
-        self.assertIn(tag2, article.tags.all())
\ No newline at end of file
+        self.assertIn(tag2, article.tags.all())
+
+class ArticleNamesTests(TestCase):
+    """Test the denormalized name arrays follow the article's links."""
+
+    def setUp(self):
+        self.article = Article.objects.create(
+            title='Synced article',
+            abstract='Abstract.',
+            publication_date='2024-01-01',
+        )
+        self.ada = Author.objects.create(name='Ada')
+        self.grace = Author.objects.create(name='Grace')
+        self.python = Tag.objects.create(name='Python')
+
+    def _names(self):
+        article = Article.objects.get(pk=self.article.pk)
+        return article.author_names, article.tag_names
+
+    def test_link_changes_update_names(self):
+        """Test adding, removing and clearing links update the arrays."""
+        self.article.authors.add(self.ada)
+        self.article.authors.add(self.grace)
+        self.article.tags.add(self.python)
+        self.assertEqual(self._names(), (['Ada', 'Grace'], ['Python']))
+        self.assertEqual(self.article.author_names, ['Ada', 'Grace'])
+
+        self.article.authors.remove(self.ada)
+        self.assertEqual(self._names(), (['Grace'], ['Python']))
+
+        self.article.tags.clear()
+        self.assertEqual(self._names(), (['Grace'], []))
+
+    def test_reverse_link_changes_update_names(self):
+        """Test links changed from the author or tag side update the arrays."""
+        self.ada.article_set.add(self.article)
+        self.python.article_set.add(self.article)
+        self.assertEqual(self._names(), (['Ada'], ['Python']))
+
+        self.ada.article_set.clear()
+        self.python.article_set.remove(self.article)
+        self.assertEqual(self._names(), ([], []))
+
+    def test_rename_and_delete_update_names(self):
+        """Test renaming or deleting an author updates its articles."""
+        self.article.authors.add(self.ada, self.grace)
+
+        self.ada.name = 'Ada Lovelace'
+        self.ada.save()
+        self.assertEqual(sorted(self._names()[0]), ['Ada Lovelace', 'Grace'])
+
+        self.grace.delete()
+        self.assertEqual(self._names()[0], ['Ada Lovelace'])
+
+    def test_save_after_relink_keeps_names(self):
+        """Test saving a relinked instance does not write stale arrays."""
+        self.article.tags.add(self.python)
+        self.article.title = 'Renamed'
+        self.article.save()
+
+        self.assertEqual(self._names()[1], ['Python'])
+
+
+class CommentCountTests(TestCase):
+    """Test the comment counter survives saves and cascades."""
+
+    def setUp(self):
+        self.user = create_user()
+        self.article = Article.objects.create(
+            title='Counted article',
+            abstract='Abstract.',
+            publication_date='2024-01-01',
+        )
+
+    def _comment(self):
+        return Comment.objects.create(article=self.article, commentedBy=self.user, content='Comment.')
+
+    def test_full_save_keeps_count(self):
+        """Test saving an instance loaded before a comment keeps the new count."""
+        article = Article.objects.get(pk=self.article.pk)
+        self._comment()
+
+        article.title = 'Renamed'
+        article.save()
+
+        article.refresh_from_db()
+        self.assertEqual(article.title, 'Renamed')
+        self.assertEqual(article.comment_count, 1)
+
+    def test_count_never_negative(self):
+        """Test a comment deleted twice does not push the count below zero."""
+        comment = self._comment()
+        Article.objects.filter(pk=self.article.pk).update(comment_count=0)
+
+        comment.delete()
+
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.comment_count, 0)
+
+    @patch('article.signals.bump_generation')
+    def test_article_delete_skips_comment_updates(self, patched_bump):
+        """Test deleting an article does not uncount or invalidate per comment."""
+        for _ in range(3):
+            self._comment()
+        patched_bump.reset_mock()
+
+        with CaptureQueriesContext(connection) as queries:
+            self.article.delete()
+
+        self.assertFalse(Comment.objects.exists())
+        self.assertFalse(any(query['sql'].startswith('UPDATE') for query in queries))
+        # Once for the article, not per comment.
+        self.assertEqual(patched_bump.call_count, 1)
+
+        # Comments of other articles are counted again afterwards.
+        other = Article.objects.create(title='Other', abstract='Abstract.', publication_date='2024-01-01')
+        comment = Comment.objects.create(article=other, commentedBy=self.user, content='Comment.')
+        comment.delete()
+        other.refresh_from_db()
+        self.assertEqual(other.comment_count, 0)
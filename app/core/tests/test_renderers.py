@@ -0,0 +1,168 @@
+"""
+Tests for the JSON and MessagePack renderers and parsers.
+"""
+import datetime
+import decimal
+import io
+import json
+import time
+import uuid
+
+import msgpack
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from core.models import Article
+from core.renderers import (
+    MessagePackParser,
+    MessagePackRenderer,
+    ORJSONParser,
+    ORJSONRenderer,
+)
+from core.tests.utils import benchmark
+
+ARTICLES_URL = reverse('article:article-list')
+
+
+def sample_articles(count):
+    """Return article-like data with the types the APIs render."""
+    return [
+        {
+            'id': uuid.uuid4(),
+            'title': f'Article {i} – café \u2028',
+            'abstract': 'Abstract. ' * 50,
+            'publication_date': datetime.date(2024, 1, 1) + datetime.timedelta(days=i),
+            'updated_at': datetime.datetime(2024, 1, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+            'score': decimal.Decimal('1.50'),
+            'label': gettext_lazy('Article'),
+            'authors': [{'name': f'Author {j}'} for j in range(3)],
+            'comment_count': i,
+        }
+        for i in range(count)
+    ]
+
+
+class RendererTests(SimpleTestCase):
+    """Test rendering and parsing outside of requests."""
+
+    def test_orjson_matches_json_renderer(self):
+        """Test the orjson renderer outputs the same bytes as JSONRenderer."""
+        data = sample_articles(5)
+
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+    def test_orjson_indent_falls_back(self):
+        """Test indented output is rendered by JSONRenderer."""
+        data = sample_articles(2)
+        renderer_context = {'indent': 4}
+
+        self.assertEqual(
+            ORJSONRenderer().render(data, 'application/json', renderer_context),
+            JSONRenderer().render(data, 'application/json', renderer_context),
+        )
+
+    def test_orjson_round_trip(self):
+        """Test rendered JSON parses back to the same values."""
+        data = json.loads(JSONRenderer().render(sample_articles(3)))
+
+        rendered = ORJSONRenderer().render(data)
+
+        self.assertEqual(ORJSONParser().parse(io.BytesIO(rendered)), data)
+
+    def test_orjson_parse_error(self):
+        """Test malformed JSON raises a ParseError."""
+        with self.assertRaises(ParseError):
+            ORJSONParser().parse(io.BytesIO(b'{"title": '))
+
+    def test_msgpack_round_trip(self):
+        """Test MessagePack renders the same values JSON does."""
+        data = sample_articles(3)
+
+        parsed = MessagePackParser().parse(io.BytesIO(MessagePackRenderer().render(data)))
+
+        self.assertEqual(parsed, json.loads(JSONRenderer().render(data)))
+
+    def test_msgpack_parse_error(self):
+        """Test malformed MessagePack raises a ParseError."""
+        with self.assertRaises(ParseError):
+            MessagePackParser().parse(io.BytesIO(b'\x92\x01'))
+
+    @benchmark
+    def test_encode_throughput_benchmark(self):
+        """Benchmark encoding a large article list with each renderer."""
+        data = sample_articles(2000)
+        report = []
+        for renderer in (JSONRenderer(), ORJSONRenderer(), MessagePackRenderer()):
+            started = time.perf_counter()
+            for _ in range(5):
+                rendered = renderer.render(data)
+            elapsed = (time.perf_counter() - started) / 5
+            report.append(
+                f'{type(renderer).__name__} {elapsed * 1000:.1f}ms '
+                f'({len(rendered) / elapsed / 2 ** 20:.0f} MiB/s, {len(rendered)} bytes)'
+            )
+
+        print(f'\nEncoding {len(data)} articles: ' + '; '.join(report))
+
+
+@override_settings(ARTICLE_LIST_CACHE_TIMEOUT=0)
+class ContentNegotiationTests(TestCase):
+    """Test the APIs negotiate JSON and MessagePack."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email='negotiate@example.com',
+            password='testpass123',
+            name='Negotiator'
+        )
+        self.client.force_authenticate(self.user)
+        self.payload = {
+            'title': 'Packed article',
+            'abstract': 'Abstract.',
+            'publication_date': '2024-01-01',
+            'authors': [{'name': 'Ada Lovelace'}],
+            'tags': [{'name': 'Computing'}],
+        }
+
+    def test_json_by_default(self):
+        """Test responses are JSON unless asked otherwise."""
+        response = self.client.get(ARTICLES_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/json')
+
+    def test_msgpack_round_trip(self):
+        """Test creating and listing articles in MessagePack."""
+        response = self.client.post(
+            ARTICLES_URL,
+            msgpack.packb(self.payload),
+            content_type='application/msgpack',
+            HTTP_ACCEPT='application/msgpack',
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        created = msgpack.unpackb(response.content)
+        self.assertEqual(created['title'], 'Packed article')
+        self.assertEqual(created['authors'], [{'name': 'Ada Lovelace'}])
+        self.assertTrue(Article.objects.filter(id=created['id']).exists())
+
+        response = self.client.get(ARTICLES_URL, HTTP_ACCEPT='application/msgpack')
+        json_response = self.client.get(ARTICLES_URL)
+
+        self.assertEqual(msgpack.unpackb(response.content), json.loads(json_response.content))
+
+    def test_format_query_param(self):
+        """Test MessagePack can be asked for with ?format=msgpack."""
+        response = self.client.get(ARTICLES_URL, {'format': 'msgpack'})
+
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        self.assertEqual(msgpack.unpackb(response.content)['results'], [])
@@ -0,0 +1,232 @@
+"""
+Tests for routing reads to replica databases.
+"""
+import unittest
+from contextlib import ExitStack
+from unittest.mock import MagicMock, patch
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connections
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.models import Article
+from article.cache import list_cache
+from core.routers import (
+    ReplicaMonitor,
+    ReplicaRouter,
+    ReplicaRoutingMiddleware,
+    RoutingState,
+    _current,
+    monitor,
+    use_primary,
+)
+
+
+@override_settings(DATABASE_REPLICAS=['replica1', 'replica2'], DB_PRIMARY_READ_MODELS=['authtoken.token'])
+@patch('core.routers.monitor.healthy', side_effect=lambda aliases: list(aliases))
+class ReplicaRouterTests(SimpleTestCase):
+    """Test the database each query is routed to."""
+
+    router = ReplicaRouter()
+
+    def _route(self, state, model=Article):
+        token = _current.set(state)
+        try:
+            return self.router.db_for_read(model)
+        finally:
+            _current.reset(token)
+
+    def test_reads_outside_requests_use_primary(self, patched_healthy):
+        """Test commands and background work read from the primary."""
+        self.assertEqual(self.router.db_for_read(Article), 'default')
+
+    def test_safe_request_reads_replica(self, patched_healthy):
+        """Test reads of a safe request go to a replica."""
+        self.assertIn(self._route(RoutingState(use_replica=True)), ['replica1', 'replica2'])
+
+    def test_unsafe_request_reads_primary(self, patched_healthy):
+        """Test reads of a write request go to the primary."""
+        self.assertEqual(self._route(RoutingState(use_replica=False)), 'default')
+
+    def test_primary_after_write(self, patched_healthy):
+        """Test a request reads from the primary once it has written."""
+        state = RoutingState(use_replica=True)
+        token = _current.set(state)
+        try:
+            self.assertEqual(self.router.db_for_write(Article), 'default')
+            self.assertEqual(self.router.db_for_read(Article), 'default')
+        finally:
+            _current.reset(token)
+
+        self.assertTrue(state.wrote)
+
+    def test_primary_read_models(self, patched_healthy):
+        """Test tokens are always read from the primary."""
+        self.assertEqual(self._route(RoutingState(use_replica=True), model=Token), 'default')
+
+    def test_no_healthy_replica(self, patched_healthy):
+        """Test reads fall back to the primary while every replica lags."""
+        patched_healthy.side_effect = lambda aliases: []
+
+        self.assertEqual(self._route(RoutingState(use_replica=True)), 'default')
+
+    def test_use_primary(self, patched_healthy):
+        """Test reads inside use_primary go to the primary, and replicas after it."""
+        token = _current.set(RoutingState(use_replica=True))
+        try:
+            with use_primary():
+                self.assertEqual(self.router.db_for_read(Article), 'default')
+            self.assertIn(self.router.db_for_read(Article), ['replica1', 'replica2'])
+        finally:
+            _current.reset(token)
+
+    @override_settings(ARTICLE_LIST_CACHE_TIMEOUT=300)
+    @patch('article.cache.ListResponseCache.get_key', return_value='article:list:routing-test')
+    def test_list_cache_filled_from_primary(self, patched_key, patched_healthy):
+        """Test a cached list is never rendered from a replica."""
+        self.addCleanup(cache.clear)
+        request = MagicMock(method='GET')
+        request.accepted_renderer.format = 'json'
+        routes = []
+
+        def render():
+            routes.append(self.router.db_for_read(Article))
+            return HttpResponse('[]', content_type='application/json')
+
+        token = _current.set(RoutingState(use_replica=True))
+        try:
+            list_cache.fetch(request, render)
+        finally:
+            _current.reset(token)
+
+        self.assertEqual(routes, ['default'])
+
+    def test_replicas_not_migrated(self, patched_healthy):
+        """Test migrations only run on the primary."""
+        self.assertIsNone(self.router.allow_migrate('default', 'core'))
+        self.assertFalse(self.router.allow_migrate('replica1', 'core'))
+
+
+@override_settings(DB_REPLICA_MAX_LAG=2, DB_REPLICA_LAG_CHECK_INTERVAL=60)
+class ReplicaMonitorTests(SimpleTestCase):
+    """Test replicas are skipped while they lag."""
+
+    def test_lagging_replica_skipped(self):
+        """Test replicas behind by more than the maximum lag or down are skipped."""
+        lags = {'replica1': 0.5, 'replica2': 10.0, 'replica3': None}
+
+        with patch.object(ReplicaMonitor, 'lag', side_effect=lambda alias: lags[alias]) as patched:
+            replicas = ReplicaMonitor()
+            self.assertEqual(replicas.healthy(['replica1', 'replica2', 'replica3']), ['replica1'])
+            replicas.healthy(['replica1', 'replica2', 'replica3'])
+
+        # Checked once per interval.
+        self.assertEqual(patched.call_count, 3)
+
+
+@override_settings(DATABASE_REPLICAS=['replica1'], DB_REPLICA_STICKY_SECONDS=5, DB_REPLICA_STICKY_CACHE_ALIAS='default')
+class ReplicaRoutingMiddlewareTests(SimpleTestCase):
+    """Test requests stick to the primary after writing."""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.factory = RequestFactory()
+        self.states = []
+
+    def _view(self, request):
+        self.states.append(_current.get())
+        if request.method == 'POST':
+            ReplicaRouter().db_for_write(Article)
+        return HttpResponse()
+
+    def _request(self, method, token='abc'):
+        request = getattr(self.factory, method)('/', HTTP_AUTHORIZATION=f'Token {token}')
+        ReplicaRoutingMiddleware(self._view)(request)
+        return self.states[-1]
+
+    def test_read_your_writes(self):
+        """Test a client reads from the primary right after writing."""
+        self.assertTrue(self._request('get').use_replica)
+        self.assertFalse(self._request('post').use_replica)
+
+        self.assertFalse(self._request('get').use_replica)
+        # Other clients are unaffected.
+        self.assertTrue(self._request('get', token='other').use_replica)
+        self.assertIsNone(_current.get())
+
+    def test_session_read_your_writes(self):
+        """Test session clients, such as the admin, stick to the primary after writing."""
+        def request(method, session_key, rotated_key=None):
+            request = getattr(self.factory, method)('/')
+            request.COOKIES[settings.SESSION_COOKIE_NAME] = session_key
+
+            def view(request):
+                if rotated_key:
+                    request.session = MagicMock(session_key=rotated_key)
+                return self._view(request)
+
+            ReplicaRoutingMiddleware(view)(request)
+            return self.states[-1]
+
+        request('post', 'old', rotated_key='new')
+
+        self.assertFalse(request('get', 'new').use_replica)
+        self.assertTrue(request('get', 'other').use_replica)
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_no_replicas(self):
+        """Test requests are not routed when no replica is configured."""
+        self.assertIsNone(self._request('get'))
+
+
+@unittest.skipUnless(settings.DATABASE_REPLICAS, 'needs DB_REPLICA_HOSTS')
+# Cached lists are always rendered from the primary.
+@override_settings(ARTICLE_LIST_CACHE_TIMEOUT=0)
+class ReplicaRoutingIntegrationTests(TransactionTestCase):
+    """Test routing against replica aliases mirroring the test database."""
+
+    databases = {'default', *settings.DATABASE_REPLICAS}
+
+    def setUp(self):
+        cache.clear()
+        monitor.clear()
+        user = get_user_model().objects.create_user(email='replica@example.com', password='testpass123')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=user).key}')
+
+    def _queries(self, method, *args, **kwargs):
+        with ExitStack() as stack:
+            primary = stack.enter_context(CaptureQueriesContext(connections['default']))
+            replicas = [
+                stack.enter_context(CaptureQueriesContext(connections[alias]))
+                for alias in settings.DATABASE_REPLICAS
+            ]
+            response = getattr(self.client, method)(*args, **kwargs)
+        return response, len(primary), sum(len(replica) for replica in replicas)
+
+    def test_reads_follow_writes(self):
+        """Test lists read from the replica, except just after a write."""
+        url = reverse('article:article-list')
+
+        response, primary, replica = self._queries('get', url)
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(replica, 0)
+
+        response, primary, replica = self._queries('post', url, {
+            'title': 'Replicated', 'abstract': 'Abstract', 'publication_date': '2023-01-01',
+            'authors': [{'name': 'Replica Author'}], 'tags': [{'name': 'Replica'}],
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(replica, 0)
+
+        response, primary, replica = self._queries('get', url)
+        self.assertEqual(replica, 0)
+        self.assertEqual(response.json()['results'][0]['title'], 'Replicated')
@@ -0,0 +1,10 @@
+"""
+Helpers shared by the test suites.
+"""
+import os
+import unittest
+
+
+# Timing benchmarks are slow and machine dependent, so they only run when
+# RUN_BENCHMARKS is set.
+benchmark = unittest.skipUnless(os.environ.get('RUN_BENCHMARKS'), 'set RUN_BENCHMARKS to run timing benchmarks')
@@ -0,0 +1,50 @@
+"""
+Views for liveness and readiness probes.
+"""
+import threading
+
+from django.conf import settings
+from django.http import JsonResponse
+
+from core.db import database_errors
+from core.warmup import warm_caches
+
+_warmed = threading.Event()
+_warm_lock = threading.Lock()
+
+
+def healthz(request):
+    """Report that the process is up and serving, without touching the database."""
+    return JsonResponse({'status': 'ok'})
+
+
+def readyz(request):
+    """
+    Report whether every configured database answers a query.
+
+    Replicas are reported but do not affect readiness, since reads fall
+    back to the primary while they are unavailable.
+    """
+    # Error details are left out, since they may name hosts and users.
+    errors = database_errors(settings.DATABASES)
+    databases = {alias: 'unavailable' if alias in errors else 'ok' for alias in settings.DATABASES}
+    ready = all(
+        state == 'ok' for alias, state in databases.items()
+        if alias not in settings.DATABASE_REPLICAS
+    )
+    if ready and settings.READY_WARM_CACHES:
+        _warm_once()
+    return JsonResponse(
+        {'status': 'ok' if ready else 'unavailable', 'databases': databases},
+        status=200 if ready else 503,
+    )
+
+
+def _warm_once():
+    """Warm this process' caches before it first reports ready."""
+    if _warmed.is_set():
+        return
+    with _warm_lock:
+        if not _warmed.is_set():
+            warm_caches()
+            _warmed.set()
@@ -0,0 +1,52 @@
+"""
+Warming of the caches hit by the first requests after a deploy.
+"""
+import time
+
+from django.conf import settings
+from rest_framework.authtoken.models import Token
+
+from article.facets import get_global_facets
+from core.schema import get_schema
+from user.authentication import token_cache
+
+
+def warm_tokens():
+    """Cache the users behind the most recently issued tokens."""
+    tokens = (
+        Token.objects.select_related('user')
+        .filter(user__is_active=True)
+        .order_by('-created')[:settings.WARM_TOKEN_COUNT]
+    )
+    count = 0
+    for token in tokens:
+        token_cache.set(token.key, token.user)
+        count += 1
+    return count
+
+
+def warm_facets():
+    """Compute the facets of all articles shown on the first list page."""
+    get_global_facets()
+
+
+def warm_schema():
+    """Generate the OpenAPI schema served by the docs."""
+    get_schema()
+
+
+WARMERS = {
+    'tokens': warm_tokens,
+    'facets': warm_facets,
+    'schema': warm_schema,
+}
+
+
+def warm_caches(names=None):
+    """Run the named warmers, or all of them, and return their durations in seconds."""
+    timings = {}
+    for name in names or WARMERS:
+        started = time.perf_counter()
+        WARMERS[name]()
+        timings[name] = time.perf_counter() - started
+    return timings
@@ -0,0 +1,115 @@
+"""
+Authentication for the APIs.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from core.instrumentation import timed
+
+
+# User fields kept in the token cache: what authentication, permission
+# checks and rendering read. The rest, the password hash above all, is
+# never copied into the cache and is loaded on access.
+CACHED_USER_FIELDS = ['id', 'email', 'name', 'is_active', 'is_staff']
+
+
+class TokenCache:
+    """
+    Token to user cache, with an in-process LRU in front of the Django cache.
+
+    Users are stored as the values of `CACHED_USER_FIELDS` and rebuilt on
+    every hit, so requests never share a mutable instance. Rebuilt users
+    may be stale and are only meant for reading. Invalidation clears the
+    Django cache and this process' LRU. Other processes may keep serving
+    their local entry for up to `TOKEN_CACHE_LOCAL_TIMEOUT` seconds.
+    """
+
+    def __init__(self):
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def cache(self):
+        return caches[settings.TOKEN_CACHE_ALIAS]
+
+    def _key(self, token_key):
+        # Never use raw tokens as keys in a shared cache.
+        return 'auth:token:v2:' + hashlib.sha256(token_key.encode('utf-8')).hexdigest()
+
+    def get(self, token_key):
+        """Return the cached user for `token_key`, or None."""
+        key = self._key(token_key)
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is not None:
+                expires, values = entry
+                if expires > time.monotonic():
+                    self._local.move_to_end(key)
+                    return self._build(values)
+                del self._local[key]
+
+        values = self.cache.get(key)
+        if values is None:
+            return None
+        self._set_local(key, values)
+        return self._build(values)
+
+    def set(self, token_key, user):
+        key = self._key(token_key)
+        values = [getattr(user, field) for field in CACHED_USER_FIELDS]
+        self.cache.set(key, values, settings.TOKEN_CACHE_TIMEOUT)
+        self._set_local(key, values)
+
+    def delete(self, *token_keys):
+        keys = [self._key(token_key) for token_key in token_keys]
+        self.cache.delete_many(keys)
+        with self._lock:
+            for key in keys:
+                self._local.pop(key, None)
+
+    def clear_local(self):
+        with self._lock:
+            self._local.clear()
+
+    def _set_local(self, key, values):
+        with self._lock:
+            self._local[key] = (time.monotonic() + settings.TOKEN_CACHE_LOCAL_TIMEOUT, values)
+            self._local.move_to_end(key)
+            while len(self._local) > settings.TOKEN_CACHE_LOCAL_SIZE:
+                self._local.popitem(last=False)
+
+    def _build(self, values):
+        return get_user_model().from_db('default', CACHED_USER_FIELDS, values)
+
+
+token_cache = TokenCache()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """Token authentication that skips the token/user query on cache hits."""
+
+    def authenticate_credentials(self, key):
+        with timed('auth'):
+            return self._authenticate_credentials(key)
+
+    def _authenticate_credentials(self, key):
+        user = token_cache.get(key)
+        if user is None:
+            user, token = super().authenticate_credentials(key)
+            token_cache.set(key, user)
+            return user, token
+
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+        # An unsaved token stands in for request.auth without a query.
+        return user, Token(key=key, user=user)
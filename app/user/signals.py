@@ -0,0 +1,22 @@
+"""
+Signal handlers for the user app.
+"""
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from user.authentication import token_cache
+
+
+@receiver(post_delete, sender=Token)
+def forget_deleted_token(sender, instance, **kwargs):
+    """Deleted or rotated tokens stop authenticating straight away."""
+    token_cache.delete(instance.key)
+
+
+@receiver(post_save, sender=get_user_model())
+def forget_changed_user(sender, instance, created, **kwargs):
+    """Drop cached copies of a user who was changed or deactivated."""
+    if not created:
+        token_cache.delete(*Token.objects.filter(user=instance).values_list('key', flat=True))
@@ -0,0 +1,123 @@
+"""
+Tests for the cached token authentication.
+"""
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from user.authentication import token_cache
+
+
+ME_URL = reverse('user:me')
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    """Test token lookups are cached and invalidated."""
+
+    def setUp(self):
+        cache.clear()
+        token_cache.clear_local()
+        self.user = get_user_model().objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+            name='Test Name',
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def test_repeated_requests_skip_token_query(self):
+        """Test only the first request looks the token up in the database."""
+        with self.assertNumQueries(1):
+            res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(ME_URL)
+        self.assertEqual(res.data, {'name': 'Test Name', 'email': 'test@example.com'})
+
+    def test_falls_back_to_shared_cache(self):
+        """Test a cold process LRU is filled from the Django cache."""
+        self.client.get(ME_URL)
+        token_cache.clear_local()
+
+        with self.assertNumQueries(0):
+            res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_local_entries_expire(self):
+        """Test process LRU entries are dropped after their timeout."""
+        self.client.get(ME_URL)
+        cache.clear()
+
+        with patch('user.authentication.time.monotonic', return_value=10 ** 9):
+            with self.assertNumQueries(1):
+                self.client.get(ME_URL)
+
+    def test_invalid_token(self):
+        """Test unknown tokens are rejected and not cached."""
+        self.client.credentials(HTTP_AUTHORIZATION='Token not-a-real-token')
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIsNone(token_cache.get('not-a-real-token'))
+
+    def test_deleted_token_is_rejected(self):
+        """Test deleting a cached token revokes it immediately."""
+        self.client.get(ME_URL)
+
+        self.token.delete()
+
+        res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivated_user_is_rejected(self):
+        """Test deactivating a user revokes their cached token."""
+        self.client.get(ME_URL)
+
+        self.user.is_active = False
+        self.user.save()
+
+        res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_profile_update_refreshes_cached_user(self):
+        """Test changes through the user serializer are seen next request."""
+        self.client.get(ME_URL)
+
+        res = self.client.patch(ME_URL, {'name': 'Updated name'})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        res = self.client.get(ME_URL)
+        self.assertEqual(res.data['name'], 'Updated name')
+
+    def test_password_hash_not_cached(self):
+        """Test the shared cache never holds the password hash."""
+        self.client.get(ME_URL)
+
+        values = cache.get(token_cache._key(self.token.key))
+        self.assertIsNotNone(values)
+        self.assertNotIn(self.user.password, values)
+
+    def test_update_does_not_restore_stale_fields(self):
+        """Test a profile update through a stale cached user keeps newer changes."""
+        self.client.get(ME_URL)
+        # Changed by another process, whose invalidation this one missed.
+        get_user_model().objects.filter(pk=self.user.pk).update(password='changed-hash', is_staff=True)
+
+        res = self.client.patch(ME_URL, {'name': 'Updated name'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.name, 'Updated name')
+        self.assertEqual(self.user.password, 'changed-hash')
+        self.assertTrue(self.user.is_staff)